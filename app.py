@@ -1,8 +1,16 @@
 # app.py (수정 후)
 
+import click
 from flask import Flask
 from flask_login import LoginManager
-from models import User
+from models import User, user_cache, membership_cache
+import assets
+import database
+import events
+import metrics
+import passwords
+import slow_queries
+import timeutil
 from database import create_tables
 
 # --- 블루프린트 파일들을 가져옵니다 ---
@@ -12,10 +20,233 @@ from views import auth_routes, project_routes
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'my-secret-key'
 
+# --- 데이터베이스 커넥션 풀 설정 ---
+app.config['DATABASE'] = database.DATABASE_NAME
+app.config['DB_POOL_SIZE'] = 8        # 프로세스당 최대 커넥션 수
+app.config['DB_POOL_TIMEOUT'] = 5.0   # 커넥션을 기다리는 최대 시간(초)
+app.config['DB_JOURNAL_MODE'] = 'WAL'          # 읽기가 쓰기를 기다리지 않도록 WAL 사용
+app.config['DB_SYNCHRONOUS'] = 'NORMAL'        # OFF / NORMAL / FULL / EXTRA
+app.config['DB_BUSY_TIMEOUT_MS'] = 5000        # 잠금이 풀리기를 기다리는 시간(ms)
+app.config['DB_CHECKPOINT_INTERVAL'] = 60.0    # WAL 체크포인트 주기(초)
+app.config['DB_WRITE_QUEUE'] = False           # True면 쓰기를 단일 쓰기 스레드에서 묶어서 처리
+app.config['DB_WRITE_BATCH_SIZE'] = 64
+app.config['DB_WRITE_BATCH_DELAY'] = 0.002     # 배치를 모으기 위해 기다리는 최대 시간(초)
+app.config['DB_CONNECTION_FACTORY'] = metrics.InstrumentedConnection   # 모든 SQL의 실행 수와 시간을 측정
+database.init_app(app)
+
+# --- 사용자 캐시 설정 ---
+app.config['USER_CACHE_SIZE'] = 1024   # 캐시할 최대 사용자 수
+app.config['USER_CACHE_TTL'] = 300.0   # 캐시 유지 시간(초)
+user_cache.configure(maxsize=app.config['USER_CACHE_SIZE'], ttl=app.config['USER_CACHE_TTL'])
+
+# --- 멤버십(권한) 캐시 설정 ---
+app.config['MEMBERSHIP_CACHE_SIZE'] = 4096
+app.config['MEMBERSHIP_CACHE_TTL'] = 300.0
+app.config['MEMBERSHIP_VERSION_CHECK_INTERVAL'] = 1.0   # 다른 워커의 변경을 확인하는 주기(초)
+membership_cache.configure(maxsize=app.config['MEMBERSHIP_CACHE_SIZE'],
+                           ttl=app.config['MEMBERSHIP_CACHE_TTL'],
+                           check_interval=app.config['MEMBERSHIP_VERSION_CHECK_INTERVAL'])
+
+# --- 실시간 이벤트(SSE) 설정 ---
+# 'memory': 한 프로세스 안에서만 전달 / 'sqlite': 워커가 여러 개일 때 project_events 테이블을 거쳐 전달
+app.config['EVENTS_BACKEND'] = 'memory'
+app.config['EVENTS_POLL_INTERVAL'] = 0.5   # sqlite 방식에서 다른 워커의 이벤트를 확인하는 주기(초)
+app.config['EVENTS_RETENTION'] = 600.0     # sqlite 방식에서 이벤트 행을 보관하는 시간(초)
+app.config['EVENTS_HISTORY'] = 100         # 재접속한 클라이언트에게 다시 보내 줄 프로젝트별 최근 이벤트 수
+app.config['EVENTS_QUEUE_SIZE'] = 256      # 연결마다 쌓아 둘 수 있는 최대 이벤트 수 (넘치면 resync)
+app.config['EVENTS_HEARTBEAT'] = 15.0      # 연결 유지용 주석을 보내는 주기(초)
+events.init_app(app)
+
+# --- 비밀번호 해시 설정 (passwords.py) ---
+# werkzeug 형식의 해시 방식. 바꾸면 기존 사용자는 다음 로그인 때 새 방식으로 다시 해시됩니다.
+app.config['PASSWORD_HASH_METHOD'] = 'scrypt'      # 예: 'scrypt:16384:8:1', 'pbkdf2:sha256:600000'
+app.config['PASSWORD_HASH_WORKERS'] = 2            # 해시를 계산할 프로세스 수 (0이면 요청 스레드에서 계산)
+app.config['PASSWORD_HASH_MAX_PENDING'] = 16       # 처리 중+대기 작업이 이보다 많으면 바로 503
+app.config['PASSWORD_HASH_TIMEOUT'] = 5.0          # 해시 결과를 기다리는 최대 시간(초)
+passwords.init_app(app)
+
+# --- 측정값 설정 (metrics.py) ---
+app.config['METRICS_ENDPOINT'] = True                           # /metrics (Prometheus 텍스트 형식)
+app.config['METRICS_ALLOWED_ADDRESSES'] = ('127.0.0.1', '::1')  # /metrics를 볼 수 있는 주소 (None이면 모두)
+app.config['METRICS_SERVER_TIMING'] = None                      # None이면 디버그 모드에서만 Server-Timing 헤더
+metrics.init_app(app)
+
+# --- 느린 쿼리 기록 설정 (slow_queries.py) ---
+app.config['SLOW_QUERY_THRESHOLD_MS'] = 100               # models.py의 쿼리가 이보다 오래 걸리면 기록 (None이면 끔)
+app.config['SLOW_QUERY_LOG'] = 'slow_queries.log'         # JSON 한 줄씩 쓰는 회전 로그 파일
+app.config['SLOW_QUERY_LOG_MAX_BYTES'] = 5 * 1024 * 1024
+app.config['SLOW_QUERY_LOG_BACKUPS'] = 3
+slow_queries.init_app(app)
+
+# --- 작업 가져오기 설정 (importer.py) ---
+app.config['IMPORT_CHUNK_SIZE'] = 2000   # 한 트랜잭션(executemany)에 넣는 행 수
+app.config['IMPORT_MAX_ERRORS'] = 1000   # 보고서에 남기는 행별 오류의 최대 개수
+
+# --- 시간대 설정 (timeutil.py) ---
+# 날짜는 정수 UTC epoch 컬럼으로 비교하고, 화면에 보여 줄 때만 사용자의 시간대(users.timezone)로 바꿉니다.
+app.config['DEFAULT_TIMEZONE'] = 'Asia/Seoul'   # 시간대를 정하지 않은 사용자와 CLI/마이그레이션에서 쓰는 시간대
+timeutil.init_app(app)
+
+# --- 정적 파일과 응답 압축 설정 (assets.py) ---
+# 템플릿의 asset_url()은 내용 해시가 붙은 /assets/... 주소를 만들고, 그 주소는 1년 동안 캐시됩니다(immutable).
+app.config['ASSETS_FINGERPRINT'] = True         # False면 asset_url()이 일반 /static 주소를 돌려줌
+app.config['ASSETS_URL_PREFIX'] = '/assets'
+app.config['ASSETS_AUTO_RELOAD'] = None         # 파일이 바뀌면 해시를 다시 만듦 (None이면 디버그 모드에서만)
+app.config['ASSETS_COMPRESS_MIN_SIZE'] = 256    # 이보다 작은 정적 파일은 미리 압축하지 않음(바이트)
+app.config['ASSETS_GZIP_LEVEL'] = 9             # 시작할 때 한 번만 압축하므로 가장 높은 단계
+app.config['ASSETS_BROTLI_QUALITY'] = 11        # brotli 모듈이 설치된 경우에만 사용
+app.config['JSON_COMPRESS_MIN_SIZE'] = 1024     # 이보다 큰 JSON 응답은 요청마다 압축 (None이면 끔)
+app.config['JSON_COMPRESS_LEVEL'] = 6
+assets.init_app(app)
+
+# --- ASGI 실행 설정 (asgi.py) ---
+# Flask 뷰를 실행할 스레드 수. DB_POOL_SIZE와 같게 두면 커넥션을 기다리는 스레드가 생기지 않습니다.
+app.config['ASGI_WORKER_THREADS'] = 8
+app.config['ASGI_BODY_BUFFER'] = 1024 * 1024   # 이보다 큰 요청 본문은 메모리에 모으지 않고 읽는 만큼 받아 옴(바이트)
+
 # --- 데이터베이스 초기화 명령어 설정 ---
 @app.cli.command('init-db')
 def init_db_command():
+    from migrations import MigrationError
+
+    try:
+        create_tables()
+    except MigrationError as e:
+        raise click.ClickException(str(e))
+
+# --- 작업 수 집계 테이블 재계산 명령어 ---
+@app.cli.command('rebuild-task-counts')
+def rebuild_task_counts_command():
+    """트리거로 관리되는 프로젝트별 작업 수를 tasks 테이블에서 다시 계산합니다."""
+    from migrations import count_task_count_drift, rebuild_task_counts
+
+    drift = count_task_count_drift(database.get_db().cursor())
+    rows = database.run_write(rebuild_task_counts)
+    print(f"어긋난 집계 {drift}건을 바로잡았습니다. (집계 행 {rows}개 재계산)")
+
+# --- 전문 검색 색인 재생성 명령어 ---
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """작업/댓글 전문 검색 색인을 원본 테이블에서 다시 만들고 세그먼트를 합칩니다."""
+    from migrations import optimize_search_index, rebuild_search_index
+
+    database.run_write(rebuild_search_index)
+    database.run_write(optimize_search_index)
+    print("전문 검색 색인을 다시 만들었습니다.")
+
+# --- 조회 쿼리 실행 계획 검사 명령어 ---
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """자주 실행되는 쿼리의 실행 계획에 전체 테이블 스캔이 있으면 실패합니다."""
+    from migrations import check_query_plans
+    from models import HOT_QUERIES
+
+    failures = check_query_plans(database.get_db(), HOT_QUERIES)
+    for name, details in failures.items():
+        print(f"[전체 스캔] {name}: {' / '.join(details)}")
+    if failures:
+        raise SystemExit(1)
+    print(f"{len(HOT_QUERIES)}개 쿼리 모두 인덱스를 사용합니다.")
+
+# --- 성능 측정용 데이터 생성 명령어 ---
+@app.cli.command('seed-db')
+@click.option('--users', default=100, show_default=True, help='만들 사용자 수')
+@click.option('--projects', default=20, show_default=True, help='만들 프로젝트 수')
+@click.option('--members', default=8, show_default=True, help='프로젝트당 멤버 수 (팀장 포함)')
+@click.option('--tasks', default=100, show_default=True, help='프로젝트당 작업 수')
+@click.option('--comments', default=3, show_default=True, help='작업당 평균 댓글 수')
+@click.option('--prefix', default='bench', show_default=True, help='사용자 이름과 프로젝트 이름 앞에 붙일 문자열')
+@click.option('--password', default='password', show_default=True, help='생성된 모든 사용자의 비밀번호')
+@click.option('--seed', type=int, default=None, help='같은 데이터를 다시 만들 때 쓰는 난수 시드')
+def seed_db_command(users, projects, members, tasks, comments, prefix, password, seed):
+    """벤치마크용 합성 데이터(사용자, 프로젝트, 멤버, 작업, 댓글)를 대량으로 넣습니다."""
+    from seed import seed_database
+
     create_tables()
+    # 비밀번호 해시는 한 번만 계산해 모든 사용자에게 씁니다.
+    password_hash = passwords.hash_password(password)
+    counts = seed_database(password_hash, users=users, projects=projects, members=members, tasks=tasks,
+                           comments=comments, prefix=prefix, seed=seed)
+    print(f"완료: {counts} (비밀번호: {password})")
+
+# --- 프로젝트 내보내기 명령어 ---
+@app.cli.command('export-project')
+@click.argument('project_id', type=int)
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default='ndjson', show_default=True)
+@click.option('--output', '-o', default='-', show_default=True, help='저장할 파일 (-이면 표준 출력)')
+@click.option('--gzip', 'compress', is_flag=True, help='gzip으로 압축 (--output이 .gz로 끝나면 자동)')
+def export_project_command(project_id, fmt, output, compress):
+    """프로젝트 전체(멤버, 작업, 댓글)를 NDJSON 또는 CSV로 스트리밍해 저장합니다."""
+    import export
+    from models import Project
+
+    if Project.get(project_id) is None:
+        raise click.ClickException(f"프로젝트 {project_id}을(를) 찾을 수 없습니다.")
+    compress = compress or output.endswith('.gz')
+    with click.open_file(output, 'wb') as f:
+        for chunk in export.stream_project(project_id, fmt, gzip=compress):
+            f.write(chunk)
+
+# --- 작업 가져오기 명령어 ---
+@app.cli.command('import-tasks')
+@click.argument('project_id', type=int)
+@click.argument('path', type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson', 'json']), default=None,
+              help='파일 형식 (기본: 확장자로 판단)')
+@click.option('--chunk-size', default=None, type=int, help='한 트랜잭션에 넣을 행 수 (기본: IMPORT_CHUNK_SIZE)')
+def import_tasks_command(project_id, path, fmt, chunk_size):
+    """CSV / NDJSON / JSON 파일의 작업들을 프로젝트에 한꺼번에 추가합니다."""
+    import time
+    import importer
+    from models import Project
+
+    if Project.get(project_id) is None:
+        raise click.ClickException(f"프로젝트 {project_id}을(를) 찾을 수 없습니다.")
+    fmt = fmt or importer.detect_format(path)
+    if fmt is None:
+        raise click.ClickException("파일 형식을 알 수 없습니다. --format을 지정해 주세요.")
+    started = time.perf_counter()
+    with click.open_file(path, 'rb') as f:
+        report = importer.import_tasks(project_id, f, fmt,
+                                       chunk_size=chunk_size or app.config['IMPORT_CHUNK_SIZE'],
+                                       max_errors=app.config['IMPORT_MAX_ERRORS'])
+    for error in report['errors']:
+        print(f"{error['row']}행: {error['message']}")
+    if report['errors_truncated']:
+        print(f"... 외 {report['failed'] - len(report['errors'])}건")
+    if report['aborted']:
+        print(f"중단: {report['aborted']}")
+    print(f"가져옴 {report['imported']}개, 실패 {report['failed']}개, 건너뜀 {report['skipped']}개 "
+          f"({time.perf_counter() - started:.1f}초)")
+    if report['aborted'] or report['failed']:
+        raise SystemExit(1)
+
+# --- 느린 쿼리 보고서 명령어 ---
+@app.cli.command('slow-queries')
+@click.option('--top', default=10, show_default=True, help='보여 줄 쿼리 수')
+@click.option('--file', 'path', default=None, help='읽을 로그 파일 (기본: SLOW_QUERY_LOG)')
+@click.option('--json', 'as_json', is_flag=True, help='JSON으로 출력')
+def slow_queries_command(top, path, as_json):
+    """느린 쿼리 로그를 모아 전체 소요 시간이 큰 순서로 보여 줍니다."""
+    import json
+
+    path = path or app.config['SLOW_QUERY_LOG']
+    report = slow_queries.summarize(
+        slow_queries.read_log(path, app.config['SLOW_QUERY_LOG_BACKUPS']), top=top)
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    if not report:
+        print(f"{path}에 기록된 느린 쿼리가 없습니다.")
+        return
+    for rank, item in enumerate(report, 1):
+        flag = ' [전체 스캔]' if item['full_scan'] else ''
+        print(f"{rank}. {item['caller']}{flag}")
+        print(f"   {item['count']}회, 합계 {item['total_ms']:.1f}ms, p95 {item['p95_ms']:.1f}ms, "
+              f"최대 {item['max_ms']:.1f}ms, 라우트: {', '.join(item['routes'])}")
+        print(f"   SQL: {item['statement']}")
+        for detail in item['plan']:
+            print(f"   - {detail}")
 
 # --- 로그인 매니저 설정 ---
 login_manager = LoginManager()
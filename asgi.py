@@ -0,0 +1,309 @@
+# asgi.py
+"""ASGI 서버로 실행할 때의 진입점.
+
+    uvicorn asgi:application
+
+- /api/project/<id>/events(SSE)는 이벤트 루프에서 직접 처리하므로, 열려 있는 연결이
+  몇 천 개여도 워커 스레드를 쓰지 않습니다.
+- 나머지 요청은 기존 Flask 앱(WSGI)을 크기가 제한된 스레드 풀(ASGI_WORKER_THREADS)에서 실행합니다.
+  SQLite 접근은 모두 이 스레드 풀 안에서 일어납니다.
+- 요청 본문은 ASGI_BODY_BUFFER 바이트까지만 이벤트 루프에서 미리 읽습니다. 그보다 큰 본문(작업 가져오기
+  업로드 등)은 Flask가 wsgi.input을 읽을 때 필요한 만큼 receive()로 받아 오므로 메모리에 다 쌓이지 않습니다.
+
+추가 패키지 없이 ASGI 규약만 사용하므로 uvicorn, hypercorn 등 어떤 ASGI 서버에서도 동작합니다.
+"""
+
+import asyncio
+import io
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_login.config import COOKIE_NAME as DEFAULT_REMEMBER_COOKIE_NAME
+from flask_login.utils import decode_cookie
+from werkzeug.exceptions import ClientDisconnected
+from werkzeug.http import parse_cookie
+
+import events
+from app import app as flask_app
+from models import Project
+
+EVENTS_PATH = re.compile(r'^/api/project/(\d+)/events$')
+
+_executor = ThreadPoolExecutor(max_workers=flask_app.config.get('ASGI_WORKER_THREADS', 8),
+                               thread_name_prefix='asgi-worker')
+_body_buffer = flask_app.config.get('ASGI_BODY_BUFFER', 1024 * 1024)
+
+
+# --- WSGI 앱 실행 ---
+def _build_environ(scope, body, more_body, loop, receive):
+    """ASGI HTTP scope로 WSGI environ을 만듭니다.
+
+    body는 이벤트 루프에서 미리 읽은 본문이고, more_body면 나머지는 _RequestBody가 받아 옵니다.
+    """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body) if not more_body else
+                      io.BufferedReader(_RequestBody(loop, receive, body), buffer_size=64 * 1024),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+            continue
+        key = f'HTTP_{name}'
+        if key in environ:
+            # HTTP/2에서는 쿠키가 여러 헤더로 나뉘어 올 수 있습니다. 쿠키는 ';'로, 나머지는 ','로 잇습니다.
+            value = f"{environ[key]}{'; ' if key == 'HTTP_COOKIE' else ','}{value}"
+        environ[key] = value
+    environ.pop('HTTP_TRANSFER_ENCODING', None)
+    if more_body:
+        # 서버가 chunked 인코딩을 풀어 주고 본문 끝을 알려 주므로 길이를 몰라도 끝까지 읽을 수 있습니다.
+        environ['wsgi.input_terminated'] = True
+    else:
+        # 본문을 다 읽었으므로 (chunked 요청이었더라도) 길이를 알려 줍니다.
+        environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+async def _read_body_prefix(receive, limit):
+    """본문을 limit 바이트까지 읽어 (읽은 본문, 남은 본문이 있는지)를 반환합니다. 연결이 끊기면 None."""
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body = message.get('body', b'')
+        chunks.append(body)
+        size += len(body)
+        more_body = message.get('more_body', False)
+        if not more_body or size >= limit:
+            return b''.join(chunks), more_body
+
+class _RequestBody(io.RawIOBase):
+    """작업 스레드에서 본문이 필요할 때마다 receive()로 메시지 하나씩 받아 오는 wsgi.input.
+
+    한 번에 메시지 하나만 받아 두므로, 업로드가 아무리 커도 요청마다 메모리는 메시지 하나 크기로 제한됩니다.
+    """
+
+    def __init__(self, loop, receive, prefix):
+        self._loop = loop
+        self._receive = receive
+        self._buffer = bytearray(prefix)
+        self._more = True
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer and self._more:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._more = False
+                raise ClientDisconnected()
+            self._buffer += message.get('body', b'')
+            self._more = message.get('more_body', False)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+class _Cancelled(Exception):
+    """클라이언트가 연결을 끊어 응답 생성을 멈춥니다."""
+
+async def run_wsgi(scope, receive, send):
+    """Flask 앱을 스레드 풀에서 실행하고 응답을 조각 단위로 돌려보냅니다.
+
+    응답 본문은 한 스레드에서 끝까지 순회하므로(stream_with_context 등) 컨텍스트가 유지되고,
+    보내는 쪽이 느리면 크기가 정해진 큐에서 기다리므로 메모리에 쌓이지 않습니다.
+    ASGI_BODY_BUFFER보다 큰 본문은 작업 스레드가 읽는 만큼 받아 오므로, 업로드하는 동안 스레드 하나를 씁니다.
+    """
+    prefix = await _read_body_prefix(receive, _body_buffer)
+    if prefix is None:
+        return
+    loop = asyncio.get_running_loop()
+    environ = _build_environ(scope, *prefix, loop, receive)
+    chunks = asyncio.Queue(maxsize=8)
+    cancelled = False
+
+    def put(item):
+        if cancelled:
+            raise _Cancelled()
+        asyncio.run_coroutine_threadsafe(chunks.put(item), loop).result()
+        if cancelled:
+            raise _Cancelled()
+
+    def start_response(status, headers, exc_info=None):
+        put(('start', int(status.split(' ', 1)[0]), headers))
+
+    def run():
+        try:
+            result = flask_app.wsgi_app(environ, start_response)
+            try:
+                for chunk in result:
+                    if chunk:
+                        put(('body', chunk))
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+            put(('end',))
+        except _Cancelled:
+            pass
+        except BaseException as e:
+            if not cancelled:
+                put(('error', e))
+
+    worker = loop.run_in_executor(_executor, run)
+    started = False
+    try:
+        while True:
+            item = await chunks.get()
+            if item[0] == 'start':
+                await send({
+                    'type': 'http.response.start',
+                    'status': item[1],
+                    'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in item[2]],
+                })
+                started = True
+            elif item[0] == 'body':
+                await send({'type': 'http.response.body', 'body': item[1], 'more_body': True})
+            elif item[0] == 'end':
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+                break
+            else:
+                if started:
+                    raise item[1]
+                await _send_json(send, 500, {'error': '서버 오류가 발생했습니다.'})
+                break
+    finally:
+        # 응답을 다 보내지 못하고 끝나면, 큐에 넣으려고 기다리던 작업 스레드가 한 번 넣고
+        # cancelled를 보고 멈추도록 큐를 한 번 비운 뒤 끝나기를 기다립니다.
+        cancelled = True
+        while not chunks.empty():
+            chunks.get_nowait()
+        await asyncio.wait({worker})
+
+
+# --- 실시간 이벤트 (SSE) ---
+def _session_user_id(scope):
+    """Flask 세션 쿠키(없으면 Flask-Login remember 쿠키)를 검증해 로그인한 사용자 ID를 꺼냅니다.
+    없거나 잘못되었으면 None."""
+    cookie_header = '; '.join(value.decode('latin-1') for name, value in scope.get('headers', []) if name == b'cookie')
+    cookies = parse_cookie(cookie_header)
+
+    session = {}
+    value = cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    if value:
+        serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        try:
+            session = serializer.loads(value, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+        except Exception:
+            session = {}
+    if session.get('_user_id'):
+        return session['_user_id']
+
+    # 로그아웃하면 Flask-Login이 세션에 '_remember': 'clear'를 남기므로 그때는 remember 쿠키를 쓰지 않습니다.
+    remember = cookies.get(flask_app.config.get('REMEMBER_COOKIE_NAME', DEFAULT_REMEMBER_COOKIE_NAME))
+    if remember and session.get('_remember') != 'clear':
+        return decode_cookie(remember, key=flask_app.config['SECRET_KEY'])
+    return None
+
+def _is_member(project_id, user_id):
+    with flask_app.app_context():
+        return Project.is_member(project_id, user_id)
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def _wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def project_events(scope, receive, send, project_id):
+    """views.project_routes.project_events의 비동기 버전입니다. 연결이 열려 있는 동안 스레드를 쓰지 않습니다."""
+    user_id = _session_user_id(scope)
+    if user_id is None:
+        # 스트림을 작업 스레드에서 열면 연결이 끝날 때까지 스레드를 붙잡으므로 다시 로그인하게 합니다.
+        return await _send_json(send, 401, {'error': '로그인이 필요합니다.'})
+
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(_executor, _is_member, project_id, user_id):
+        return await _send_json(send, 403, {'error': '접근 권한이 없습니다.'})
+
+    headers = dict(scope.get('headers', []))
+    try:
+        last_event_id = int(headers[b'last-event-id']) if b'last-event-id' in headers else None
+    except ValueError:
+        last_event_id = None
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+
+    async def pump():
+        stream = events.astream(project_id, last_event_id)
+        try:
+            async for message in stream:
+                await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+        finally:
+            await stream.aclose()
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    # 클라이언트가 끊으면 이벤트를 기다리던 중이어도 바로 구독을 해제합니다.
+    pump_task = asyncio.ensure_future(pump())
+    disconnect_task = asyncio.ensure_future(_wait_disconnect(receive))
+    done, pending = await asyncio.wait({pump_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for task in done:
+        task.result()
+
+
+# --- ASGI 앱 ---
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                _executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    match = EVENTS_PATH.match(scope['path'])
+    if match and scope['method'] == 'GET':
+        return await project_events(scope, receive, send, int(match.group(1)))
+    return await run_wsgi(scope, receive, send)
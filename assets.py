@@ -0,0 +1,226 @@
+# assets.py
+"""정적 파일에 내용 해시를 붙인 주소를 만들고, 미리 압축해 둔 본을 메모리에서 바로 보냅니다.
+
+- 템플릿에서 asset_url('js/main.js')를 쓰면 '/assets/js/main.<해시>.js' 주소가 됩니다.
+  내용이 바뀌면 주소도 바뀌므로 브라우저가 1년 동안 다시 묻지 않고(immutable) 캐시해도 됩니다.
+- ES 모듈은 서로를 './modules/utils.js'처럼 해시 없는 상대 경로로 불러오므로,
+  asset_import_map()이 만드는 import map으로 해시 붙은 주소에 연결합니다. (JS 파일을 고쳐 쓰지 않습니다)
+- 시작할 때 static/의 파일을 읽어 gzip(와 brotli 모듈이 있으면 brotli) 압축본을 만들어 둡니다.
+- JSON_COMPRESS_MIN_SIZE보다 큰 JSON 응답은 요청마다 바로 압축합니다.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from flask import Response, abort, request, url_for
+
+try:
+    import brotli
+except ImportError:   # brotli는 선택 사항입니다. 없으면 gzip만 씁니다.
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# 해시가 없거나 지난 해시로 온 요청은 현재 내용을 보내되 매번 다시 확인하게 합니다.
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+COMPRESSIBLE_TYPES = {'text/css', 'text/javascript', 'text/plain', 'text/html', 'text/csv',
+                      'application/json', 'application/javascript', 'image/svg+xml'}
+JSON_TYPES = {'application/json'}
+
+# 'js/main.1a2b3c4d5e6f.js' -> ('js/main', '1a2b3c4d5e6f', '.js')
+_HASHED_NAME = re.compile(r'^(?P<stem>.+)\.(?P<digest>[0-9a-f]{12})(?P<ext>\.[^./]+)$')
+
+
+class Asset:
+    """static/ 파일 하나의 내용과 압축본"""
+    __slots__ = ('path', 'hashed_path', 'digest', 'mimetype', 'mtime', 'body', 'encoded')
+
+    @classmethod
+    def load(cls, folder, path, min_size, gzip_level, brotli_quality):
+        full_path = os.path.join(folder, path)
+        with open(full_path, 'rb') as f:
+            body = f.read()
+        asset = cls()
+        asset.path = path
+        asset.mtime = os.stat(full_path).st_mtime_ns
+        asset.body = body
+        asset.digest = hashlib.sha256(body).hexdigest()[:12]
+        stem, ext = os.path.splitext(path)
+        asset.hashed_path = f'{stem}.{asset.digest}{ext}'
+        asset.mimetype = 'text/javascript' if ext == '.js' else (mimetypes.guess_type(path)[0] or 'application/octet-stream')
+
+        # 압축해도 작아지지 않는 파일은 원본만 보냅니다.
+        asset.encoded = {}
+        if asset.mimetype in COMPRESSIBLE_TYPES and len(body) >= min_size:
+            candidates = {'gzip': gzip.compress(body, gzip_level, mtime=0)}
+            if brotli is not None:
+                candidates['br'] = brotli.compress(body, quality=brotli_quality)
+            asset.encoded = {name: data for name, data in candidates.items() if len(data) < len(body)}
+        return asset
+
+
+class AssetManifest:
+    """원래 경로 -> Asset, 해시 붙은 경로 -> Asset 목록"""
+
+    def __init__(self, folder, min_size=256, gzip_level=9, brotli_quality=11, auto_reload=False):
+        self.folder = folder
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.auto_reload = auto_reload
+        self._assets = {}
+        self._by_hash = {}
+        self._lock = threading.Lock()
+
+    def build(self):
+        """static/ 아래의 모든 파일을 읽어 해시와 압축본을 만듭니다."""
+        if not self.folder or not os.path.isdir(self.folder):
+            return
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                path = os.path.relpath(os.path.join(root, name), self.folder).replace(os.sep, '/')
+                self._load(path)
+
+    def _load(self, path):
+        asset = Asset.load(self.folder, path, self.min_size, self.gzip_level, self.brotli_quality)
+        with self._lock:
+            previous = self._assets.get(path)
+            if previous is not None:
+                self._by_hash.pop(previous.hashed_path, None)
+            self._assets[path] = asset
+            self._by_hash[asset.hashed_path] = asset
+        return asset
+
+    def get(self, path):
+        """원래 경로의 Asset. 자동 새로고침이 켜져 있으면 파일이 바뀌었을 때 다시 읽습니다."""
+        asset = self._assets.get(path)
+        if not self.auto_reload:
+            return asset
+        full_path = os.path.join(self.folder, path)
+        try:
+            mtime = os.stat(full_path).st_mtime_ns
+        except OSError:
+            return None
+        if asset is None or asset.mtime != mtime:
+            asset = self._load(path)
+        return asset
+
+    def find(self, filename):
+        """요청 경로의 Asset과, 해시가 현재 내용과 맞는지 여부를 돌려줍니다."""
+        asset = self._by_hash.get(filename)
+        if asset is not None:
+            return asset, True
+        # 해시 없는 주소(import map을 모르는 브라우저)나 지난 배포의 해시
+        match = _HASHED_NAME.match(filename)
+        path = match['stem'] + match['ext'] if match else filename
+        if os.path.normpath(path).startswith(('..', '/')):
+            return None, False
+        return self.get(path), False
+
+    def module_paths(self):
+        return [path for path in list(self._assets) if path.endswith('.js')]
+
+
+_manifest = None
+_json_min_size = None
+_json_level = 6
+
+
+# --- 템플릿 도우미 ---
+def asset_url(path):
+    """static/ 기준 경로의 해시 붙은 주소. 지문을 끈 경우나 모르는 파일이면 일반 static 주소입니다."""
+    asset = _manifest.get(path) if _manifest is not None else None
+    if asset is None:
+        return url_for('static', filename=path)
+    return url_for('asset', filename=asset.hashed_path)
+
+def asset_import_map():
+    """ES 모듈의 해시 없는 주소를 해시 붙은 주소로 잇는 import map"""
+    if _manifest is None:
+        return {'imports': {}}
+    imports = {}
+    for path in _manifest.module_paths():
+        asset = _manifest.get(path)
+        if asset is not None:
+            imports[url_for('asset', filename=path)] = url_for('asset', filename=asset.hashed_path)
+    return {'imports': imports}
+
+
+# --- 정적 파일 응답 ---
+def _negotiate(available):
+    """클라이언트가 받을 수 있는 인코딩 중 가장 좋은 것 (없으면 None)"""
+    options = [name for name in ('br', 'gzip') if name in available]
+    if not options:
+        return None
+    best = request.accept_encodings.best_match(options + ['identity'], default='identity')
+    return best if best in available else None
+
+def asset_view(filename):
+    asset, current = _manifest.find(filename)
+    if asset is None:
+        abort(404)
+
+    etag = asset.digest
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        encoding = _negotiate(asset.encoded)
+        response = Response(asset.encoded[encoding] if encoding else asset.body, mimetype=asset.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag, weak=True)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if current else REVALIDATE_CACHE_CONTROL
+    return response
+
+
+# --- JSON 응답 압축 ---
+def _compress_json(response):
+    if (response.mimetype not in JSON_TYPES or response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers):
+        return response
+    data = response.get_data()
+    if len(data) < _json_min_size:
+        return response
+
+    # 받는 쪽에 따라 본문이 달라지므로 압축하지 않을 때도 캐시가 구분하도록 합니다.
+    response.vary.add('Accept-Encoding')
+    encoding = _negotiate({'gzip'} | ({'br'} if brotli is not None else set()))
+    if encoding == 'br':
+        # 요청마다 압축하므로 brotli도 빠른 단계로 압축합니다.
+        response.set_data(brotli.compress(data, quality=min(_json_level, 5)))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, _json_level))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """정적 파일 목록과 압축본을 만들고, /assets 라우트와 템플릿 도우미, JSON 압축 훅을 등록합니다.
+
+    ASSETS_AUTO_RELOAD가 None이면 디버그 모드에서만 파일이 바뀐 것을 확인해 해시를 다시 만듭니다.
+    """
+    global _manifest, _json_min_size, _json_level
+    if app.config.get('ASSETS_FINGERPRINT', True) and app.static_folder:
+        auto_reload = app.config.get('ASSETS_AUTO_RELOAD')
+        _manifest = AssetManifest(app.static_folder,
+                                  min_size=app.config.get('ASSETS_COMPRESS_MIN_SIZE', 256),
+                                  gzip_level=app.config.get('ASSETS_GZIP_LEVEL', 9),
+                                  brotli_quality=app.config.get('ASSETS_BROTLI_QUALITY', 11),
+                                  auto_reload=app.debug if auto_reload is None else auto_reload)
+        _manifest.build()
+        app.add_url_rule(app.config.get('ASSETS_URL_PREFIX', '/assets') + '/<path:filename>', 'asset', asset_view)
+    else:
+        _manifest = None
+    app.context_processor(lambda: {'asset_url': asset_url, 'asset_import_map': asset_import_map})
+
+    _json_min_size = app.config.get('JSON_COMPRESS_MIN_SIZE', 1024)
+    _json_level = app.config.get('JSON_COMPRESS_LEVEL', 6)
+    if _json_min_size is not None:
+        app.after_request(_compress_json)
@@ -0,0 +1,456 @@
+# benchmark.py
+"""엔드포인트별 응답 시간(p50/p95/p99)과 처리량을 측정합니다.
+
+    flask seed-db --users 200 --projects 40 --seed 1     # 먼저 측정용 데이터를 만듭니다
+    python benchmark.py client                           # Flask 테스트 클라이언트로 (서버 없이)
+    python benchmark.py http --url http://127.0.0.1:5000 --concurrency 16
+    python benchmark.py client --compare benchmarks/20261018-090000-client.json
+
+client 모드는 같은 프로세스에서 앱을 직접 호출하므로 네트워크 없이 뷰와 DB 비용만 보고,
+http 모드는 실행 중인 로컬 서버(flask run, gunicorn, uvicorn asgi:application 등)에
+워커마다 keep-alive 연결 하나씩으로 동시에 요청을 보냅니다.
+
+로그인 계정은 seed-db가 만든 사용자(기본: bench00001 / password)를 씁니다. 읽기 요청은 이 사용자가
+속한 (시드된) 프로젝트를 대상으로 하고, 쓰기 요청은 측정을 위해 새로 만든 프로젝트에서 합니다.
+실시간 이벤트 스트림(/api/project/<id>/events)은 응답이 끝나지 않는 요청이라 측정하지 않습니다.
+
+결과는 benchmarks/<시각>-<모드>.json으로 저장되고, --compare로 이전 결과와 비교해
+p95가 --threshold 비율 이상 느려진 엔드포인트가 있으면 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+RESULTS_DIR = 'benchmarks'
+
+
+# --- 세션 ---
+class ClientSession:
+    """Flask 테스트 클라이언트로 요청합니다. 워커마다 하나씩 만들어 쿠키를 따로 가집니다."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None, json_body=None):
+        response = self.client.open(path, method=method, data=data, json=json_body)
+        body = response.get_data()
+        response.close()
+        return response.status_code, body
+
+
+class HttpSession:
+    """실행 중인 서버에 keep-alive 연결 하나로 요청하고 쿠키를 직접 관리합니다."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.cookies = {}
+        self.conn = None
+
+    def request(self, method, path, data=None, json_body=None):
+        headers = {}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif data is not None:
+            body = urlencode(data).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{name}={value}" for name, value in self.cookies.items())
+
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                payload = response.read()
+            except (http.client.HTTPException, OSError):
+                # 서버가 keep-alive 연결을 닫았으면 한 번만 다시 연결합니다.
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+                continue
+            for header in response.headers.get_all('Set-Cookie') or ():
+                for name, morsel in SimpleCookie(header).items():
+                    if morsel['max-age'] == '0' or not morsel.value:
+                        self.cookies.pop(name, None)
+                    else:
+                        self.cookies[name] = morsel.value
+            if response.will_close:
+                self.conn.close()
+                self.conn = None
+            return response.status, payload
+
+
+def _json(body):
+    return json.loads(body.decode('utf-8'))
+
+
+# --- 측정 대상 ---
+class Endpoint:
+    """측정할 요청 하나의 정의입니다.
+
+    build(ctx, i)는 (method, path, data, json_body)를 반환합니다. prepare(session, ctx, i)는
+    측정 전에 필요한 준비(예: 로그아웃 전에 로그인)를 하고, collect(ctx, body)는 응답에서
+    다음 단계가 쓸 값을 모읍니다. session이 'auth'면 로그인하지 않은 별도 세션을 씁니다.
+    """
+
+    def __init__(self, name, build, prepare=None, collect=None, session='user', expect=(200,)):
+        self.name = name
+        self.build = build
+        self.prepare = prepare
+        self.collect = collect
+        self.session = session
+        self.expect = expect
+
+
+def _period(days_from_now, length_days):
+    start = datetime.now().replace(second=0, microsecond=0) + timedelta(days=days_from_now)
+    return start.strftime('%Y-%m-%dT%H:%M'), (start + timedelta(days=length_days)).strftime('%Y-%m-%dT%H:%M')
+
+def _pop(ctx, key):
+    with ctx['lock']:
+        return ctx[key].popleft()
+
+def _push(ctx, key, value):
+    with ctx['lock']:
+        ctx[key].append(value)
+
+def _login(session, ctx, i=None):
+    session.request('POST', '/login', data={'username': ctx['username'], 'password': ctx['password']})
+
+def _collect_task(ctx, body):
+    _push(ctx, 'new_tasks', _json(body)['task']['id'])
+
+def _collect_comment(ctx, body):
+    _push(ctx, 'new_comments', _json(body)['comment']['id'])
+
+def _fixture_task(ctx, i):
+    return ctx['fixture_tasks'][i % len(ctx['fixture_tasks'])]
+
+def _edit_task(ctx, i):
+    start, end = _period(i % 30, 3)
+    return 'POST', f"/api/task/{_fixture_task(ctx, i)}/edit", {'task_name': f"bench {i}", 'start_date': start,
+                                                               'end_date': end}, None
+
+def _bulk_status(ctx, i):
+    tasks = ctx['fixture_tasks']
+    status = ('대기', '진행 중', '완료')[i % 3]
+    return 'POST', '/api/tasks/bulk', None, {'operations': [
+        {'op': 'status', 'task_id': tasks[(i * 20 + k) % len(tasks)], 'status': status} for k in range(20)
+    ]}
+
+def endpoints():
+    """auth_routes와 project_routes의 라우트를 측정 순서대로 나열합니다.
+    만드는 단계가 지우는 단계보다 앞에 오도록 배치되어 있습니다."""
+    read = lambda path: (lambda ctx, i: ('GET', path(ctx, i), None, None))
+    tag = lambda ctx: ctx['tag']
+    return [
+        # auth_routes
+        Endpoint('GET /login', read(lambda ctx, i: '/login'), session='auth'),
+        Endpoint('GET /register', read(lambda ctx, i: '/register'), session='auth'),
+        Endpoint('POST /register', lambda ctx, i: ('POST', '/register', {
+            'username': f"load-{tag(ctx)}-{i}", 'password': 'password'}, None),
+            session='auth', expect=(302,)),
+        Endpoint('POST /login', lambda ctx, i: ('POST', '/login', {
+            'username': ctx['username'], 'password': ctx['password']}, None),
+            session='auth', expect=(302,)),
+        Endpoint('GET /logout', read(lambda ctx, i: '/logout'), prepare=_login, session='auth', expect=(302,)),
+        # project_routes: 읽기
+        Endpoint('GET /', read(lambda ctx, i: '/'), expect=(302,)),
+        Endpoint('GET /dashboard', read(lambda ctx, i: '/dashboard')),
+        Endpoint('GET /api/dashboard/projects', read(lambda ctx, i: '/api/dashboard/projects')),
+        Endpoint('GET /api/dashboard/tasks', read(lambda ctx, i: '/api/dashboard/tasks')),
+        Endpoint('GET /project/<id>', read(lambda ctx, i: f"/project/{ctx['read_project']}")),
+        Endpoint('GET /api/project/<id>/chartjs-data',
+                 read(lambda ctx, i: f"/api/project/{ctx['read_project']}/chartjs-data")),
+        Endpoint('GET /api/project/<id>/stats', read(lambda ctx, i: f"/api/project/{ctx['read_project']}/stats")),
+        Endpoint('GET /api/project/<id>/changes',
+                 read(lambda ctx, i: f"/api/project/{ctx['read_project']}/changes?since=0")),
+        Endpoint('GET /api/task/<id>/comments',
+                 read(lambda ctx, i: f"/api/task/{ctx['read_tasks'][i % len(ctx['read_tasks'])]}/comments")),
+        # project_routes: 쓰기
+        Endpoint('POST /projects/create', lambda ctx, i: ('POST', '/projects/create', dict(zip(
+            ('project_name', 'start_date', 'end_date'), (f"load-{tag(ctx)}-{i}",) + _period(0, 90))), None),
+            expect=(302,)),
+        Endpoint('POST /api/project/<id>/edit', lambda ctx, i: ('POST', f"/api/project/{ctx['write_project']}/edit",
+            dict(zip(('project_name', 'start_date', 'end_date'), (f"bench-{tag(ctx)}",) + _period(0, 90 + i % 5))),
+            None)),
+        Endpoint('POST /api/project/<id>/invite', lambda ctx, i: ('POST', f"/api/project/{ctx['write_project']}/invite",
+            {'username': f"load-{tag(ctx)}-{i}"}, None)),
+        Endpoint('POST /project/<id>/tasks/create', lambda ctx, i: ('POST',
+            f"/project/{ctx['write_project']}/tasks/create",
+            dict(zip(('task_name', 'start_date', 'end_date'), (f"new {i}",) + _period(i % 30, 2))), None),
+            collect=_collect_task),
+        Endpoint('POST /tasks/<id>/update-status', lambda ctx, i: ('POST',
+            f"/tasks/{_fixture_task(ctx, i)}/update-status", {'status': ('진행 중', '완료', '대기')[i % 3]}, None)),
+        Endpoint('POST /api/task/<id>/edit', _edit_task),
+        Endpoint('POST /api/task/<id>/assign', lambda ctx, i: ('POST', f"/api/task/{_fixture_task(ctx, i)}/assign",
+            {'assignee_id': ctx['user_id']}, None)),
+        Endpoint('POST /api/tasks/bulk', _bulk_status),
+        Endpoint('POST /api/task/<id>/comments/add', lambda ctx, i: ('POST',
+            f"/api/task/{_fixture_task(ctx, i)}/comments/add", {'content': f"bench comment {i}"}, None),
+            collect=_collect_comment),
+        Endpoint('POST /api/comments/<id>/delete', lambda ctx, i: ('POST',
+            f"/api/comments/{_pop(ctx, 'new_comments')}/delete", None, None)),
+        Endpoint('POST /tasks/<id>/delete', lambda ctx, i: ('POST', f"/tasks/{_pop(ctx, 'new_tasks')}/delete", None,
+            None)),
+        Endpoint('POST /projects/<id>/delete', lambda ctx, i: ('POST',
+            f"/projects/{_pop(ctx, 'new_projects')}/delete", None, None), expect=(302,)),
+    ]
+
+
+# --- 준비 ---
+def _my_projects(session):
+    """로그인한 사용자의 프로젝트를 [(id, 이름), ...]로 모두 가져옵니다."""
+    projects, cursor = [], None
+    while True:
+        path = '/api/dashboard/projects?limit=200' + (f"&cursor={cursor}" if cursor else '')
+        page = _json(session.request('GET', path)[1])
+        projects.extend((item['id'], item['project_name']) for item in page['items'])
+        cursor = page.get('next_cursor')
+        if not cursor:
+            return projects
+
+def setup(session, username, password, fixture_tasks):
+    """로그인하고 측정에 쓸 프로젝트와 작업을 준비해 ctx를 만듭니다."""
+    ctx = {'username': username, 'password': password, 'tag': uuid.uuid4().hex[:8], 'lock': threading.Lock(),
+           'new_tasks': deque(), 'new_comments': deque(), 'new_projects': deque()}
+    status, _ = session.request('POST', '/login', data={'username': username, 'password': password})
+    if status != 302 or not session.request('GET', '/api/dashboard/projects')[0] == 200:
+        raise SystemExit(f"'{username}'으로 로그인하지 못했습니다. 먼저 `flask seed-db`를 실행하세요.")
+
+    projects = _my_projects(session)
+    if not projects:
+        raise SystemExit(f"'{username}'이 속한 프로젝트가 없습니다. 먼저 `flask seed-db`를 실행하세요.")
+    ctx['read_project'] = projects[0][0]
+    chart = _json(session.request('GET', f"/api/project/{ctx['read_project']}/chartjs-data")[1])
+    ctx['read_tasks'] = [task_id for task_id in chart.get('task_ids', []) if task_id is not None]
+    if not ctx['read_tasks']:
+        raise SystemExit(f"프로젝트 {ctx['read_project']}에 작업이 없습니다.")
+
+    # 쓰기 요청은 측정용으로 새로 만든 프로젝트에서 합니다.
+    name = f"bench-{ctx['tag']}"
+    start, end = _period(0, 90)
+    session.request('POST', '/projects/create', data={'project_name': name, 'start_date': start, 'end_date': end})
+    ctx['write_project'] = next(pid for pid, project_name in _my_projects(session) if project_name == name)
+    members = _json(session.request('GET', f"/api/project/{ctx['write_project']}/changes?since=0")[1])['members']
+    ctx['user_id'] = next(m['id'] for m in members if m['username'] == username)
+
+    operations = [dict(zip(('start_date', 'end_date'), _period(i % 30, 5)), op='create',
+                       project_id=ctx['write_project'], task_name=f"fixture {i}") for i in range(fixture_tasks)]
+    result = _json(session.request('POST', '/api/tasks/bulk', json_body={'operations': operations})[1])
+    ctx['fixture_tasks'] = [item['task_id'] for item in result['results'] if item['success']]
+    return ctx
+
+def _collect_projects(session, ctx):
+    """POST /projects/create 단계에서 만든 프로젝트 ID를 모아 삭제 단계에 넘깁니다."""
+    prefix = f"load-{ctx['tag']}-"
+    ctx['new_projects'].extend(pid for pid, name in _my_projects(session) if name.startswith(prefix))
+
+
+# --- 측정 ---
+def percentile(sorted_values, p):
+    """정렬된 값에서 nearest-rank 방식으로 p 백분위수를 구합니다."""
+    if not sorted_values:
+        return 0.0
+    index = max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+def run_endpoint(endpoint, sessions, ctx, requests, concurrency):
+    """requests개의 요청을 concurrency개 워커로 나눠 보내고 통계를 반환합니다."""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker(session):
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            if endpoint.prepare:
+                endpoint.prepare(session, ctx, i)
+            try:
+                method, path, data, json_body = endpoint.build(ctx, i)
+            except IndexError:
+                # 앞 단계에서 만든 대상이 모자라면 요청하지 않습니다.
+                with lock:
+                    errors.append('대상 없음')
+                continue
+            started = time.perf_counter()
+            try:
+                status, body = session.request(method, path, data=data, json_body=json_body)
+            except Exception as e:
+                with lock:
+                    errors.append(type(e).__name__)
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if status not in endpoint.expect:
+                    errors.append(status)
+            if endpoint.collect and status in endpoint.expect:
+                endpoint.collect(ctx, body)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, sessions[:concurrency]))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_samples': sorted({str(e) for e in errors})[:5],
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        'max_ms': round(latencies[-1], 3) if latencies else 0.0,
+        'throughput_rps': round(len(latencies) / wall, 1) if wall else 0.0,
+    }
+
+def run(make_session, args):
+    """모든 엔드포인트를 차례로 측정하고 결과 딕셔너리를 반환합니다."""
+    owner = make_session()
+    ctx = setup(owner, args.username, args.password, args.fixture_tasks)
+
+    user_sessions = [owner]
+    for _ in range(args.concurrency - 1):
+        session = make_session()
+        _login(session, ctx)
+        user_sessions.append(session)
+    auth_sessions = [make_session() for _ in range(args.concurrency)]
+
+    selected = [e for e in endpoints() if not args.only or any(word in e.name for word in args.only)]
+    results = {}
+    for endpoint in selected:
+        sessions = auth_sessions if endpoint.session == 'auth' else user_sessions
+        for _ in range(args.warmup):
+            # 워밍업은 캐시와 커넥션 풀을 채우기 위한 것으로 결과에 넣지 않습니다.
+            if endpoint.collect is None and endpoint.name.startswith('GET'):
+                method, path, data, json_body = endpoint.build(ctx, 0)
+                sessions[0].request(method, path, data=data, json_body=json_body)
+        stats = run_endpoint(endpoint, sessions, ctx, args.requests, args.concurrency)
+        results[endpoint.name] = stats
+        _print_row(endpoint.name, stats)
+        if endpoint.name == 'POST /projects/create':
+            _collect_projects(owner, ctx)
+    return results
+
+
+# --- 출력과 저장 ---
+def _print_header():
+    print(f"{'엔드포인트':<42}{'요청':>7}{'오류':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}")
+
+def _print_row(name, stats):
+    print(f"{name:<42}{stats['requests']:>7}{stats['errors']:>6}{stats['p50_ms']:>9.2f}"
+          f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['throughput_rps']:>9.1f}")
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save(results, args):
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(args.output_dir, f"{stamp}-{args.mode}.json")
+    report = {
+        'meta': {
+            'mode': args.mode,
+            'url': args.url if args.mode == 'http' else None,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'fixture_tasks': args.fixture_tasks,
+            'revision': _git_revision(),
+            'python': sys.version.split()[0],
+            'started_at': stamp,
+        },
+        'endpoints': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+def compare(results, baseline_path, threshold, mode, concurrency):
+    """이전 결과와 p95를 비교해 표를 출력하고, 느려진 엔드포인트 목록을 반환합니다."""
+    with open(baseline_path, encoding='utf-8') as f:
+        report = json.load(f)
+    baseline = report['endpoints']
+    regressions = []
+    print(f"\n{baseline_path}와 비교 (p95, ms)")
+    if report['meta'].get('mode') != mode or report['meta'].get('concurrency') != concurrency:
+        print(f"주의: 기준 결과는 {report['meta'].get('mode')} 모드, 동시성 {report['meta'].get('concurrency')}로 "
+              "측정되었습니다. 같은 조건끼리 비교해야 의미가 있습니다.")
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if not before or not before['p95_ms']:
+            continue
+        ratio = stats['p95_ms'] / before['p95_ms']
+        # 1ms 미만의 차이는 측정 오차로 봅니다.
+        slower = ratio > 1 + threshold and stats['p95_ms'] - before['p95_ms'] > 1.0
+        if slower:
+            regressions.append(name)
+        print(f"{name:<42}{before['p95_ms']:>9.2f} -> {stats['p95_ms']:>9.2f} ({ratio - 1:+.0%})"
+              + ('  << 느려짐' if slower else ''))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='엔드포인트별 응답 시간과 처리량을 측정합니다.')
+    parser.add_argument('mode', choices=('client', 'http'), help='client: Flask 테스트 클라이언트, http: 실행 중인 서버')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='http 모드에서 요청할 서버 주소')
+    parser.add_argument('--requests', type=int, default=200, help='엔드포인트마다 보낼 요청 수')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시에 요청하는 워커 수')
+    parser.add_argument('--warmup', type=int, default=5, help='읽기 엔드포인트마다 먼저 보낼 요청 수')
+    parser.add_argument('--username', default='bench00001', help='seed-db로 만든 로그인 계정')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--fixture-tasks', type=int, default=200, help='쓰기 측정용 프로젝트에 미리 만들 작업 수')
+    parser.add_argument('--only', nargs='*', help='이름에 이 문자열이 들어간 엔드포인트만 측정')
+    parser.add_argument('--output-dir', default=RESULTS_DIR, help='결과 JSON을 저장할 디렉터리')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일')
+    parser.add_argument('--threshold', type=float, default=0.2, help='느려졌다고 판단할 p95 증가 비율')
+    args = parser.parse_args(argv)
+
+    if args.mode == 'client':
+        from app import app
+        make_session = lambda: ClientSession(app)
+    else:
+        make_session = lambda: HttpSession(args.url)
+
+    _print_header()
+    results = run(make_session, args)
+    path = save(results, args)
+    print(f"\n결과를 {path}에 저장했습니다.")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold, args.mode, args.concurrency)
+        if regressions:
+            print(f"\n느려진 엔드포인트 {len(regressions)}개: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# cache.py
+"""프로세스 내부에서 사용하는 간단한 캐시."""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """크기 제한과 만료 시간(TTL)이 있는 스레드 안전 LRU 캐시입니다.
+
+    가장 오래 사용되지 않은 항목부터 밀려나고, ttl초가 지난 항목은 조회 시 버려집니다.
+    적중/실패 횟수는 stats()로 확인할 수 있습니다.
+
+    DB에서 읽어 채울 때는 읽기 전에 generation()을 받아 set(..., generation=...)에 넘깁니다.
+    그 사이에 무효화가 있었으면 읽은 값이 이미 낡았을 수 있으므로 저장하지 않습니다.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._generation = 0   # 무효화될 때마다 올라가는 값
+        self._stale_sets = 0
+
+    def configure(self, maxsize=None, ttl=None):
+        """크기 제한과 TTL을 바꿉니다. 기존 항목은 비웁니다."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._data.clear()
+            self._generation += 1
+
+    def get(self, key, default=None):
+        """캐시된 값을 반환합니다. 없거나 만료되었으면 default를 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+            self._misses += 1
+            return default
+
+    def generation(self):
+        """현재 무효화 세대. DB에서 값을 읽기 전에 받아 set()에 넘깁니다."""
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, generation=None):
+        """값을 저장합니다. 크기 제한을 넘으면 가장 오래된 항목을 버립니다.
+
+        generation이 주어졌는데 그 뒤로 무효화가 있었으면 저장하지 않습니다.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self._stale_sets += 1
+                return
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key):
+        """항목 하나를 지웁니다."""
+        with self._lock:
+            self._generation += 1
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self._invalidations += 1
+
+    def clear(self):
+        """모든 항목을 지웁니다."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self):
+        """캐시 크기와 적중/실패 횟수를 딕셔너리로 반환합니다."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits_total': self._hits,
+                'misses_total': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions_total': self._evictions,
+                'invalidations_total': self._invalidations,
+                'stale_sets_total': self._stale_sets,
+            }
+
+
+class VersionedTTLCache(TTLCache):
+    """공유 버전 값이 바뀌면 통째로 비워지는 TTLCache입니다.
+
+    여러 프로세스(gunicorn 워커)가 같은 DB를 사용할 때, 다른 프로세스에서 일어난 변경은
+    DB에 저장된 버전 값으로 알아챕니다. 버전 확인은 check_interval초에 한 번만 하므로
+    대부분의 조회는 DB에 접근하지 않습니다.
+    """
+
+    def __init__(self, version_loader, maxsize=1024, ttl=300.0, check_interval=1.0):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.version_loader = version_loader
+        self.check_interval = check_interval
+        self._version = None
+        self._checked_at = float('-inf')
+        self._version_changes = 0
+
+    def configure(self, maxsize=None, ttl=None, check_interval=None):
+        if check_interval is not None:
+            self.check_interval = check_interval
+        super().configure(maxsize=maxsize, ttl=ttl)
+
+    def validate(self):
+        """check_interval이 지났으면 공유 버전을 확인하고, 바뀌었으면 캐시를 비웁니다."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+        version = self.version_loader()
+        with self._lock:
+            if self._version is not None and version != self._version:
+                self._generation += 1
+                self._invalidations += len(self._data)
+                self._data.clear()
+                self._version_changes += 1
+            self._version = version
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats['version'] = self._version
+            stats['version_changes_total'] = self._version_changes
+        return stats
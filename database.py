@@ -1,79 +1,415 @@
+import logging
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from flask import g
 
 DATABASE_NAME = 'planner.db'
 
+logger = logging.getLogger(__name__)
+
+# --- 커밋 후 콜백 ---
+# 쓰기 작업을 실행하는 스레드마다 '커밋되면 실행할 함수' 목록과 쓰기 중인 커넥션을 보관합니다.
+_commit_hooks = threading.local()
+
+def on_commit(fn):
+    """현재 쓰기 작업이 커밋된 뒤 fn()을 호출하도록 예약합니다. 롤백되면 호출하지 않습니다.
+
+    run_write에 넘긴 함수 밖에서 호출하면 바로 실행합니다.
+    """
+    callbacks = getattr(_commit_hooks, 'callbacks', None)
+    if callbacks is None:
+        fn()
+    else:
+        callbacks.append(fn)
+
+def _begin_hooks(conn):
+    _commit_hooks.callbacks = []
+    _commit_hooks.conn = conn
+
+def _end_hooks():
+    callbacks = getattr(_commit_hooks, 'callbacks', None) or []
+    _commit_hooks.callbacks = None
+    _commit_hooks.conn = None
+    return callbacks
+
+def _run_hooks(callbacks):
+    # 이미 커밋된 뒤이므로 콜백이 실패해도 쓰기 결과는 바꾸지 않습니다.
+    for fn in callbacks:
+        try:
+            fn()
+        except Exception:
+            logger.exception("커밋 후 콜백 실행 실패")
+
+
+# --- 커넥션 풀 ---
+class PoolTimeout(Exception):
+    """제한 시간 안에 풀에서 커넥션을 빌리지 못했을 때 발생합니다."""
+
+class WriteTimeout(sqlite3.OperationalError):
+    """쓰기 큐에 넣은 작업이 DB_WRITE_TIMEOUT 안에 시작되지 않아 취소되었을 때 발생합니다.
+
+    작업은 실행되지 않았으므로 'database is locked'처럼 sqlite3.Error로 처리하면 됩니다.
+    """
+
+
+class ConnectionPool:
+    """크기가 제한된 SQLite 커넥션 풀입니다.
+
+    요청마다 connect()/close()를 반복하는 대신, 열어 둔 커넥션을 재사용해
+    연결 비용과 스키마 파싱 비용을 줄입니다.
+    """
+
+    SYNCHRONOUS_LEVELS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+    def __init__(self, database, max_size=8, timeout=5.0, journal_mode='WAL',
+                 synchronous='NORMAL', busy_timeout_ms=5000, checkpoint_interval=60.0,
+                 factory=sqlite3.Connection):
+        if synchronous.upper() not in self.SYNCHRONOUS_LEVELS:
+            raise ValueError(f"지원하지 않는 synchronous 값입니다: {synchronous}")
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous.upper()
+        self.busy_timeout_ms = busy_timeout_ms
+        self.checkpoint_interval = checkpoint_interval
+        self.factory = factory   # 커넥션 클래스 (예: 쿼리를 측정하는 metrics.InstrumentedConnection)
+        self._last_checkpoint = time.monotonic()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = []
+        self._lock = threading.Lock()
+        # 통계 값
+        self._opened = 0
+        self._borrowed = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+
+    def _connect(self):
+        """새 커넥션을 열고 동시성 관련 PRAGMA를 적용합니다.
+
+        풀에서 스레드 사이로 넘겨지므로 check_same_thread를 끕니다.
+        WAL 모드에서는 읽기가 쓰기를 기다리지 않고, busy_timeout 동안은
+        "database is locked" 대신 잠금이 풀리기를 기다립니다.
+        """
+        conn = sqlite3.connect(self.database, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False, factory=self.factory)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        return conn
+
+    def maybe_checkpoint(self, conn):
+        """checkpoint_interval이 지났으면 WAL 파일을 DB에 반영합니다(PASSIVE)."""
+        if not self.checkpoint_interval:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_checkpoint < self.checkpoint_interval:
+                return
+            self._last_checkpoint = now
+        try:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error:
+            pass
+
+    def acquire(self):
+        """풀에서 커넥션을 빌립니다. 모두 사용 중이면 timeout 동안 기다립니다."""
+        waited = 0.0
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            acquired = self._slots.acquire(timeout=self.timeout)
+            waited = time.perf_counter() - start
+            with self._lock:
+                self._waits += 1
+                self._wait_time += waited
+                self._max_wait = max(self._max_wait, waited)
+                if not acquired:
+                    self._timeouts += 1
+            if not acquired:
+                raise PoolTimeout(f"{self.timeout}초 안에 DB 커넥션을 얻지 못했습니다.")
+
+        with self._lock:
+            self._borrowed += 1
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                self._slots.release()
+                raise
+            with self._lock:
+                self._opened += 1
+        return conn
+
+    def release(self, conn):
+        """커넥션을 풀에 반납합니다. 끝나지 않은 트랜잭션은 롤백합니다."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self.maybe_checkpoint(conn)
+        except sqlite3.Error:
+            # 망가진 커넥션은 풀에 돌려놓지 않고 버립니다.
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    def close_all(self):
+        """쉬고 있는 커넥션을 모두 닫습니다."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        """풀 크기와 대기 시간 통계를 딕셔너리로 반환합니다."""
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                'max_size': self.max_size,
+                'open': self._opened,
+                'idle': idle,
+                'in_use': self._opened - idle,
+                'borrowed_total': self._borrowed,
+                'waits_total': self._waits,
+                'wait_time_total_ms': round(self._wait_time * 1000, 3),
+                'wait_time_max_ms': round(self._max_wait * 1000, 3),
+                'timeouts_total': self._timeouts,
+            }
+
+
+# --- 단일 쓰기 큐 ---
+class WriteQueue:
+    """여러 요청의 작은 쓰기 작업을 모아 하나의 트랜잭션으로 실행하는 단일 쓰기 스레드입니다.
+
+    SQLite는 한 번에 한 커넥션만 쓸 수 있으므로, 요청마다 잠금을 두고 경쟁하는 대신
+    쓰기 스레드 하나가 작업을 모아 BEGIN IMMEDIATE ... COMMIT 한 번으로 처리합니다.
+    각 작업은 SAVEPOINT로 감싸므로 하나가 실패해도 같은 배치의 다른 작업은 반영됩니다.
+    """
+
+    def __init__(self, pool, max_batch=64, max_delay=0.002):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._jobs_done = 0
+        self._failures = 0
+
+    def start(self):
+        """쓰기 스레드를 시작합니다."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, fn):
+        """쓰기 작업 fn(cursor)을 큐에 넣고 결과를 받을 Future를 반환합니다."""
+        self.start()
+        future = Future()
+        self._jobs.put((fn, future))
+        return future
+
+    def _run(self):
+        conn = self.pool._connect()
+        while True:
+            batch = [self._jobs.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._jobs.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._apply(conn, batch)
+            self.pool.maybe_checkpoint(conn)
+
+    def _apply(self, conn, batch):
+        # 기다리다 취소된 작업은 건너뜁니다. 실행 중으로 표시한 작업은 더 이상 취소되지 않습니다.
+        batch = [(fn, future) for fn, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        results = []
+        hooks = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, future in batch:
+                conn.execute("SAVEPOINT write_job")
+                _begin_hooks(conn)
+                try:
+                    result = fn(conn.cursor())
+                except Exception as e:
+                    _end_hooks()
+                    conn.execute("ROLLBACK TO write_job")
+                    conn.execute("RELEASE write_job")
+                    results.append((future, None, e))
+                else:
+                    hooks.extend(_end_hooks())
+                    conn.execute("RELEASE write_job")
+                    results.append((future, result, None))
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self._failures += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._jobs_done += len(batch)
+        # 요청이 응답하기 전에 커밋 후 콜백(이벤트 발행 등)이 끝나도록 결과보다 먼저 실행합니다.
+        _run_hooks(hooks)
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self):
+        """배치 수와 평균 배치 크기 등 쓰기 큐 통계를 반환합니다."""
+        with self._lock:
+            return {
+                'pending': self._jobs.qsize(),
+                'batches_total': self._batches,
+                'jobs_total': self._jobs_done,
+                'failed_jobs_total': self._failures,
+                'avg_batch_size': round(self._jobs_done / self._batches, 2) if self._batches else 0,
+            }
+
+
+_pool = None
+_write_queue = None
+_write_timeout = 10.0
+
+def init_app(app):
+    """앱 설정으로 커넥션 풀(과 선택적으로 쓰기 큐)을 만들고, 요청이 끝날 때 커넥션을 반납하도록 등록합니다."""
+    global _pool, _write_queue, _write_timeout
+    _pool = ConnectionPool(
+        app.config.get('DATABASE', DATABASE_NAME),
+        max_size=app.config.get('DB_POOL_SIZE', 8),
+        timeout=app.config.get('DB_POOL_TIMEOUT', 5.0),
+        journal_mode=app.config.get('DB_JOURNAL_MODE', 'WAL'),
+        synchronous=app.config.get('DB_SYNCHRONOUS', 'NORMAL'),
+        busy_timeout_ms=app.config.get('DB_BUSY_TIMEOUT_MS', 5000),
+        checkpoint_interval=app.config.get('DB_CHECKPOINT_INTERVAL', 60.0),
+        factory=app.config.get('DB_CONNECTION_FACTORY', sqlite3.Connection),
+    )
+    _write_queue = None
+    if app.config.get('DB_WRITE_QUEUE', False):
+        _write_queue = WriteQueue(
+            _pool,
+            max_batch=app.config.get('DB_WRITE_BATCH_SIZE', 64),
+            max_delay=app.config.get('DB_WRITE_BATCH_DELAY', 0.002),
+        )
+    _write_timeout = app.config.get('DB_WRITE_TIMEOUT', 10.0)
+    app.teardown_appcontext(close_db)
+
+def get_pool():
+    """현재 커넥션 풀을 반환합니다. init_app 전이라면 기본 설정으로 만듭니다."""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(DATABASE_NAME)
+    return _pool
+
+def pool_stats():
+    """커넥션 풀 통계를 반환합니다."""
+    return get_pool().stats()
+
+def write_queue_stats():
+    """쓰기 큐 통계를 반환합니다. 쓰기 큐를 사용하지 않으면 None을 반환합니다."""
+    return _write_queue.stats() if _write_queue is not None else None
+
 def get_db():
-    """데이터베이스 커넥션을 반환합니다."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    return conn
+    """현재 요청에서 사용할 데이터베이스 커넥션을 반환합니다.
+
+    요청(앱 컨텍스트)마다 풀에서 한 번만 빌려 g에 보관하고,
+    같은 요청 안의 모든 모델 메서드가 이 커넥션을 함께 사용합니다.
+    """
+    if 'db' not in g:
+        g.db = get_pool().acquire()
+    return g.db
+
+def close_db(e=None):
+    """요청이 끝나면 빌린 커넥션을 풀에 반납합니다."""
+    db = g.pop('db', None)
+    if db is not None:
+        get_pool().release(db)
+
+def run_write(fn):
+    """쓰기 작업 fn(cursor)을 실행하고 커밋한 뒤 fn의 반환값을 돌려줍니다.
+
+    쓰기 큐가 켜져 있으면 단일 쓰기 스레드에 맡겨 다른 요청의 쓰기와 한 트랜잭션으로 묶고,
+    꺼져 있으면 현재 요청의 커넥션에서 바로 실행합니다. fn이 예외를 던지면 롤백됩니다.
+    fn 안에서 on_commit으로 예약한 함수는 커밋이 끝난 뒤 호출됩니다.
+
+    쓰기 큐에서 DB_WRITE_TIMEOUT 안에 시작되지 못한 작업은 취소하고 WriteTimeout을 발생시킵니다.
+    이미 시작된 작업은 커밋이나 롤백이 끝날 때까지 기다립니다.
+    다른 쓰기 작업의 fn 안에서 부르면 SAVEPOINT로 바깥 트랜잭션에 합류합니다.
+    """
+    outer = getattr(_commit_hooks, 'conn', None)
+    if outer is not None:
+        return _run_nested(outer, fn)
+
+    if _write_queue is not None:
+        future = _write_queue.submit(fn)
+        try:
+            return future.result(timeout=_write_timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise WriteTimeout(f"{_write_timeout}초 안에 쓰기 작업을 시작하지 못했습니다.") from None
+            return future.result()
+
+    db = get_db()
+    _begin_hooks(db)
+    try:
+        result = fn(db.cursor())
+        db.commit()
+    except Exception:
+        _end_hooks()
+        db.rollback()
+        raise
+    _run_hooks(_end_hooks())
+    return result
+
+def _run_nested(conn, fn):
+    """쓰기 작업 안에서 부른 run_write. 커밋과 커밋 후 콜백은 바깥 작업이 끝날 때 처리합니다."""
+    if not conn.in_transaction:
+        # 바깥 작업이 아직 아무것도 쓰지 않았으면 SAVEPOINT가 트랜잭션을 열고 RELEASE가 커밋해 버리므로 먼저 엽니다.
+        conn.execute("BEGIN")
+    callbacks = _commit_hooks.callbacks
+    mark = len(callbacks)
+    conn.execute("SAVEPOINT nested_write")
+    try:
+        result = fn(conn.cursor())
+    except Exception:
+        del callbacks[mark:]
+        conn.execute("ROLLBACK TO nested_write")
+        conn.execute("RELEASE nested_write")
+        raise
+    conn.execute("RELEASE nested_write")
+    return result
 
 def create_tables():
-    """프로젝트에서 사용할 모든 테이블을 생성합니다."""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # 1. users 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
-            role TEXT NOT NULL
-        )
-    ''')
-
-    # 2. projects 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_name TEXT NOT NULL,
-            created_by INTEGER,
-            start_date TEXT,
-            end_date TEXT,
-            FOREIGN KEY (created_by) REFERENCES users (id)
-        )
-    ''')
-
-    # 3. project_members 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_members (
-            project_id INTEGER,
-            user_id INTEGER,
-            role TEXT NOT NULL, -- '팀장' 또는 '팀원' 역할을 저장할 컬럼 추가
-            PRIMARY KEY (project_id, user_id),
-            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
-            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-        )
-    ''')
-
-    # 4. tasks 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_id INTEGER,
-            task_name TEXT NOT NULL,
-            start_date TEXT,
-            end_date TEXT,
-            status TEXT,
-            assignee_id INTEGER,
-            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
-            FOREIGN KEY (assignee_id) REFERENCES users (id)
-        )
-    ''')
-
-    # 5. comments 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS comments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task_id INTEGER,
-            user_id INTEGER,
-            content TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE,
-            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-        )
-    ''')
+    """프로젝트에서 사용할 모든 테이블을 생성하고, 아직 적용되지 않은 마이그레이션을 적용합니다."""
+    from migrations import migrate
 
-    conn.commit()
-    conn.close()
-    print("테이블이 성공적으로 생성되었습니다.")
\ No newline at end of file
+    applied = migrate(get_db())
+    for version, description in applied:
+        print(f"마이그레이션 {version} 적용: {description}")
+    print("테이블이 성공적으로 생성되었습니다.")
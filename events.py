@@ -0,0 +1,311 @@
+# events.py
+"""프로젝트별 변경 이벤트를 구독자(SSE 연결)에게 전달하는 브로커."""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+
+import database
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker:
+    """프로세스 내부 발행/구독 브로커입니다.
+
+    subscribe(project_id, callback)로 등록한 콜백에 (event_id, event_type, data)가 전달됩니다.
+    콜백은 발행한 스레드에서 바로 호출되므로 큐에 넣는 정도의 짧은 일만 해야 합니다.
+    프로젝트마다 최근 이벤트를 history개씩 보관해, 다시 접속한 구독자가 놓친 이벤트를 받을 수 있게 합니다.
+    """
+
+    def __init__(self, history=100):
+        self.history = history
+        self._subscribers = defaultdict(set)
+        self._recent = {}
+        self._evicted = {}   # 프로젝트별로 보관 범위에서 밀려난 마지막 이벤트 ID
+        self._floor = 0      # 이 ID 이하의 이벤트는 이 프로세스가 알지 못합니다
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._published = 0
+
+    def configure(self, history=None, start_id=None):
+        """보관 개수와 시작 이벤트 ID를 바꿉니다. 보관 중인 이벤트는 비웁니다."""
+        with self._lock:
+            if history is not None:
+                self.history = history
+            if start_id is not None:
+                self._floor = self._last_id = start_id
+            self._recent.clear()
+            self._evicted.clear()
+
+    def subscribe(self, project_id, callback):
+        """콜백을 등록하고, 등록을 해제하는 함수를 반환합니다."""
+        with self._lock:
+            self._subscribers[project_id].add(callback)
+        return lambda: self.unsubscribe(project_id, callback)
+
+    def unsubscribe(self, project_id, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(project_id)
+            if callbacks is not None:
+                callbacks.discard(callback)
+                if not callbacks:
+                    del self._subscribers[project_id]
+
+    def publish(self, project_id, event_type, data, event_id=None):
+        """이벤트를 보관하고 구독자에게 전달합니다. event_id가 없으면 새로 매깁니다."""
+        with self._lock:
+            if event_id is None:
+                event_id = self._last_id + 1
+            self._last_id = max(self._last_id, event_id)
+            event = (event_id, event_type, data)
+            recent = self._recent.setdefault(project_id, deque())
+            if len(recent) >= self.history:
+                self._evicted[project_id] = recent.popleft()[0]
+            recent.append(event)
+            self._published += 1
+            callbacks = list(self._subscribers.get(project_id, ()))
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("이벤트 구독자 호출 실패")
+        return event_id
+
+    def replay(self, project_id, last_id):
+        """last_id 이후에 발행된 이 프로젝트의 이벤트 목록을 반환합니다.
+
+        놓친 이벤트가 보관 범위를 벗어났거나 서버가 다시 시작되어 알 수 없으면 None을 반환합니다.
+        """
+        with self._lock:
+            if last_id < self._floor or last_id > self._last_id:
+                return None
+            if last_id < self._evicted.get(project_id, 0):
+                return None
+            return [event for event in self._recent.get(project_id, ()) if event[0] > last_id]
+
+    def stats(self):
+        """구독자 수와 발행된 이벤트 수를 반환합니다."""
+        with self._lock:
+            return {
+                'projects': len(self._subscribers),
+                'subscribers': sum(len(callbacks) for callbacks in self._subscribers.values()),
+                'published_total': self._published,
+                'last_event_id': self._last_id,
+            }
+
+
+class SQLiteEventRelay:
+    """여러 워커 프로세스가 이벤트를 나눠 받도록 project_events 테이블을 중계 통로로 사용합니다.
+
+    쓰기 트랜잭션이 이벤트 행을 함께 넣고(롤백되면 이벤트도 사라집니다), 워커마다 하나씩 있는
+    폴링 스레드가 poll_interval초마다 새 행을 읽어 로컬 브로커로 넘깁니다. 같은 프로세스의
+    쓰기는 커밋 직후 폴링 스레드를 깨우므로 기다리지 않습니다. retention초가 지난 행은 지웁니다.
+    """
+
+    def __init__(self, broker, pool, poll_interval=0.5, retention=600.0):
+        self.broker = broker
+        self.pool = pool
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._last_prune = 0.0
+
+    def start(self):
+        """폴링 스레드를 시작합니다. 시작 시점 이후의 이벤트부터 전달합니다."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            conn = self.pool._connect()
+            self._last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM project_events").fetchone()[0]
+            self.broker.configure(start_id=self._last_id)
+            self._thread = threading.Thread(target=self._run, args=(conn,), name='event-relay', daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """새 이벤트가 커밋되었으니 바로 확인하도록 폴링 스레드를 깨웁니다."""
+        self._wake.set()
+
+    def _run(self, conn):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self._poll(conn)
+                self._prune(conn)
+            except Exception:
+                logger.exception("이벤트 테이블 폴링 실패")
+
+    def _poll(self, conn):
+        while True:
+            rows = conn.execute(
+                "SELECT id, project_id, event_type, payload FROM project_events WHERE id > ? ORDER BY id LIMIT 500",
+                (self._last_id,)
+            ).fetchall()
+            for event_id, project_id, event_type, payload in rows:
+                self.broker.publish(project_id, event_type, json.loads(payload), event_id=event_id)
+                self._last_id = event_id
+            if len(rows) < 500:
+                return
+
+    def _prune(self, conn):
+        now = time.monotonic()
+        if now - self._last_prune < self.retention / 2:
+            return
+        self._last_prune = now
+        with conn:
+            conn.execute(
+                "DELETE FROM project_events WHERE created_at < datetime('now', ?)",
+                (f'-{int(self.retention)} seconds',)
+            )
+
+
+broker = EventBroker()
+_relay = None
+_queue_size = 256
+_heartbeat = 15.0
+
+def init_app(app):
+    """앱 설정으로 이벤트 전달 방식(EVENTS_BACKEND)을 정합니다.
+
+    'memory'는 한 프로세스 안에서만 전달하고, 'sqlite'는 워커가 여러 개일 때 DB를 거쳐 전달합니다.
+    """
+    global _relay, _queue_size, _heartbeat
+    broker.configure(history=app.config.get('EVENTS_HISTORY', 100))
+    _queue_size = app.config.get('EVENTS_QUEUE_SIZE', 256)
+    _heartbeat = app.config.get('EVENTS_HEARTBEAT', 15.0)
+    _relay = None
+    if app.config.get('EVENTS_BACKEND', 'memory') == 'sqlite':
+        _relay = SQLiteEventRelay(
+            broker,
+            database.get_pool(),
+            poll_interval=app.config.get('EVENTS_POLL_INTERVAL', 0.5),
+            retention=app.config.get('EVENTS_RETENTION', 600.0),
+        )
+
+def publish(cursor, project_id, event_type, **data):
+    """쓰기 작업(run_write에 넘긴 함수) 안에서 이벤트를 발행합니다.
+
+    이벤트는 트랜잭션이 커밋된 뒤에만 구독자에게 전달되고, 롤백되면 버려집니다.
+    """
+    if _relay is not None:
+        _relay.start()
+        cursor.execute(
+            "INSERT INTO project_events (project_id, event_type, payload) VALUES (?, ?, ?)",
+            (project_id, event_type, json.dumps(data, ensure_ascii=False))
+        )
+        database.on_commit(_relay.wake)
+    else:
+        database.on_commit(lambda: broker.publish(project_id, event_type, data))
+
+def subscribe(project_id, callback):
+    """프로젝트 이벤트를 구독하고, 구독을 해제하는 함수를 반환합니다."""
+    if _relay is not None:
+        _relay.start()
+    return broker.subscribe(project_id, callback)
+
+def format_sse(event_type, data, event_id=None):
+    """이벤트 하나를 text/event-stream 형식의 문자열로 만듭니다."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return '\n'.join(lines) + '\n\n'
+
+def _replay(project_id, last_event_id):
+    """재접속한 구독자에게 먼저 보낼 메시지 목록과 마지막으로 보낸 이벤트 ID를 반환합니다."""
+    if last_event_id is None:
+        return 0, []
+    missed = broker.replay(project_id, last_event_id)
+    if missed is None:
+        return last_event_id, [format_sse('resync', {})]
+    sent_id = missed[-1][0] if missed else last_event_id
+    return sent_id, [format_sse(event_type, data, event_id) for event_id, event_type, data in missed]
+
+def stream(project_id, last_event_id=None):
+    """SSE 응답 본문을 만드는 제너레이터입니다. 연결이 끊기면 구독을 해제합니다.
+
+    다시 접속한 경우(last_event_id) 놓친 이벤트를 먼저 보내고, 알 수 없으면 'resync'를 보냅니다.
+    구독자가 너무 느려 큐가 가득 차면 'resync'를 보내고 연결을 끝냅니다.
+    """
+    pending = queue.Queue(maxsize=_queue_size)
+    overflowed = threading.Event()
+
+    def _deliver(event):
+        try:
+            pending.put_nowait(event)
+        except queue.Full:
+            overflowed.set()
+
+    unsubscribe = subscribe(project_id, _deliver)
+    try:
+        yield "retry: 3000\n\n"
+        sent_id, messages = _replay(project_id, last_event_id)
+        yield from messages
+
+        while not overflowed.is_set():
+            try:
+                event_id, event_type, data = pending.get(timeout=_heartbeat)
+            except queue.Empty:
+                # 주기적으로 주석을 보내 프록시가 연결을 끊지 않게 하고, 끊긴 연결을 알아챕니다.
+                yield ": keepalive\n\n"
+                continue
+            # 구독 직후 replay와 겹친 이벤트는 건너뜁니다.
+            if event_id <= sent_id:
+                continue
+            sent_id = event_id
+            yield format_sse(event_type, data, event_id)
+        yield format_sse('resync', {})
+    finally:
+        unsubscribe()
+
+async def astream(project_id, last_event_id=None):
+    """stream()의 asyncio 버전입니다. 연결마다 스레드를 붙잡지 않습니다. (asgi.py에서 사용)
+
+    발행은 쓰기 스레드에서 일어나므로 call_soon_threadsafe로 이벤트 루프에 넘겨 받습니다.
+    """
+    loop = asyncio.get_running_loop()
+    pending = asyncio.Queue(maxsize=_queue_size)
+    overflowed = asyncio.Event()
+
+    def _offer(event):
+        try:
+            pending.put_nowait(event)
+        except asyncio.QueueFull:
+            overflowed.set()
+
+    def _deliver(event):
+        loop.call_soon_threadsafe(_offer, event)
+
+    unsubscribe = subscribe(project_id, _deliver)
+    try:
+        yield "retry: 3000\n\n"
+        sent_id, messages = _replay(project_id, last_event_id)
+        for message in messages:
+            yield message
+
+        while not overflowed.is_set():
+            try:
+                event_id, event_type, data = await asyncio.wait_for(pending.get(), _heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event_id <= sent_id:
+                continue
+            sent_id = event_id
+            yield format_sse(event_type, data, event_id)
+        yield format_sse('resync', {})
+    finally:
+        unsubscribe()
+
+def stats():
+    """브로커 통계를 반환합니다."""
+    return dict(broker.stats(), backend='sqlite' if _relay is not None else 'memory')
@@ -0,0 +1,87 @@
+# export.py
+"""프로젝트 전체를 NDJSON 또는 CSV로 내보냅니다. (/api/project/<id>/export, `flask export-project`)
+
+models.ProjectExport가 fetchmany로 읽은 레코드를 batch_size개씩 직렬화해 bytes 조각으로 내보내므로
+프로젝트 크기와 관계없이 메모리 사용량이 일정합니다. gzip을 켜면 zlib으로 조각마다 바로 압축합니다.
+"""
+
+import csv
+import io
+import json
+import zlib
+
+from models import ProjectExport
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# CSV는 레코드 종류(type)와 관계없이 같은 열을 쓰고, 해당하지 않는 칸은 비워 둡니다.
+CSV_FIELDS = ('type', 'id', 'project_id', 'task_id', 'name', 'status', 'start_date', 'end_date',
+              'user_id', 'username', 'role', 'content', 'created_at')
+
+
+def _record(kind, row):
+    """DB 행을 내보내기 레코드(dict)로 바꿉니다."""
+    if kind == 'project':
+        return {'type': kind, 'id': row['id'], 'name': row['project_name'], 'user_id': row['created_by'],
+                'start_date': row['start_date'], 'end_date': row['end_date']}
+    if kind == 'member':
+        return {'type': kind, 'project_id': row['project_id'], 'user_id': row['user_id'], 'username': row['username'], 'role': row['role']}
+    if kind == 'task':
+        return {'type': kind, 'id': row['id'], 'project_id': row['project_id'], 'name': row['task_name'],
+                'status': row['status'], 'start_date': row['start_date'], 'end_date': row['end_date'],
+                'user_id': row['assignee_id'], 'username': row['assignee_name']}
+    # 댓글 시간은 저장된 그대로(UTC) 내보냅니다.
+    return {'type': kind, 'id': row['id'], 'task_id': row['task_id'], 'user_id': row['user_id'],
+            'username': row['username'], 'content': row['content'], 'created_at': row['created_at']}
+
+def _ndjson_chunks(records, batch_size):
+    lines = []
+    for kind, row in records:
+        lines.append(json.dumps(_record(kind, row), ensure_ascii=False))
+        if len(lines) >= batch_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def _csv_chunks(records, batch_size):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction='ignore')
+    # 엑셀에서 열어도 한글이 깨지지 않도록 BOM을 붙입니다.
+    buffer.write('\ufeff')
+    writer.writeheader()
+    count = 0
+    for kind, row in records:
+        writer.writerow(_record(kind, row))
+        count += 1
+        if count >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _gzip(chunks):
+    """bytes 조각을 gzip 스트림으로 압축합니다. (wbits=31: gzip 헤더와 CRC 포함)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def stream_project(project_id, fmt='ndjson', gzip=False, batch_size=500):
+    """프로젝트를 fmt 형식으로 직렬화한 bytes 조각을 내보내는 제너레이터입니다.
+
+    요청 컨텍스트(또는 앱 컨텍스트) 안에서 끝까지 소비해야 합니다. 뷰에서는 stream_with_context로 감쌉니다.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    records = ProjectExport.records(project_id, batch_size=batch_size)
+    chunks = (_ndjson_chunks if fmt == 'ndjson' else _csv_chunks)(records, batch_size)
+    encoded = (chunk.encode('utf-8') for chunk in chunks)
+    return _gzip(encoded) if gzip else encoded
@@ -0,0 +1,251 @@
+# importer.py
+"""CSV / NDJSON / JSON 파일의 작업들을 한 프로젝트에 한꺼번에 넣습니다.
+(/api/project/<id>/import, `flask import-tasks`)
+
+파일은 한 행씩 읽어(JSON 배열도 한 원소씩 디코딩합니다) 바로 검증하고, 통과한 행을 chunk_size개씩
+Task.import_rows로 넘겨 executemany로 넣습니다. 트랜잭션은 묶음마다 따로 커밋하므로 큰 파일도 쓰기 잠금을
+오래 잡지 않습니다. 잘못된 행은 건너뛰고 행 번호와 이유를 보고서에 남깁니다.
+
+열 이름:
+    task_name (또는 name)            작업 이름 (필수)
+    start_date, end_date             ISO 날짜 또는 날짜+시간 (필수, 분 단위로 저장). 시간대가 없으면 가져오는
+                                     사용자의 시간대(CLI는 DEFAULT_TIMEZONE), '+09:00'처럼 있으면 그 시각 그대로
+    status                           대기 / 진행 중 / 완료 (기본: 대기)
+    assignee (또는 username)         담당자 사용자 이름, 또는
+    assignee_id (또는 user_id)       담당자 사용자 ID (둘 다 프로젝트 멤버여야 합니다)
+내보내기(export.py) 파일도 그대로 읽을 수 있도록 type 열이 'task'가 아닌 행은 건너뜁니다.
+"""
+
+import csv
+import io
+import json
+import sqlite3
+from datetime import datetime
+
+import timeutil
+from models import Project, Task
+
+TASK_STATUSES = ('대기', '진행 중', '완료')
+FORMATS = ('csv', 'ndjson', 'json')
+
+_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.json': 'json'}
+_CONTENT_TYPES = {'text/csv': 'csv', 'application/x-ndjson': 'ndjson', 'application/jsonl': 'ndjson',
+                  'application/json': 'json'}
+_READ_SIZE = 64 * 1024
+
+
+class ImportFileError(ValueError):
+    """파일 전체를 더 읽을 수 없는 오류입니다. (형식을 알 수 없음, JSON 구조가 깨짐 등)"""
+
+
+def detect_format(filename=None, content_type=None):
+    """파일 이름의 확장자나 Content-Type으로 형식을 정합니다. 알 수 없으면 None을 반환합니다."""
+    if filename:
+        for extension, fmt in _EXTENSIONS.items():
+            if filename.lower().endswith(extension):
+                return fmt
+    if content_type:
+        return _CONTENT_TYPES.get(content_type.split(';', 1)[0].strip().lower())
+    return None
+
+def _text(stream):
+    """바이너리 스트림을 UTF-8(BOM 허용) 텍스트 스트림으로 감쌉니다."""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream)
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+# --- 파서: (행 번호, dict 또는 오류 메시지)를 하나씩 내보냅니다 ---
+def _csv_rows(text):
+    reader = csv.DictReader(text)
+    row_number = 0
+    try:
+        for row in reader:
+            row_number += 1
+            yield row_number, row
+    except csv.Error as e:
+        raise ImportFileError(f"{row_number + 1}번째 행 근처에서 CSV를 읽지 못했습니다: {e}")
+
+def _ndjson_rows(text):
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            yield row_number, json.loads(line)
+        except ValueError:
+            yield row_number, 'JSON 형식이 올바르지 않습니다.'
+
+def _json_rows(text):
+    """최상위 JSON 배열을 원소 하나씩 디코딩합니다. 파일 전체를 메모리에 올리지 않습니다."""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+
+    def _fill():
+        nonlocal buffer, position, eof
+        chunk = text.read(_READ_SIZE)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def _skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            _fill()
+
+    _skip_whitespace()
+    if position >= len(buffer) or buffer[position] != '[':
+        raise ImportFileError('JSON 파일은 작업 객체의 배열이어야 합니다.')
+    position += 1
+    row_number = 0
+    while True:
+        _skip_whitespace()
+        if position >= len(buffer):
+            raise ImportFileError('JSON 배열이 닫히지 않았습니다.')
+        if buffer[position] == ']':
+            return
+        if row_number and buffer[position] == ',':
+            position += 1
+            _skip_whitespace()
+        elif row_number:
+            raise ImportFileError(f"{row_number}번째 원소 뒤에 ','가 없습니다.")
+        # 원소가 버퍼 끝에서 잘렸을 수 있으므로 디코딩에 실패하면 더 읽고 다시 시도합니다.
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                break
+            except ValueError:
+                if eof:
+                    raise ImportFileError(f"{row_number + 1}번째 원소의 JSON 형식이 올바르지 않습니다.")
+                _fill()
+        position = end
+        row_number += 1
+        yield row_number, value
+
+_PARSERS = {'csv': _csv_rows, 'ndjson': _ndjson_rows, 'json': _json_rows}
+
+def parse(stream, fmt):
+    """(행 번호, 행 dict)를 내보내는 제너레이터입니다. 행 자체를 읽지 못하면 dict 대신 오류 메시지가 옵니다."""
+    if fmt not in _PARSERS:
+        raise ImportFileError(f"지원하지 않는 형식입니다: {fmt}")
+    return _PARSERS[fmt](_text(stream))
+
+# --- 검증 ---
+def _value(row, *names):
+    for name in names:
+        value = row.get(name)
+        if value is not None and value != '':
+            return value.strip() if isinstance(value, str) else value
+    return None
+
+def _parse_date(value, field, zone):
+    """날짜를 epoch 초로 바꿉니다. 시간대가 없는 값은 zone 기준이고, 오프셋이 있는 값은 그 시각 그대로입니다."""
+    if value is None:
+        raise ValueError(f"{field}를 입력해주세요.")
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"{field} 날짜 형식이 올바르지 않습니다: {value}")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=zone)
+    # 화면(datetime-local)에서 만든 작업처럼 분 단위로 맞춥니다.
+    return int(moment.replace(second=0, microsecond=0).timestamp())
+
+def validate_row(row, members, member_ids, zone=None):
+    """행 하나를 Task.import_rows에 넘길 (task_name, status, start_ts, end_ts, assignee_id)로 바꿉니다.
+
+    members는 {username: user_id}, member_ids는 멤버 ID 집합이고, zone(기본: 현재 사용자)은 시간대가 없는
+    날짜를 읽는 기준입니다. 작업 행이 아니면 None, 잘못된 행이면 ValueError.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(row if isinstance(row, str) else '행은 객체여야 합니다.')
+    if _value(row, 'type') not in (None, 'task'):
+        return None
+    task_name = _value(row, 'task_name', 'name')
+    if task_name is None:
+        raise ValueError('작업 이름을 입력해주세요.')
+    zone = zone or timeutil.current_zone()
+    start_ts = _parse_date(_value(row, 'start_date'), '시작일', zone)
+    end_ts = _parse_date(_value(row, 'end_date'), '종료일', zone)
+    if start_ts > end_ts:
+        raise ValueError('종료일이 시작일보다 빠릅니다.')
+    status = _value(row, 'status') or '대기'
+    if status not in TASK_STATUSES:
+        raise ValueError(f"알 수 없는 상태입니다: {status}")
+
+    assignee_id = None
+    username = _value(row, 'assignee', 'username')
+    raw_id = _value(row, 'assignee_id', 'user_id')
+    if username is not None:
+        assignee_id = members.get(str(username))
+        if assignee_id is None:
+            raise ValueError(f"프로젝트 멤버가 아닌 사용자입니다: {username}")
+    elif raw_id is not None:
+        try:
+            assignee_id = int(raw_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"assignee_id 값이 올바르지 않습니다: {raw_id}")
+        if assignee_id not in member_ids:
+            raise ValueError(f"프로젝트 멤버가 아닌 사용자입니다: {assignee_id}")
+    return str(task_name), status, start_ts, end_ts, assignee_id
+
+# --- 가져오기 ---
+def import_tasks(project_id, stream, fmt, chunk_size=2000, max_errors=1000):
+    """stream의 작업들을 project_id 프로젝트에 넣고 보고서(dict)를 반환합니다.
+
+    보고서: {'imported': 넣은 수, 'failed': 실패한 행 수, 'skipped': 작업이 아닌 행 수,
+            'errors': [{'row': 행 번호, 'message': 이유}, ...] (앞의 max_errors개),
+            'aborted': 파일을 끝까지 읽지 못했으면 그 이유}
+    행 번호는 데이터 행(CSV는 머리글 제외) 기준 1부터 셉니다.
+    """
+    # 담당자 확인용 멤버 목록은 한 번의 쿼리로 가져옵니다.
+    members = {username: user_id for user_id, username in Project.get_members(project_id)}
+    member_ids = set(members.values())
+    zone = timeutil.current_zone()
+    report = {'imported': 0, 'failed': 0, 'skipped': 0, 'errors': [], 'aborted': None}
+
+    def _fail(row_number, message):
+        report['failed'] += 1
+        if len(report['errors']) < max_errors:
+            report['errors'].append({'row': row_number, 'message': message})
+
+    pending, pending_rows = [], []
+
+    def _flush():
+        if not pending:
+            return
+        try:
+            report['imported'] += Task.import_rows(project_id, pending)
+        except sqlite3.Error as e:
+            for row_number in pending_rows:
+                _fail(row_number, f"저장하지 못했습니다: {e}")
+        pending.clear()
+        pending_rows.clear()
+
+    try:
+        for row_number, row in parse(stream, fmt):
+            try:
+                values = validate_row(row, members, member_ids, zone)
+            except ValueError as e:
+                _fail(row_number, str(e))
+                continue
+            if values is None:
+                report['skipped'] += 1
+                continue
+            pending.append(values)
+            pending_rows.append(row_number)
+            if len(pending) >= chunk_size:
+                _flush()
+    except (ImportFileError, UnicodeDecodeError) as e:
+        report['aborted'] = str(e) if isinstance(e, ImportFileError) else 'UTF-8 파일이 아닙니다.'
+    # 파일이 중간에 깨졌어도 그 앞까지 검증을 통과한 행은 넣습니다.
+    _flush()
+    report['errors_truncated'] = report['failed'] > len(report['errors'])
+    return report
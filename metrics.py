@@ -0,0 +1,383 @@
+# metrics.py
+"""요청/SQL 측정값을 모으고 /metrics에서 Prometheus 텍스트 형식으로 내보냅니다.
+
+- 커넥션 풀은 InstrumentedConnection으로 커넥션을 만들고(DB_CONNECTION_FACTORY), 모든 SQL 실행을
+  정규화된 문장과 라우트별로 세고 시간을 잽니다.
+- 요청마다 걸린 시간과 상태 코드, 실행한 쿼리 수를 기록합니다.
+- 디버그 모드(또는 METRICS_SERVER_TIMING)에서는 응답에 Server-Timing 헤더를 붙여
+  브라우저 개발자 도구에서 DB 시간과 전체 시간을 볼 수 있게 합니다.
+외부 서비스 없이 프로세스 메모리에만 보관하므로 값은 워커 프로세스마다 따로 집계됩니다.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, abort, g, has_request_context, request
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+QUERIES_PER_REQUEST_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+BACKGROUND = '(background)'   # 요청 밖(쓰기 스레드, 이벤트 중계 등)에서 실행된 쿼리의 라우트 이름
+UNMATCHED = '(unmatched)'     # 등록되지 않은 주소로 온 요청의 라우트 이름
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+
+
+def normalize_sql(sql):
+    """공백을 한 칸으로 줄이고 IN (?, ?, ...) 같은 자리표시자 목록을 '?, ...'로 묶습니다.
+
+    같은 쿼리가 인자 개수만 달라도 하나로 집계되도록 합니다.
+    """
+    return _PLACEHOLDER_LIST.sub('?, ...', _WHITESPACE.sub(' ', sql).strip())
+
+
+class Histogram:
+    """누적 전 구간별 개수와 합계를 보관합니다. (잠금은 Registry가 잡습니다)"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """요청과 SQL 측정값을 모아 두는 스레드 안전 저장소입니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._normalized = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}           # (method, route, status) -> 횟수
+            self.request_latency = {}    # (method, route) -> Histogram
+            self.request_queries = {}    # route -> Histogram (요청당 쿼리 수)
+            self.exceptions = {}         # (route, 예외 이름) -> 횟수
+            self.queries = {}            # (route, statement) -> 횟수
+            self.query_latency = {}      # statement -> Histogram (execute 시간)
+            self.query_seconds = {}      # statement -> execute + fetch 시간 합계
+            self.query_errors = {}       # (statement, 예외 이름) -> 횟수
+            self.started_at = time.time()
+
+    def statement(self, sql):
+        """정규화한 SQL을 반환합니다. 같은 문자열은 다시 계산하지 않습니다."""
+        statement = self._normalized.get(sql)
+        if statement is None:
+            statement = normalize_sql(sql)
+            if len(self._normalized) < 4096:
+                self._normalized[sql] = statement
+        return statement
+
+    def record_query(self, sql, elapsed, error=None):
+        """SQL 한 번의 실행 시간을 기록하고, 요청 안이면 요청별 합계에도 더합니다."""
+        statement = self.statement(sql)
+        route = _current_route()
+        if route != BACKGROUND:
+            g._query_count = g.get('_query_count', 0) + 1
+            g._query_time = g.get('_query_time', 0.0) + elapsed
+        with self._lock:
+            key = (route, statement)
+            self.queries[key] = self.queries.get(key, 0) + 1
+            histogram = self.query_latency.get(statement)
+            if histogram is None:
+                histogram = self.query_latency[statement] = Histogram(QUERY_BUCKETS)
+            histogram.observe(elapsed)
+            self.query_seconds[statement] = self.query_seconds.get(statement, 0.0) + elapsed
+            if error is not None:
+                key = (statement, type(error).__name__)
+                self.query_errors[key] = self.query_errors.get(key, 0) + 1
+
+    def record_fetch(self, sql, elapsed):
+        """결과 행을 읽는 데 걸린 시간을 해당 문장의 합계와 요청별 합계에 더합니다."""
+        statement = self.statement(sql)
+        if has_request_context():
+            g._query_time = g.get('_query_time', 0.0) + elapsed
+        with self._lock:
+            self.query_seconds[statement] = self.query_seconds.get(statement, 0.0) + elapsed
+
+    def record_request(self, method, route, status, elapsed, query_count):
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.request_latency.get((method, route))
+            if histogram is None:
+                histogram = self.request_latency[(method, route)] = Histogram(REQUEST_BUCKETS)
+            histogram.observe(elapsed)
+            histogram = self.request_queries.get(route)
+            if histogram is None:
+                histogram = self.request_queries[route] = Histogram(QUERIES_PER_REQUEST_BUCKETS)
+            histogram.observe(query_count)
+
+    def record_exception(self, route, error):
+        with self._lock:
+            key = (route, type(error).__name__)
+            self.exceptions[key] = self.exceptions.get(key, 0) + 1
+
+    def snapshot(self):
+        """렌더링용으로 현재 값을 복사해 반환합니다."""
+        def copy(histograms):
+            return {key: (h.buckets, list(h.counts), h.sum, h.count) for key, h in histograms.items()}
+        with self._lock:
+            return {
+                'requests': dict(self.requests),
+                'request_latency': copy(self.request_latency),
+                'request_queries': copy(self.request_queries),
+                'exceptions': dict(self.exceptions),
+                'queries': dict(self.queries),
+                'query_latency': copy(self.query_latency),
+                'query_seconds': dict(self.query_seconds),
+                'query_errors': dict(self.query_errors),
+                'started_at': self.started_at,
+            }
+
+
+registry = Registry()
+
+# 느린 쿼리 처리기 (slow_queries.init_app이 등록합니다)
+_slow_threshold = None   # 초
+_slow_handler = None
+
+def set_slow_query_handler(threshold, handler):
+    """execute + fetch 시간이 threshold초 이상인 쿼리마다 handler(conn, sql, parameters, elapsed, many)를 호출합니다.
+    threshold가 None이면 끕니다."""
+    global _slow_threshold, _slow_handler
+    _slow_threshold, _slow_handler = (threshold, handler) if threshold is not None else (None, None)
+
+def _current_route():
+    if not has_request_context():
+        return BACKGROUND
+    rule = request.url_rule
+    return rule.rule if rule is not None else UNMATCHED
+
+
+# --- 측정하는 커넥션 ---
+class InstrumentedCursor(sqlite3.Cursor):
+    """execute/executemany 시간과 fetch 시간을 registry에 기록하는 커서입니다.
+
+    마지막 문장의 execute + fetch 시간 합계가 느린 쿼리 기준을 넘으면 한 번 느린 쿼리 처리기에 넘깁니다.
+    """
+
+    _sql = None
+
+    def _run(self, method, sql, parameters, many):
+        self._sql, self._parameters, self._many = sql, parameters, many
+        self._elapsed, self._reported = 0.0, False
+        started = time.perf_counter()
+        try:
+            result = method(sql, parameters)
+        except sqlite3.Error as e:
+            registry.record_query(sql, time.perf_counter() - started, e)
+            raise
+        elapsed = time.perf_counter() - started
+        registry.record_query(sql, elapsed)
+        self._add_time(elapsed)
+        return result
+
+    def _add_time(self, elapsed):
+        self._elapsed += elapsed
+        if _slow_threshold is not None and not self._reported and self._elapsed >= _slow_threshold:
+            self._reported = True
+            _slow_handler(self.connection, self._sql, self._parameters, self._elapsed, self._many)
+
+    def _fetched(self, started):
+        if self._sql is not None:
+            elapsed = time.perf_counter() - started
+            registry.record_fetch(self._sql, elapsed)
+            self._add_time(elapsed)
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters, False)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            # 느린 쿼리 기록에서 인자 모양을 볼 수 있도록 한 번만 순회되는 이터레이터는 목록으로 바꿉니다.
+            seq_of_parameters = list(seq_of_parameters)
+        return self._run(super().executemany, sql, seq_of_parameters, True)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(started)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started)
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """모든 커서를 InstrumentedCursor로 만드는 커넥션입니다. (sqlite3.connect의 factory로 사용)
+
+    Connection.execute는 내부에서 커서의 execute를 거치지 않으므로 직접 커서를 만들어 실행합니다.
+    """
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# --- 요청 측정 ---
+def _before_request():
+    g._request_started = time.perf_counter()
+
+def _after_request(response):
+    started = g.get('_request_started')
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    query_count = g.get('_query_count', 0)
+    registry.record_request(request.method, _current_route(), response.status_code, elapsed, query_count)
+    if g.get('_server_timing'):
+        query_time = g.get('_query_time', 0.0)
+        response.headers['Server-Timing'] = (
+            f'db;dur={query_time * 1000:.2f};desc="{query_count} queries", total;dur={elapsed * 1000:.2f}'
+        )
+    return response
+
+def _teardown_request(error=None):
+    if error is not None:
+        registry.record_exception(_current_route(), error)
+
+
+# --- Prometheus 텍스트 형식 ---
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, kind, help_text, samples):
+        """samples: [(labels 딕셔너리, 값), ...]"""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self.lines.append(f"{name}{_labels(**labels)} {_number(value)}")
+
+    def histogram(self, name, help_text, histograms, label_names):
+        """histograms: {라벨 값 튜플: (buckets, counts, sum, count)}"""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        for key, (buckets, counts, total, count) in sorted(histograms.items()):
+            labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                self.lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+            self.lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {count}")
+            self.lines.append(f"{name}_sum{_labels(**labels)} {_number(total)}")
+            self.lines.append(f"{name}_count{_labels(**labels)} {count}")
+
+    def stats(self, prefix, help_text, stats, labels=None):
+        """stats() 딕셔너리의 숫자 값을 게이지(이름이 _total로 끝나면 카운터)로 씁니다."""
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            kind = 'counter' if key.endswith('_total') else 'gauge'
+            self.metric(f"{prefix}_{key}", kind, f"{help_text} ({key})", [(labels or {}, value)])
+
+    def render(self):
+        return '\n'.join(self.lines) + '\n'
+
+def render_metrics():
+    """현재 측정값과 풀/캐시/쓰기 큐/이벤트 통계를 Prometheus 텍스트 형식으로 만듭니다."""
+    import database
+    import events
+    import passwords
+    from models import membership_cache, user_cache
+
+    data = registry.snapshot()
+    out = _Writer()
+    out.metric('process_start_time_seconds', 'gauge', '측정을 시작한 시각(유닉스 시간)',
+               [({}, data['started_at'])])
+    out.metric('http_requests_total', 'counter', '라우트/메서드/상태 코드별 요청 수',
+               [({'method': m, 'route': r, 'status': s}, v) for (m, r, s), v in sorted(data['requests'].items())])
+    out.histogram('http_request_duration_seconds', '요청 처리 시간', data['request_latency'], ('method', 'route'))
+    out.histogram('http_request_queries', '요청 하나가 실행한 SQL 수', data['request_queries'], ('route',))
+    out.metric('http_request_exceptions_total', 'counter', '처리되지 않은 예외 수',
+               [({'route': r, 'exception': e}, v) for (r, e), v in sorted(data['exceptions'].items())])
+    out.metric('db_queries_total', 'counter', '라우트와 SQL 문장별 실행 수',
+               [({'route': r, 'statement': s}, v) for (r, s), v in sorted(data['queries'].items())])
+    out.histogram('db_query_duration_seconds', 'SQL execute 시간', data['query_latency'], ('statement',))
+    out.metric('db_query_seconds_total', 'counter', 'SQL 문장별 execute + fetch 시간 합계',
+               [({'statement': s}, v) for s, v in sorted(data['query_seconds'].items())])
+    out.metric('db_query_errors_total', 'counter', 'SQL 실행 오류 수',
+               [({'statement': s, 'error': e}, v) for (s, e), v in sorted(data['query_errors'].items())])
+
+    out.stats('db_pool', 'DB 커넥션 풀', database.pool_stats())
+    write_queue = database.write_queue_stats()
+    if write_queue is not None:
+        out.stats('db_write_queue', '단일 쓰기 큐', write_queue)
+    out.stats('cache_user', '사용자 캐시', user_cache.stats())
+    out.stats('cache_membership', '멤버십 캐시', membership_cache.stats())
+    out.stats('events', '실시간 이벤트 브로커', events.stats())
+    out.stats('password_hash', '비밀번호 해시 프로세스 풀', passwords.stats())
+    return out.render()
+
+
+_allowed_addresses = ('127.0.0.1', '::1')
+
+def metrics_view():
+    if _allowed_addresses is not None and request.remote_addr not in _allowed_addresses:
+        abort(404)
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+def init_app(app):
+    """요청 측정 훅과 /metrics 라우트를 등록합니다.
+
+    METRICS_SERVER_TIMING이 None이면 디버그 모드에서만 Server-Timing 헤더를 붙이고,
+    METRICS_ALLOWED_ADDRESSES(None이면 모두 허용)에 있는 주소에서만 /metrics를 볼 수 있습니다.
+    """
+    global _allowed_addresses
+    allowed = app.config.get('METRICS_ALLOWED_ADDRESSES', ('127.0.0.1', '::1'))
+    _allowed_addresses = tuple(allowed) if allowed is not None else None
+    server_timing = app.config.get('METRICS_SERVER_TIMING')
+
+    def before_request():
+        _before_request()
+        g._server_timing = app.debug if server_timing is None else server_timing
+
+    app.before_request(before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    if app.config.get('METRICS_ENDPOINT', True):
+        app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -0,0 +1,540 @@
+# migrations.py
+"""데이터베이스 스키마 마이그레이션.
+
+각 마이그레이션은 버전 번호와 함께 MIGRATIONS에 등록되고, 적용된 마지막 버전은
+PRAGMA user_version에 기록됩니다. `flask init-db`는 기존 planner.db의 데이터를
+지우지 않고 아직 적용되지 않은 마이그레이션만 순서대로 적용합니다.
+"""
+
+import timeutil
+
+MIGRATIONS = []
+
+class MigrationError(Exception):
+    """저장된 데이터 때문에 마이그레이션을 적용할 수 없을 때 발생합니다. (그 마이그레이션은 되돌려집니다)"""
+
+def migration(version, description):
+    """마이그레이션 함수를 버전 번호와 함께 등록하는 데코레이터입니다."""
+    def decorator(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return decorator
+
+
+@migration(1, '기본 테이블 생성')
+def _create_base_tables(cursor):
+    # 1. users 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL
+        )
+    ''')
+
+    # 2. projects 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_name TEXT NOT NULL,
+            created_by INTEGER,
+            start_date TEXT,
+            end_date TEXT,
+            FOREIGN KEY (created_by) REFERENCES users (id)
+        )
+    ''')
+
+    # 3. project_members 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_members (
+            project_id INTEGER,
+            user_id INTEGER,
+            role TEXT NOT NULL, -- '팀장' 또는 '팀원' 역할을 저장할 컬럼 추가
+            PRIMARY KEY (project_id, user_id),
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # 4. tasks 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER,
+            task_name TEXT NOT NULL,
+            start_date TEXT,
+            end_date TEXT,
+            status TEXT,
+            assignee_id INTEGER,
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
+            FOREIGN KEY (assignee_id) REFERENCES users (id)
+        )
+    ''')
+
+    # 5. comments 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER,
+            user_id INTEGER,
+            content TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    ''')
+
+
+@migration(2, '자주 실행되는 조회 경로에 인덱스 추가')
+def _add_hot_path_indexes(cursor):
+    # Task.find_for_project: WHERE project_id = ? ORDER BY start_date
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_project_start ON tasks (project_id, start_date)")
+    # Task.find_for_assignee: WHERE assignee_id = ? ORDER BY start_date
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_assignee_start ON tasks (assignee_id, start_date)")
+    # Comment.find_for_task: WHERE task_id = ? ORDER BY created_at
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_comments_task_created ON comments (task_id, created_at)")
+    # Project.find_for_user: project_members의 PK는 (project_id, user_id)라 user_id만으로는 찾을 수 없습니다.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_members_user ON project_members (user_id, project_id)")
+
+
+@migration(3, '프로젝트별 작업 수 집계 테이블과 트리거 추가')
+def _add_project_task_counts(cursor):
+    # (프로젝트, 상태)별 작업 수. tasks가 바뀔 때마다 아래 트리거가 갱신하므로
+    # 진행률을 구할 때 작업 목록을 읽을 필요가 없습니다.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_task_counts (
+            project_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            task_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_id, status)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_count_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO project_task_counts (project_id, status, task_count)
+            VALUES (NEW.project_id, IFNULL(NEW.status, ''), 1)
+            ON CONFLICT (project_id, status) DO UPDATE SET task_count = task_count + 1;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_count_delete AFTER DELETE ON tasks
+        BEGIN
+            UPDATE project_task_counts SET task_count = task_count - 1
+            WHERE project_id = OLD.project_id AND status = IFNULL(OLD.status, '');
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_count_update AFTER UPDATE OF project_id, status ON tasks
+        WHEN OLD.project_id IS NOT NEW.project_id OR IFNULL(OLD.status, '') IS NOT IFNULL(NEW.status, '')
+        BEGIN
+            UPDATE project_task_counts SET task_count = task_count - 1
+            WHERE project_id = OLD.project_id AND status = IFNULL(OLD.status, '');
+            INSERT INTO project_task_counts (project_id, status, task_count)
+            VALUES (NEW.project_id, IFNULL(NEW.status, ''), 1)
+            ON CONFLICT (project_id, status) DO UPDATE SET task_count = task_count + 1;
+        END
+    ''')
+    rebuild_task_counts(cursor)
+
+
+@migration(4, '멤버십 캐시 무효화를 위한 버전 테이블과 트리거 추가')
+def _add_cache_versions(cursor):
+    # 프로세스마다 따로 가진 캐시가 서로의 변경을 알아챌 수 있도록 DB에 버전 값을 둡니다.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('memberships', 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_project_members_version_{event.lower()}
+            AFTER {event} ON project_members
+            BEGIN
+                UPDATE cache_versions SET version = version + 1 WHERE name = 'memberships';
+            END
+        ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_projects_membership_version_delete AFTER DELETE ON projects
+        BEGIN
+            UPDATE cache_versions SET version = version + 1 WHERE name = 'memberships';
+        END
+    ''')
+
+
+@migration(5, '조건부 GET을 위한 프로젝트/작업 변경 버전 컬럼 추가')
+def _add_change_versions(cursor):
+    # 모델의 쓰기 경로가 version을 올리고 updated_at을 갱신합니다.
+    # 차트/통계 API는 프로젝트의 버전, 댓글 API는 작업의 버전으로 ETag를 만듭니다.
+    for table in ('projects', 'tasks'):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN updated_at TEXT")
+        cursor.execute(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP")
+
+
+@migration(6, '여러 워커가 실시간 이벤트를 주고받는 이벤트 테이블 추가')
+def _add_project_events(cursor):
+    # EVENTS_BACKEND = 'sqlite'일 때 쓰기 트랜잭션이 이벤트 행을 함께 넣고,
+    # 워커마다 있는 폴링 스레드가 id 순으로 읽어 자기 구독자에게 전달합니다.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_events_created ON project_events (created_at)")
+
+
+@migration(7, '델타 동기화를 위한 변경 기록 테이블과 트리거 추가')
+def _add_change_log(cursor):
+    # 작업/댓글/멤버십이 바뀔 때마다 트리거가 한 줄씩 남깁니다. version은 계속 증가하므로
+    # 클라이언트는 마지막으로 받은 version 이후의 기록만 받아 자기 사본을 맞출 수 있습니다.
+    # op는 'upsert' 또는 'delete'(삭제 표시)입니다.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            entity TEXT NOT NULL,      -- 'task' / 'comment' / 'member'
+            entity_id INTEGER NOT NULL, -- 작업 ID / 댓글 ID / 사용자 ID
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_change_log_project_version ON change_log (project_id, version)")
+
+    # 작업: version/updated_at만 바뀌는 갱신(_touch_task)은 기록하지 않습니다.
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_log_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO change_log (project_id, entity, entity_id, op) VALUES (NEW.project_id, 'task', NEW.id, 'upsert');
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_log_update
+        AFTER UPDATE OF project_id, task_name, start_date, end_date, status, assignee_id ON tasks
+        BEGIN
+            INSERT INTO change_log (project_id, entity, entity_id, op)
+            SELECT OLD.project_id, 'task', OLD.id, 'delete' WHERE OLD.project_id IS NOT NEW.project_id;
+            INSERT INTO change_log (project_id, entity, entity_id, op) VALUES (NEW.project_id, 'task', NEW.id, 'upsert');
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_log_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO change_log (project_id, entity, entity_id, op) VALUES (OLD.project_id, 'task', OLD.id, 'delete');
+        END
+    ''')
+
+    # 댓글: 프로젝트는 작업을 거쳐 찾습니다. (작업이 이미 없으면 기록하지 않습니다)
+    for event, row, op in (('INSERT', 'NEW', 'upsert'), ('UPDATE OF content', 'NEW', 'upsert'), ('DELETE', 'OLD', 'delete')):
+        name = event.split()[0].lower()
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_comments_log_{name} AFTER {event} ON comments
+            BEGIN
+                INSERT INTO change_log (project_id, entity, entity_id, op)
+                SELECT project_id, 'comment', {row}.id, '{op}' FROM tasks WHERE id = {row}.task_id;
+            END
+        ''')
+
+    # 멤버십: entity_id는 사용자 ID입니다.
+    for event, row, op in (('INSERT', 'NEW', 'upsert'), ('UPDATE OF role', 'NEW', 'upsert'), ('DELETE', 'OLD', 'delete')):
+        name = event.split()[0].lower()
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_project_members_log_{name} AFTER {event} ON project_members
+            BEGIN
+                INSERT INTO change_log (project_id, entity, entity_id, op)
+                VALUES ({row}.project_id, 'member', {row}.user_id, '{op}');
+            END
+        ''')
+
+
+@migration(8, '작업 이름과 댓글 내용의 전문 검색(FTS5) 색인과 동기화 트리거 추가')
+def _add_full_text_search(cursor):
+    # 외부 콘텐츠(external content) FTS5 테이블이라 본문은 tasks/comments에만 저장되고 색인만 따로 둡니다.
+    # project_id도 색인해 두어 검색어와 "내가 속한 프로젝트" 조건을 색인 안에서 함께 좁힙니다.
+    # 한국어는 조사가 붙어 토큰이 길어지므로 검색어는 접두어로 찾고, 짧은 접두어용 색인(prefix)도 둡니다.
+    options = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            task_name, project_id, content = 'tasks', content_rowid = 'id', {options}
+        )
+    ''')
+    # 댓글에는 project_id가 없으므로 작업과 JOIN한 뷰를 콘텐츠 테이블로 씁니다.
+    cursor.execute('''
+        CREATE VIEW IF NOT EXISTS comments_fts_source AS
+        SELECT c.id, c.content, t.project_id
+        FROM comments c
+        JOIN tasks t ON t.id = c.task_id
+    ''')
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+            content, project_id, content = 'comments_fts_source', content_rowid = 'id', {options}
+        )
+    ''')
+
+    # 외부 콘텐츠 테이블은 지울 때 색인했던 값을 그대로 넘겨야 하므로 OLD 값으로 'delete'를 넣습니다.
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, task_name, project_id) VALUES (NEW.id, NEW.task_name, NEW.project_id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update AFTER UPDATE OF task_name, project_id ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task_name, project_id)
+            VALUES ('delete', OLD.id, OLD.task_name, OLD.project_id);
+            INSERT INTO tasks_fts (rowid, task_name, project_id) VALUES (NEW.id, NEW.task_name, NEW.project_id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_project AFTER UPDATE OF project_id ON tasks
+        BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, content, project_id)
+            SELECT 'delete', id, content, OLD.project_id FROM comments WHERE task_id = OLD.id;
+            INSERT INTO comments_fts (rowid, content, project_id)
+            SELECT id, content, NEW.project_id FROM comments WHERE task_id = NEW.id;
+        END
+    ''')
+    # 작업을 지우면 그 작업의 댓글도 색인에서 뺍니다. (댓글 행이 남거나 나중에 지워져도 뷰에서 빠지므로 맞습니다)
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete BEFORE DELETE ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task_name, project_id)
+            VALUES ('delete', OLD.id, OLD.task_name, OLD.project_id);
+            INSERT INTO comments_fts (comments_fts, rowid, content, project_id)
+            SELECT 'delete', id, content, OLD.project_id FROM comments WHERE task_id = OLD.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_comments_fts_insert AFTER INSERT ON comments
+        BEGIN
+            INSERT INTO comments_fts (rowid, content, project_id)
+            SELECT NEW.id, NEW.content, project_id FROM tasks WHERE id = NEW.task_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_comments_fts_update AFTER UPDATE OF content ON comments
+        BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, content, project_id)
+            SELECT 'delete', OLD.id, OLD.content, project_id FROM tasks WHERE id = OLD.task_id;
+            INSERT INTO comments_fts (rowid, content, project_id)
+            SELECT NEW.id, NEW.content, project_id FROM tasks WHERE id = NEW.task_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_comments_fts_delete AFTER DELETE ON comments
+        BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, content, project_id)
+            SELECT 'delete', OLD.id, OLD.content, project_id FROM tasks WHERE id = OLD.task_id;
+        END
+    ''')
+
+    # 이미 있는 행을 색인합니다.
+    cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+    cursor.execute("INSERT INTO comments_fts (comments_fts) VALUES ('rebuild')")
+
+
+@migration(9, '날짜를 정수 UTC epoch 컬럼으로 옮기고 사용자별 시간대 컬럼 추가')
+def _add_epoch_timestamps(cursor):
+    # 비교/정렬/범위 조회는 정수 컬럼으로 하고, 기존 ISO 텍스트 컬럼은 호환을 위해 그대로 둡니다.
+    # (쓰기 경로가 두 컬럼을 함께 채웁니다) 변환은 모두 timeutil에서 합니다.
+    for table in ('projects', 'tasks'):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN start_ts INTEGER")
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN end_ts INTEGER")
+    cursor.execute("ALTER TABLE comments ADD COLUMN created_ts INTEGER")
+    cursor.execute("ALTER TABLE users ADD COLUMN timezone TEXT") # NULL이면 DEFAULT_TIMEZONE
+
+    # 작업/프로젝트 기간은 시간대 없는 벽시계 시각이므로 기본 시간대 기준으로 바꿉니다.
+    zone = timeutil.default_zone()
+    for table in ('projects', 'tasks'):
+        _backfill_period_ts(cursor, table, zone)
+    # 댓글 시간은 UTC 텍스트라 SQL에서 바로 바꿉니다.
+    cursor.execute("UPDATE comments SET created_ts = CAST(strftime('%s', created_at) AS INTEGER)")
+
+    # created_ts 없이 created_at만 넣는 예전 방식의 쓰기도 정렬과 커서에서 빠지지 않게 채웁니다.
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_comments_created_ts AFTER INSERT ON comments
+        WHEN NEW.created_ts IS NULL
+        BEGIN
+            UPDATE comments SET created_ts = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE id = NEW.id;
+        END
+    ''')
+
+    # 텍스트 날짜 인덱스를 정수 컬럼 인덱스로 바꿉니다.
+    cursor.execute("DROP INDEX IF EXISTS idx_tasks_project_start")
+    cursor.execute("DROP INDEX IF EXISTS idx_tasks_assignee_start")
+    cursor.execute("DROP INDEX IF EXISTS idx_comments_task_created")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_project_start_ts ON tasks (project_id, start_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_assignee_start_ts ON tasks (assignee_id, start_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_comments_task_created_ts ON comments (task_id, created_ts)")
+
+
+@migration(10, '간트 차트 시간 창 조회를 위한 (project_id, start_ts, end_ts) 인덱스')
+def _add_task_window_index(cursor):
+    # 기간이 창과 겹치는 작업(start_ts < to AND end_ts >= from)을 찾을 때 start_ts로 범위를 좁히고
+    # end_ts 조건은 인덱스 항목만으로 거릅니다. (project_id, start_ts) 인덱스는 이 인덱스의 앞부분이라 지웁니다.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_project_window ON tasks (project_id, start_ts, end_ts)")
+    cursor.execute("DROP INDEX IF EXISTS idx_tasks_project_start_ts")
+
+
+@migration(11, '기간 텍스트 컬럼을 epoch 값에서 기본 시간대 기준으로 다시 만들기')
+def _normalize_period_text(cursor):
+    # 지금까지는 입력한 사용자의 시간대로 적은 벽시계 시각을 텍스트로 저장했으므로, 보는 사람의 시간대로
+    # 다시 읽으면 시각이 달라졌습니다. 기준인 start_ts/end_ts에서 DEFAULT_TIMEZONE 기준으로 다시 만듭니다.
+    # 형식이 잘못된 텍스트로 만들어져 epoch이 비어 있는 행이 있으면 먼저 알립니다.
+    zone = timeutil.default_zone()
+    for table in ('projects', 'tasks'):
+        _backfill_period_ts(cursor, table, zone)
+        rows = cursor.execute(f"SELECT id, start_ts, end_ts FROM {table}").fetchall()
+        # 텍스트가 그대로인 행은 건드리지 않아 변경 기록(change_log)이 생기지 않습니다.
+        cursor.executemany(
+            f"UPDATE {table} SET start_date = ?1, end_date = ?2 "
+            f"WHERE id = ?3 AND (start_date IS NOT ?1 OR end_date IS NOT ?2)",
+            [(timeutil.period_text(start_ts), timeutil.period_text(end_ts), row_id)
+             for row_id, start_ts, end_ts in rows]
+        )
+
+def _backfill_period_ts(cursor, table, zone):
+    """start_ts/end_ts가 비어 있는 행을 기간 텍스트(zone 기준)에서 채웁니다.
+
+    텍스트도 비어 있으면 기간이 없는 예전 행으로 두고, 읽을 수 없는 텍스트가 있으면 NULL로 남기지 않고
+    해당 행들을 알려 주는 MigrationError를 발생시킵니다.
+    """
+    rows = cursor.execute(
+        f"SELECT id, start_date, end_date, start_ts, end_ts FROM {table} WHERE start_ts IS NULL OR end_ts IS NULL"
+    ).fetchall()
+    updates, bad = [], []
+    for row_id, start_date, end_date, start_ts, end_ts in rows:
+        if start_ts is None:
+            start_ts = timeutil.local_to_ts(start_date, zone)
+        if end_ts is None:
+            end_ts = timeutil.local_to_ts(end_date, zone)
+        if (start_date and start_ts is None) or (end_date and end_ts is None):
+            bad.append(f"{table} {row_id}: start_date={start_date!r}, end_date={end_date!r}")
+        else:
+            updates.append((start_ts, end_ts, row_id))
+    if bad:
+        shown = '\n  '.join(bad[:20]) + (f"\n  ... 외 {len(bad) - 20}행" if len(bad) > 20 else '')
+        raise MigrationError(
+            f"{table}에 날짜를 읽을 수 없는 행이 {len(bad)}개 있습니다. start_date/end_date를 "
+            f"'YYYY-MM-DDTHH:MM' 형식으로 고치거나 비운 뒤 다시 실행하세요.\n  {shown}"
+        )
+    cursor.executemany(f"UPDATE {table} SET start_ts = ?, end_ts = ? WHERE id = ?", updates)
+
+
+# --- 전문 검색 색인 관리 ---
+def rebuild_search_index(cursor):
+    """tasks_fts / comments_fts를 원본 테이블에서 다시 만듭니다."""
+    cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+    cursor.execute("INSERT INTO comments_fts (comments_fts) VALUES ('rebuild')")
+
+def optimize_search_index(cursor):
+    """색인 세그먼트를 하나로 합쳐 검색을 빠르게 합니다. 대량으로 넣은 뒤에 실행합니다."""
+    cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('optimize')")
+    cursor.execute("INSERT INTO comments_fts (comments_fts) VALUES ('optimize')")
+
+
+# --- 집계 테이블 관리 ---
+def count_task_count_drift(cursor):
+    """project_task_counts 중 실제 tasks 테이블과 값이 다른 (프로젝트, 상태) 행의 수를 반환합니다."""
+    cursor.execute('''
+        SELECT COUNT(*) FROM (
+            SELECT project_id, status FROM (
+                SELECT project_id, IFNULL(status, '') AS status, COUNT(*) FROM tasks GROUP BY 1, 2
+                EXCEPT
+                SELECT project_id, status, task_count FROM project_task_counts WHERE task_count != 0
+            )
+            UNION
+            SELECT project_id, status FROM (
+                SELECT project_id, status, task_count FROM project_task_counts WHERE task_count != 0
+                EXCEPT
+                SELECT project_id, IFNULL(status, ''), COUNT(*) FROM tasks GROUP BY 1, 2
+            )
+        )
+    ''')
+    return cursor.fetchone()[0]
+
+def rebuild_task_counts(cursor):
+    """tasks 테이블에서 project_task_counts를 처음부터 다시 계산합니다."""
+    cursor.execute("DELETE FROM project_task_counts")
+    cursor.execute('''
+        INSERT INTO project_task_counts (project_id, status, task_count)
+        SELECT project_id, IFNULL(status, ''), COUNT(*)
+        FROM tasks
+        WHERE project_id IS NOT NULL
+        GROUP BY project_id, IFNULL(status, '')
+    ''')
+    return cursor.rowcount
+
+
+# --- 마이그레이션 실행 ---
+def current_version(conn):
+    """DB에 기록된 스키마 버전을 반환합니다."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    """아직 적용되지 않은 마이그레이션을 하나씩 트랜잭션으로 적용하고, 적용한 (버전, 설명) 목록을 반환합니다."""
+    applied = []
+    version = current_version(conn)
+    for target, description, fn in MIGRATIONS:
+        if target <= version:
+            continue
+        conn.execute("BEGIN")
+        try:
+            fn(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = target
+        applied.append((target, description))
+    return applied
+
+
+# --- 실행 계획 검사 ---
+def find_full_scans(conn, sql, params):
+    """EXPLAIN QUERY PLAN 결과에서 인덱스 없이 테이블 전체를 읽는 단계를 찾아 반환합니다."""
+    plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return full_scan_steps([row[-1] for row in plan])
+
+def full_scan_steps(details):
+    """EXPLAIN QUERY PLAN의 detail 목록 중 전체 스캔인 단계만 골라 반환합니다."""
+    # WITH 절이나 서브쿼리 결과(이미 LIMIT으로 잘린 행)를 읽는 'SCAN 이름'은 테이블 스캔이 아닙니다.
+    subqueries = {detail.split(' ', 1)[1] for detail in details
+                  if detail.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+    return [detail for detail in details
+            if is_full_scan(detail) and detail[len('SCAN '):] not in subqueries]
+
+def is_full_scan(detail):
+    """EXPLAIN QUERY PLAN의 한 단계가 전체 스캔인지 판단합니다."""
+    # 'SEARCH'는 인덱스로 범위를 좁혀 찾는 단계이고, 'SCAN'은 테이블(또는 인덱스) 전체를
+    # 처음부터 끝까지 읽는 단계입니다. 'SCAN x USING COVERING INDEX ...'도 전체 순회입니다.
+    if not detail.startswith('SCAN') or 'CONSTANT ROW' in detail:
+        return False
+    # FTS5 가상 테이블은 MATCH 조건이 있으면 'SCAN x VIRTUAL TABLE INDEX 0:M1'처럼 보이지만
+    # 실제로는 전문 검색 색인에서 일치하는 행만 읽습니다. (idxStr의 'M'이 MATCH, '='는 rowid 조회)
+    if 'VIRTUAL TABLE INDEX' in detail:
+        idx_str = detail.split('VIRTUAL TABLE INDEX', 1)[1].partition(':')[2]
+        return 'M' not in idx_str and '=' not in idx_str
+    return True
+
+def check_query_plans(conn, queries):
+    """queries({이름: (sql, 예시 파라미터)})의 실행 계획을 검사해 {이름: [전체 스캔 단계]}를 반환합니다.
+
+    반환값이 비어 있으면 모든 쿼리가 인덱스를 사용한다는 뜻입니다.
+    """
+    failures = {}
+    for name, (sql, params) in queries.items():
+        full_scans = find_full_scans(conn, sql, params)
+        if full_scans:
+            failures[name] = full_scans
+    return failures
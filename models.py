@@ -1,164 +1,483 @@
+import sqlite3
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from database import get_db
-from datetime import datetime
+from database import get_db, run_write
+from cache import TTLCache, VersionedTTLCache
+import events
+import passwords
+import timeutil
+
+# 로그인한 사용자 객체 캐시 (Flask-Login의 user_loader가 요청마다 사용합니다)
+user_cache = TTLCache(maxsize=1024, ttl=300.0)
+
+def _load_membership_version():
+    """DB에 기록된 멤버십 버전을 읽습니다. project_members가 바뀌면 트리거가 올립니다."""
+    row = get_db().execute("SELECT version FROM cache_versions WHERE name = 'memberships'").fetchone()
+    return row[0] if row else 0
+
+# 사용자별 {project_id: role} 캐시 (권한 확인에 사용합니다)
+membership_cache = VersionedTTLCache(_load_membership_version, maxsize=4096, ttl=300.0, check_interval=1.0)
+
+# --- 행 조회 ---
+# 모델 객체는 컬럼 순서가 아니라 컬럼 이름으로 만듭니다(각 클래스의 from_row).
+# SELECT *에 컬럼이 추가되거나 순서가 바뀌어도 객체가 엉뚱한 값을 갖지 않습니다.
+def _named_cursor(cursor=None):
+    """행을 sqlite3.Row로 돌려주는 커서를 만듭니다.
+
+    cursor를 넘기면 같은 커넥션에서 만들므로 run_write에 넘긴 함수 안에서도 같은 트랜잭션을 읽습니다.
+    """
+    conn = cursor.connection if cursor is not None else get_db()
+    named = conn.cursor()
+    named.row_factory = sqlite3.Row
+    return named
+
+# --- 자주 실행되는 조회 쿼리 ---
+# 아래 쿼리들은 HOT_QUERIES에도 등록되어 `flask check-query-plans`로 실행 계획을 검사합니다.
+PROJECTS_FOR_USER_SQL = """
+    SELECT p.id, p.project_name, p.created_by, p.start_date, p.end_date, p.start_ts, p.end_ts
+    FROM projects p
+    JOIN project_members pm ON p.id = pm.project_id
+    WHERE pm.user_id = ?
+"""
+
+MEMBERSHIPS_FOR_USER_SQL = "SELECT project_id, role FROM project_members WHERE user_id = ?"
+
+MEMBERS_FOR_PROJECT_SQL = """
+    SELECT u.id, u.username
+    FROM users u
+    JOIN project_members pm ON u.id = pm.user_id
+    WHERE pm.project_id = ?
+"""
+
+TASKS_FOR_PROJECT_SQL = """
+    SELECT * FROM tasks
+    WHERE project_id = ?
+    ORDER BY start_ts ASC
+"""
+
+TASKS_FOR_ASSIGNEE_SQL = """
+    SELECT t.id, t.project_id, t.task_name, t.start_date, t.end_date, t.start_ts, t.end_ts, t.status, t.assignee_id,
+           p.project_name
+    FROM tasks t
+    JOIN projects p ON t.project_id = p.id
+    WHERE t.assignee_id = ?
+    ORDER BY t.start_ts ASC
+"""
+
+# 대시보드 페이지 단위 조회 (project_id 기준 키셋 페이지네이션)
+PROJECTS_PAGE_FOR_USER_SQL = """
+    SELECT p.id, p.project_name, p.created_by, p.start_date, p.end_date, p.start_ts, p.end_ts
+    FROM project_members pm
+    JOIN projects p ON p.id = pm.project_id
+    WHERE pm.user_id = ? AND pm.project_id > ?
+    ORDER BY pm.project_id ASC
+    LIMIT ?
+"""
+
+def tasks_page_for_assignee_sql(after=False, status=False, date_range=False, after_null=False):
+    """담당 작업 페이지 조회 SQL을 만듭니다. (start_ts, id) 기준 키셋 페이지네이션이며
+    상태와 기간 필터도 SQL에서 처리합니다.
+
+    기간이 없는(start_ts가 NULL) 예전 작업은 맨 앞에 옵니다. 커서의 start_ts가 NULL이면(after_null)
+    id 하나만 받아 남은 NULL 작업과 기간이 있는 모든 작업을 이어서 읽습니다.
+    """
+    conditions = ["t.assignee_id = ?"]
+    if after_null:
+        conditions.append("(t.start_ts IS NOT NULL OR t.id > ?)")
+    elif after:
+        conditions.append("(t.start_ts, t.id) > (?, ?)")
+    if status:
+        conditions.append("t.status = ?")
+    if date_range:
+        # 작업 기간이 [from_ts, to_ts)와 겹치는지 확인합니다.
+        conditions.append("t.end_ts >= ? AND t.start_ts < ?")
+    return f"""
+        SELECT t.id, t.project_id, t.task_name, t.start_date, t.end_date, t.start_ts, t.end_ts, t.status,
+               t.assignee_id, p.project_name
+        FROM tasks t
+        JOIN projects p ON t.project_id = p.id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY t.start_ts ASC, t.id ASC
+        LIMIT ?
+    """
+
+# 프로젝트 정보와 조회하는 사용자의 역할을 한 번에 가져옵니다. 멤버가 아니면 결과가 없습니다.
+SNAPSHOT_PROJECT_SQL = """
+    SELECT p.id, p.project_name, p.created_by, p.start_date, p.end_date, p.start_ts, p.end_ts, pm.role
+    FROM projects p
+    JOIN project_members pm ON pm.project_id = p.id AND pm.user_id = ?
+    WHERE p.id = ?
+"""
+
+SNAPSHOT_TASKS_SQL = """
+    SELECT t.id, t.project_id, t.task_name, t.start_date, t.end_date, t.start_ts, t.end_ts, t.status, t.assignee_id,
+           u.username AS assignee_name
+    FROM tasks t
+    LEFT JOIN users u ON t.assignee_id = u.id
+    WHERE t.project_id = ?
+    ORDER BY t.start_ts ASC
+"""
+
+# 간트 차트: 기간이 [from_ts, to_ts)와 겹치는 작업만 (start_ts, end_ts, id) 키셋으로 한 페이지씩 읽습니다.
+# idx_tasks_project_window (project_id, start_ts, end_ts) 순서 그대로 읽고, end_ts 조건은 인덱스 항목에서
+# 거르므로 창과 겹치지 않는 작업은 테이블 행을 읽지 않습니다.
+GANTT_TASKS_SQL = """
+    SELECT t.id, t.project_id, t.task_name, t.status, t.start_date, t.end_date, t.start_ts, t.end_ts,
+           t.assignee_id, u.username AS assignee_name
+    FROM tasks t
+    LEFT JOIN users u ON u.id = t.assignee_id
+    WHERE t.project_id = ? AND t.start_ts < ? AND t.end_ts >= ?
+      AND (t.start_ts, t.end_ts, t.id) > (?, ?, ?)
+    ORDER BY t.start_ts ASC, t.end_ts ASC, t.id ASC
+    LIMIT ?
+"""
+
+# 넓은 기간을 볼 때는 창과 겹치는 작업을 담당자별 한 줄(swimlane)로 묶어 보냅니다.
+# 먼저 묶은 뒤에 담당자 이름을 붙이므로 users는 줄 수만큼만 읽습니다.
+GANTT_LANES_SQL = """
+    SELECT lanes.assignee_id, u.username AS assignee_name, lanes.task_count, lanes.completed,
+           lanes.lane_start, lanes.lane_end
+    FROM (
+        SELECT assignee_id, COUNT(*) AS task_count, SUM(status = '완료') AS completed,
+               MIN(start_ts) AS lane_start, MAX(end_ts) AS lane_end
+        FROM tasks
+        WHERE project_id = ? AND start_ts < ? AND end_ts >= ?
+        GROUP BY assignee_id
+    ) AS lanes
+    LEFT JOIN users u ON u.id = lanes.assignee_id
+    ORDER BY lanes.lane_start ASC, lanes.assignee_id ASC
+"""
+
+# 트리거가 관리하는 project_task_counts에서 (전체 작업 수, 완료 작업 수)를 읽습니다.
+# 프로젝트의 작업 수와 관계없이 상태 개수만큼의 행만 읽습니다.
+TASK_COUNTS_SQL = """
+    SELECT COALESCE(SUM(task_count), 0),
+           COALESCE(SUM(CASE WHEN status = '완료' THEN task_count END), 0)
+    FROM project_task_counts
+    WHERE project_id = ?
+"""
+
+# comments 테이블과 users 테이블을 JOIN하여 사용자 이름을 함께 가져옵니다.
+# (created_ts, id) 기준 키셋 페이지네이션을 사용하므로 스레드 길이와 관계없이
+# 인덱스에서 필요한 만큼만 읽습니다. 표시용 시간은 보는 사용자의 시간대로 timeutil에서 만듭니다.
+_COMMENT_COLUMNS = """
+    SELECT c.id, c.task_id, c.user_id, c.content, c.created_at, c.created_ts, u.username
+    FROM comments c
+    JOIN users u ON c.user_id = u.id
+"""
+
+# 가장 최근 댓글 (최신순으로 읽어서 뒤집습니다)
+COMMENTS_LATEST_SQL = _COMMENT_COLUMNS + """
+    WHERE c.task_id = ?
+    ORDER BY c.created_ts DESC, c.id DESC
+    LIMIT ?
+"""
+
+# 커서보다 오래된 댓글
+COMMENTS_BEFORE_SQL = _COMMENT_COLUMNS + """
+    WHERE c.task_id = ? AND (c.created_ts, c.id) < (?, ?)
+    ORDER BY c.created_ts DESC, c.id DESC
+    LIMIT ?
+"""
+
+# 커서보다 새로운 댓글
+COMMENTS_AFTER_SQL = _COMMENT_COLUMNS + """
+    WHERE c.task_id = ? AND (c.created_ts, c.id) > (?, ?)
+    ORDER BY c.created_ts ASC, c.id ASC
+    LIMIT ?
+"""
+
+# 델타 동기화: 변경 기록 (트리거가 채웁니다)
+CHANGES_SINCE_SQL = """
+    SELECT version, entity, entity_id, op
+    FROM change_log
+    WHERE project_id = ? AND version > ?
+    ORDER BY version ASC
+    LIMIT ?
+"""
+
+LATEST_CHANGE_SQL = "SELECT COALESCE(MAX(version), 0) FROM change_log WHERE project_id = ?"
+
+# 한쪽만 정한 기간 필터의 나머지 경계 (SQLite INTEGER 범위)
+_TS_MIN, _TS_MAX = -(2 ** 63), 2 ** 63 - 1
+
+# --- 변경 버전 ---
+# 조건부 GET(ETag / Last-Modified)에 쓰이는 버전 값을 올립니다.
+# 차트와 통계는 프로젝트 버전, 댓글 목록은 작업 버전에 따라 달라지므로
+# 쓰기 작업은 같은 트랜잭션 안에서 해당 버전을 함께 올립니다.
+def _touch_project(cursor, project_id):
+    cursor.execute(
+        "UPDATE projects SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (project_id,)
+    )
+
+def _touch_task(cursor, task_id):
+    cursor.execute(
+        "UPDATE tasks SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (task_id,)
+    )
+
+# --- 실시간 이벤트 ---
+# 쓰기 작업은 같은 트랜잭션 안에서 바뀐 내용만 담은 이벤트를 발행하고,
+# 프로젝트 화면은 /api/project/<id>/events 스트림으로 받아 다시 조회하지 않고 반영합니다.
+TASK_EVENT_SQL = """
+    SELECT t.id, t.task_name, t.start_date, t.end_date, t.start_ts, t.end_ts, t.status, t.assignee_id, u.username AS assignee_name
+    FROM tasks t
+    LEFT JOIN users u ON u.id = t.assignee_id
+    WHERE t.id = ?
+"""
+
+def _publish_task(cursor, project_id, task_id, event_type='task.updated'):
+    """작업의 현재 값을 담은 task.created / task.updated 이벤트를 발행합니다."""
+    t = _named_cursor(cursor).execute(TASK_EVENT_SQL, (task_id,)).fetchone()
+    if t is None:
+        return
+    events.publish(cursor, project_id, event_type, task={
+        'id': t['id'], 'name': t['task_name'], 'start_date': t['start_date'], 'end_date': t['end_date'],
+        'start_ts': t['start_ts'], 'end_ts': t['end_ts'], 'status': t['status'], 'assignee_id': t['assignee_id'], 'assignee_name': t['assignee_name']
+    })
+
+def _publish_progress(cursor, project_id):
+    """집계 테이블에서 읽은 새 진행률로 progress 이벤트를 발행합니다."""
+    total, completed = cursor.execute(TASK_COUNTS_SQL, (project_id,)).fetchone()
+    events.publish(cursor, project_id, 'progress', total=total, completed=completed,
+                   task_progress=round((completed / total) * 100) if total else 0)
+
+def _publish_comment(cursor, comment_id):
+    """작성자 이름과 작성 시각을 포함한 comment.added 이벤트를 발행합니다.
+
+    이벤트는 시간대가 다른 여러 사용자에게 가므로 화면은 created_ts를 자기 시간대로 표시하고,
+    created_at(기본 시간대)은 created_ts를 모르는 클라이언트를 위해 남겨 둡니다.
+    """
+    c = Comment.from_row(_named_cursor(cursor).execute(_COMMENT_COLUMNS + " WHERE c.id = ?", (comment_id,)).fetchone())
+    project_id = cursor.execute("SELECT project_id FROM tasks WHERE id = ?", (c.task_id,)).fetchone()[0]
+    events.publish(cursor, project_id, 'comment.added', task_id=c.task_id, comment={
+        'id': c.id, 'username': c.username, 'content': c.content,
+        'created_at': timeutil.format_ts(c.created_ts, timeutil.default_zone()), 'created_ts': c.created_ts
+    })
 
 # --- User 클래스 ---
 class User(UserMixin):
-    def __init__(self, id, username, password_hash, role):
+    # UserMixin에 __slots__가 없어 인스턴스 __dict__는 남지만, 속성은 슬롯에 저장됩니다.
+    __slots__ = ('id', 'username', 'password_hash', 'role', 'timezone')
+
+    def __init__(self, id, username, password_hash, role, timezone=None):
         self.id = id
         self.username = username
         self.password_hash = password_hash
         self.role = role
+        self.timezone = timezone # IANA 시간대 이름 (None이면 기본 시간대)
     
-    # 비밀번호 설정
+    # 비밀번호 설정 (해시 계산은 프로세스 풀에서 실행합니다)
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash_password(password)
 
     # 비밀번호 확인
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify_password(self.password_hash, password)
+
+    # 해시 설정이 바뀌었으면 로그인할 때 새 설정으로 다시 해시해 저장
+    def rehash_password_if_needed(self, password):
+        """check_password가 성공한 직후에 호출합니다. 다시 해시했으면 True를 반환합니다."""
+        if not passwords.needs_rehash(self.password_hash):
+            return False
+        self.set_password(password)
+        run_write(lambda cursor: cursor.execute(
+            "UPDATE users SET password_hash = ? WHERE id = ?", (self.password_hash, self.id)
+        ))
+        User.invalidate_cache(self.id)
+        return True
 
-    # user_id로 사용자 찾기
+    @classmethod
+    def from_row(cls, row):
+        """users 테이블의 행(sqlite3.Row)으로 객체를 만듭니다."""
+        return cls(id=row['id'], username=row['username'], password_hash=row['password_hash'], role=row['role'],
+                   timezone=row['timezone'] if 'timezone' in row.keys() else None)
+
+    # user_id로 사용자 찾기 (캐시 사용)
     @staticmethod
     def get(user_id):
-        db = get_db()
+        """사용자를 캐시에서 찾고, 없으면 DB에서 불러와 캐시에 저장합니다."""
         try:
-            cursor = db.cursor()
-            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-            user_data = cursor.fetchone()
-            if not user_data:
-                return None
-            return User(id=user_data[0], username=user_data[1], password_hash=user_data[2], role=user_data[3])
-        finally:
-            db.close()
+            key = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        user = user_cache.get(key)
+        if user is None:
+            generation = user_cache.generation()
+            user = User.load(key)
+            if user is not None:
+                user_cache.set(key, user, generation=generation)
+        return user
+
+    # user_id로 DB에서 직접 사용자 찾기
+    @staticmethod
+    def load(user_id):
+        cursor = _named_cursor()
+        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+        user_data = cursor.fetchone()
+        if not user_data:
+            return None
+        return User.from_row(user_data)
 
     # 사용자 이름으로 사용자 찾기
     @staticmethod
     def find_by_username(username):
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-            user_data = cursor.fetchone()
-            if not user_data:
-                return None
-            return User(id=user_data[0], username=user_data[1], password_hash=user_data[2], role=user_data[3])
-        finally:
-            db.close()
+        cursor = _named_cursor()
+        cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
+        user_data = cursor.fetchone()
+        if not user_data:
+            return None
+        return User.from_row(user_data)
 
     # 사용자 생성
     def create(self):
-        db = get_db()
-        try:
-            cursor = db.cursor()
+        def _write(cursor):
             cursor.execute(
-                "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                (self.username, self.password_hash, self.role)
+                "INSERT INTO users (username, password_hash, role, timezone) VALUES (?, ?, ?, ?)",
+                (self.username, self.password_hash, self.role, self.timezone)
             )
-            db.commit()
-        finally:
-            db.close()
+            return cursor.lastrowid
+        self.id = run_write(_write)
+        User.invalidate_cache(self.id)
+        return self.id
+
+    # 표시 시간대 변경
+    def set_timezone(self, name):
+        """사용자의 시간대를 바꿉니다. name은 timeutil.is_valid_zone을 통과한 값이어야 합니다."""
+        self.timezone = name
+        run_write(lambda cursor: cursor.execute("UPDATE users SET timezone = ? WHERE id = ?", (name, self.id)))
+        User.invalidate_cache(self.id)
+
+    # 사용자 정보가 바뀌었을 때 캐시에서 제거
+    @staticmethod
+    def invalidate_cache(user_id):
+        user_cache.invalidate(int(user_id))
 
 # --- Project 클래스 ---
 class Project:
+    __slots__ = ('id', 'project_name', 'created_by', 'start_date', 'end_date', 'start_ts', 'end_ts')
+
     # 프로젝트 정보
-    def __init__(self, id, project_name, created_by, start_date=None, end_date=None):
+    def __init__(self, id, project_name, created_by, start_date=None, end_date=None, start_ts=None, end_ts=None):
         self.id = id
         self.project_name = project_name
         self.created_by = created_by
         self.start_date = start_date
         self.end_date = end_date
+        self.start_ts = start_ts # 기간의 UTC epoch 초 (비교와 계산은 이 값으로 합니다)
+        self.end_ts = end_ts
+
+    @classmethod
+    def from_row(cls, row):
+        """projects 컬럼을 포함한 행(sqlite3.Row)으로 객체를 만듭니다."""
+        return cls(id=row['id'], project_name=row['project_name'], created_by=row['created_by'],
+                   start_date=row['start_date'], end_date=row['end_date'],
+                   start_ts=row['start_ts'], end_ts=row['end_ts'])
 
     # 프로젝트 생성
     def create(self):
-        """새로운 프로젝트를 DB에 추가하고, 생성자를 '팀장'으로 멤버에 추가합니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
+        """새로운 프로젝트를 DB에 추가하고, 생성자를 '팀장'으로 멤버에 추가합니다.
+        기간은 start_ts/end_ts로 받고, 텍스트 컬럼은 그 값에서 만듭니다."""
+        self.start_date, self.end_date = timeutil.period_text(self.start_ts), timeutil.period_text(self.end_ts)
+
+        def _write(cursor):
             cursor.execute(
-                "INSERT INTO projects (project_name, created_by, start_date, end_date) VALUES (?, ?, ?, ?)",
-                (self.project_name, self.created_by, self.start_date, self.end_date)
+                "INSERT INTO projects (project_name, created_by, start_date, end_date, start_ts, end_ts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.project_name, self.created_by, self.start_date, self.end_date, self.start_ts, self.end_ts)
             )
             project_id = cursor.lastrowid
-            
+
             # user_id와 함께 '팀장'이라는 role을 추가
             cursor.execute(
                 "INSERT INTO project_members (project_id, user_id, role) VALUES (?, ?, ?)",
                 (project_id, self.created_by, '팀장')
             )
-            db.commit()
-        finally:
-            db.close()
+        run_write(_write)
+        membership_cache.invalidate(int(self.created_by))
+
+    # 사용자가 속한 프로젝트와 역할 (캐시 사용)
+    @staticmethod
+    def memberships(user_id):
+        """사용자의 {project_id: role} 딕셔너리를 반환합니다. 평소에는 DB에 접근하지 않습니다."""
+        user_id = int(user_id)
+        membership_cache.validate()
+        roles = membership_cache.get(user_id)
+        if roles is None:
+            # 읽는 동안 멤버십이 바뀌면(무효화되면) 읽은 값을 캐시에 넣지 않습니다.
+            generation = membership_cache.generation()
+            db = get_db()
+            cursor = db.cursor()
+            cursor.execute(MEMBERSHIPS_FOR_USER_SQL, (user_id,))
+            roles = {project_id: role for project_id, role in cursor.fetchall()}
+            membership_cache.set(user_id, roles, generation=generation)
+        return roles
 
     # 사용자의 권한 확인
     @staticmethod
     def get_user_role(project_id, user_id):
         """프로젝트 내에서 사용자의 역할을 반환합니다 (팀장, 팀원, 또는 None)."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute(
-                "SELECT role FROM project_members WHERE project_id = ? AND user_id = ?",
-                (project_id, user_id)
-            )
-            result = cursor.fetchone()
-            # 결과가 있으면 역할(예: '팀장')을 반환하고, 없으면 None을 반환합니다.
-            return result[0] if result else None
-        finally:
-            db.close()
+        # 멤버십 캐시에 역할이 있으면(예: '팀장') 반환하고, 없으면 None을 반환합니다.
+        return Project.memberships(user_id).get(int(project_id))
 
     # 프로젝트 정보 업데이트
-    def update(self, name, start_date, end_date):
-        """프로젝트 정보를 업데이트합니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
+    def update(self, name, start_ts, end_ts):
+        """프로젝트 이름과 기간(epoch 초)을 업데이트합니다."""
+        start_date, end_date = timeutil.period_text(start_ts), timeutil.period_text(end_ts)
+        self.project_name, self.start_date, self.end_date = name, start_date, end_date
+        self.start_ts, self.end_ts = start_ts, end_ts
+
+        def _write(cursor):
             cursor.execute(
-                "UPDATE projects SET project_name = ?, start_date = ?, end_date = ? WHERE id = ?",
-                (name, start_date, end_date, self.id)
+                "UPDATE projects SET project_name = ?, start_date = ?, end_date = ?, start_ts = ?, end_ts = ? "
+                "WHERE id = ?",
+                (name, start_date, end_date, start_ts, end_ts, self.id)
             )
-            db.commit()
-        finally:
-            db.close()
+            _touch_project(cursor, self.id)
+        run_write(_write)
 
     # 사용자에게 할당된 프로젝트 찾기
     @staticmethod
     def find_for_user(user_id):
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("""
-                SELECT p.id, p.project_name, p.created_by, p.start_date, p.end_date
-                FROM projects p
-                JOIN project_members pm ON p.id = pm.project_id
-                WHERE pm.user_id = ?
-            """, (user_id,))
-            projects_data = cursor.fetchall()
-            return [Project(id=p[0], project_name=p[1], created_by=p[2], start_date=p[3], end_date=p[4]) for p in projects_data]
-        finally:
-            db.close()
+        cursor = _named_cursor()
+        cursor.execute(PROJECTS_FOR_USER_SQL, (user_id,))
+        return [Project.from_row(p) for p in cursor.fetchall()]
     
+    # 사용자가 속한 프로젝트를 페이지 단위로 찾기
+    @staticmethod
+    def page_for_user(user_id, limit, after_id=0):
+        """project_id가 after_id보다 큰 프로젝트를 limit개 가져옵니다.
+        (프로젝트 목록, 다음 페이지가 있는지 여부)를 반환합니다."""
+        cursor = _named_cursor()
+        cursor.execute(PROJECTS_PAGE_FOR_USER_SQL, (user_id, after_id, limit + 1))
+        projects_data = cursor.fetchall()
+        projects = [Project.from_row(p) for p in projects_data[:limit]]
+        return projects, len(projects_data) > limit
+
+    # 프로젝트의 (전체 작업 수, 완료 작업 수)
+    @staticmethod
+    def task_counts(project_id):
+        """트리거가 관리하는 집계 테이블에서 작업 수를 읽습니다."""
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(TASK_COUNTS_SQL, (project_id,))
+        return cursor.fetchone()
+
     # 태스크 진행률 계산 함수
     def calculate_task_progress(self):
         """태스크 완료도를 기반으로 진행률을 계산합니다."""
-        tasks = Task.find_for_project(self.id)
-        if not tasks:
+        total_tasks, completed_tasks = Project.task_counts(self.id)
+        if not total_tasks:
             return 0
-        
-        completed_tasks = [task for task in tasks if task.status == '완료']
-        return round((len(completed_tasks) / len(tasks)) * 100)
+        return round((completed_tasks / total_tasks) * 100)
 
     # 시간 진행률 계산 함수
     def calculate_time_progress(self):
-        """프로젝트 기간을 기반으로 시간 진행률을 계산합니다."""
-        if not self.start_date or not self.end_date:
+        """프로젝트 기간을 기반으로 시간 진행률을 계산합니다. (정수 epoch 값만 비교합니다)"""
+        if self.start_ts is None or self.end_ts is None:
             return 0
-
-        # 문자열을 datetime 객체로 변환
-        start = datetime.fromisoformat(self.start_date)
-        end = datetime.fromisoformat(self.end_date)
-        now = datetime.now()
+        start, end = self.start_ts, self.end_ts
+        now = timeutil.now_ts()
 
         # 현재 시간이 시작 전이면 0%, 종료 후면 100%
         if now < start:
@@ -166,292 +485,809 @@ class Project:
         if now > end:
             return 100
 
-        # 전체 기간과 경과 시간 계산
-        total_duration = end - start
-        elapsed_duration = now - start
-
         # 기간이 0일 경우(시작과 종료가 같음) 처리
-        if total_duration.total_seconds() == 0:
+        if end == start:
             return 100
-            
-        return round((elapsed_duration / total_duration) * 100)
+
+        return round((now - start) / (end - start) * 100)
     
     # 프로젝트 정보 찾기
     @staticmethod
     def get(project_id):
+        cursor = _named_cursor()
+        cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
+        p_data = cursor.fetchone()
+        if not p_data:
+            return None
+        return Project.from_row(p_data)
+
+    # 프로젝트의 변경 버전 (ETag용)
+    @staticmethod
+    def change_version(project_id):
+        """(version, updated_at)을 반환합니다. 프로젝트가 없으면 None을 반환합니다."""
         db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
-            p_data = cursor.fetchone()
-            if not p_data:
-                return None
-            return Project(id=p_data[0], project_name=p_data[1], created_by=p_data[2], start_date=p_data[3], end_date=p_data[4])
-        finally:
-            db.close()
+        cursor = db.cursor()
+        cursor.execute("SELECT version, updated_at FROM projects WHERE id = ?", (project_id,))
+        return cursor.fetchone()
 
     # 프로젝트에 멤버인지 확인
     @staticmethod
     def is_member(project_id, user_id):
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute(
-                "SELECT 1 FROM project_members WHERE project_id = ? AND user_id = ?",
-                (project_id, user_id)
-            )
-            return cursor.fetchone() is not None
-        finally:
-            db.close()
+        return int(project_id) in Project.memberships(user_id)
 
     # 프로젝트에 사용자 추가
     @staticmethod
     def add_member(project_id, user_id):
         """프로젝트에 새로운 팀원을 추가합니다."""
-        db = get_db()
-        try:
-            # 이미 멤버인지 확인하는 로직을 추가하면 더 좋습니다.
-            cursor = db.cursor()
+        def _write(cursor):
             cursor.execute(
                 "INSERT INTO project_members (project_id, user_id, role) VALUES (?, ?, ?)",
                 (project_id, user_id, '팀원') # 새로운 멤버는 '팀원' 역할
             )
-            db.commit()
-        except db.IntegrityError:
+        try:
+            # 이미 멤버인지 확인하는 로직을 추가하면 더 좋습니다.
+            run_write(_write)
+        except sqlite3.IntegrityError:
             # 이미 멤버인 경우 PRIMARY KEY 제약 조건으로 인해 에러가 발생합니다.
             # 이 경우 그냥 무시하고 넘어갈 수 있습니다.
             print(f"User {user_id} is already a member of project {project_id}.")
-        finally:
-            db.close()
+        membership_cache.invalidate(int(user_id))
 
     # 프로젝트에 속한 멤버들의 id와 username을 가져오기
     @staticmethod
     def get_members(project_id):
         """프로젝트에 속한 모든 멤버의 id와 username을 가져옵니다."""
         db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("""
-                SELECT u.id, u.username
-                FROM users u
-                JOIN project_members pm ON u.id = pm.user_id
-                WHERE pm.project_id = ?
-            """, (project_id,))
-            return cursor.fetchall() # [(1, 'userA'), (2, 'userB')] 형태의 리스트 반환
-        finally:
-            db.close()
+        cursor = db.cursor()
+        cursor.execute(MEMBERS_FOR_PROJECT_SQL, (project_id,))
+        return cursor.fetchall() # [(1, 'userA'), (2, 'userB')] 형태의 리스트 반환
+
+    # 사용자 ID 목록으로 프로젝트 멤버 찾기
+    @staticmethod
+    def members_by_ids(project_id, user_ids):
+        """[(user_id, username, role), ...]를 반환합니다. 멤버가 아닌 사용자는 빠집니다."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return []
+        db = get_db()
+        cursor = db.cursor()
+        placeholders = ', '.join('?' * len(user_ids))
+        cursor.execute(
+            "SELECT u.id, u.username, pm.role FROM project_members pm JOIN users u ON u.id = pm.user_id "
+            f"WHERE pm.project_id = ? AND pm.user_id IN ({placeholders})",
+            [project_id] + user_ids
+        )
+        return cursor.fetchall()
+
+    # 여러 프로젝트의 멤버 ID를 한 번에 가져오기
+    @staticmethod
+    def member_ids(project_ids):
+        """{project_id: {user_id, ...}}를 반환합니다."""
+        project_ids = list(project_ids)
+        members = {project_id: set() for project_id in project_ids}
+        if not project_ids:
+            return members
+        db = get_db()
+        cursor = db.cursor()
+        placeholders = ', '.join('?' * len(project_ids))
+        cursor.execute(
+            f"SELECT project_id, user_id FROM project_members WHERE project_id IN ({placeholders})", project_ids
+        )
+        for project_id, user_id in cursor.fetchall():
+            members[project_id].add(user_id)
+        return members
 
     # 프로젝트 삭제
     def delete(self):
         """프로젝트를 DB에서 삭제합니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
+        def _write(cursor):
             # ON DELETE CASCADE 설정 덕분에, 이 프로젝트를 참조하는
             # project_members, tasks, comments 데이터도 연쇄적으로 자동 삭제됩니다.
             cursor.execute("DELETE FROM projects WHERE id = ?", (self.id,))
-            db.commit()
-        finally:
-            db.close()
+        run_write(_write)
+        # 이 프로젝트의 멤버 전원이 영향을 받으므로 멤버십 캐시를 모두 비웁니다.
+        membership_cache.clear()
 
 # --- Task 클래스
 class Task:
+    __slots__ = ('id', 'project_id', 'task_name', 'status', 'start_date', 'end_date', 'start_ts', 'end_ts',
+                 'assignee_id', 'assignee_name', 'project_name')
+
     # 작업 정보
-    def __init__(self, id, project_id, task_name, status='대기', start_date=None, end_date=None, assignee_id=None):
+    def __init__(self, id, project_id, task_name, status='대기', start_date=None, end_date=None, assignee_id=None,
+                 assignee_name=None, project_name=None, start_ts=None, end_ts=None):
         self.id = id
         self.project_id = project_id
         self.task_name = task_name
         self.status = status
         self.start_date = start_date
         self.end_date = end_date
+        self.start_ts = start_ts # 기간의 UTC epoch 초 (정렬과 범위 조회는 이 값으로 합니다)
+        self.end_ts = end_ts
         self.assignee_id = assignee_id
+        self.assignee_name = assignee_name # 담당자 이름을 함께 조회한 경우에만 채워집니다
+        self.project_name = project_name   # 프로젝트 이름을 함께 조회한 경우에만 채워집니다
+
+    @classmethod
+    def from_row(cls, row):
+        """tasks 컬럼을 포함한 행(sqlite3.Row)으로 객체를 만듭니다.
+        assignee_name / project_name 컬럼은 쿼리에 있을 때만 채웁니다."""
+        columns = row.keys()
+        return cls(id=row['id'], project_id=row['project_id'], task_name=row['task_name'],
+                   status=row['status'], start_date=row['start_date'], end_date=row['end_date'],
+                   start_ts=row['start_ts'], end_ts=row['end_ts'], assignee_id=row['assignee_id'],
+                   assignee_name=row['assignee_name'] if 'assignee_name' in columns else None,
+                   project_name=row['project_name'] if 'project_name' in columns else None)
 
     # 작업 생성
     def create(self):
-        """새로운 작업을 DB에 추가하고 ID를 반환합니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
+        """새로운 작업을 DB에 추가하고 ID를 반환합니다. 기간은 start_ts/end_ts로 받습니다."""
+        self.start_date, self.end_date = timeutil.period_text(self.start_ts), timeutil.period_text(self.end_ts)
+
+        def _write(cursor):
             cursor.execute(
-                "INSERT INTO tasks (project_id, task_name, status, start_date, end_date) VALUES (?, ?, ?, ?, ?)",
-                (self.project_id, self.task_name, self.status, self.start_date, self.end_date)
+                "INSERT INTO tasks (project_id, task_name, status, start_date, end_date, start_ts, end_ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.project_id, self.task_name, self.status, self.start_date, self.end_date,
+                 self.start_ts, self.end_ts)
             )
             new_id = cursor.lastrowid # ID 가져오기
-            db.commit()
+            _touch_project(cursor, self.project_id)
+            _publish_task(cursor, self.project_id, new_id, 'task.created')
+            _publish_progress(cursor, self.project_id)
             return new_id # ID 반환
-        finally:
-            db.close()
+        return run_write(_write)
 
     # 프로젝트에 관한 작업 찾기
     @staticmethod
     def find_for_project(project_id):
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("""
-                SELECT * FROM tasks 
-                WHERE project_id = ? 
-                ORDER BY start_date ASC
-            """, (project_id,))
-            tasks_data = cursor.fetchall()
-            return [Task(id=t[0], project_id=t[1], task_name=t[2], 
-                        start_date=t[3], end_date=t[4], status=t[5], 
-                        assignee_id=t[6]) for t in tasks_data]
-        finally:
-            db.close()
+        cursor = _named_cursor()
+        cursor.execute(TASKS_FOR_PROJECT_SQL, (project_id,))
+        return [Task.from_row(t) for t in cursor.fetchall()]
     
     # 작업 정보 업데이트
-    def update(self, name, start_date, end_date):
-        """작업의 이름과 기간을 업데이트합니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
+    def update(self, name, start_ts, end_ts):
+        """작업의 이름과 기간(epoch 초)을 업데이트합니다."""
+        start_date, end_date = timeutil.period_text(start_ts), timeutil.period_text(end_ts)
+        self.task_name, self.start_date, self.end_date = name, start_date, end_date
+        self.start_ts, self.end_ts = start_ts, end_ts
+
+        def _write(cursor):
             cursor.execute(
-                "UPDATE tasks SET task_name = ?, start_date = ?, end_date = ? WHERE id = ?",
-                (name, start_date, end_date, self.id)
+                "UPDATE tasks SET task_name = ?, start_date = ?, end_date = ?, start_ts = ?, end_ts = ? WHERE id = ?",
+                (name, start_date, end_date, start_ts, end_ts, self.id)
             )
-            db.commit()
-        finally:
-            db.close()
+            _touch_task(cursor, self.id)
+            _touch_project(cursor, self.project_id)
+            _publish_task(cursor, self.project_id, self.id)
+        run_write(_write)
 
     # 작업 상태 변경
     def update_status(self, new_status):
-        db = get_db()
-        try:
-            cursor = db.cursor()
+        def _write(cursor):
             cursor.execute(
                 "UPDATE tasks SET status = ? WHERE id = ?",
                 (new_status, self.id)
             )
-            db.commit()
-        finally:
-            db.close()
+            _touch_task(cursor, self.id)
+            _touch_project(cursor, self.project_id)
+            events.publish(cursor, self.project_id, 'task.status', task_id=self.id, status=new_status)
+            _publish_progress(cursor, self.project_id)
+        run_write(_write)
 
     # 작업 삭제
     def delete(self):
-        db = get_db()
-        try:
-            cursor = db.cursor()
+        def _write(cursor):
             cursor.execute("DELETE FROM tasks WHERE id = ?", (self.id,))
-            db.commit()
-        finally:
-            db.close()
+            _touch_project(cursor, self.project_id)
+            events.publish(cursor, self.project_id, 'task.deleted', task_id=self.id)
+            _publish_progress(cursor, self.project_id)
+        run_write(_write)
 
     # 작업 정보 찾기
     @staticmethod
     def get(task_id):
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-            task_data = cursor.fetchone()
-            if not task_data:
-                return None
-            return Task(id=task_data[0], project_id=task_data[1], task_name=task_data[2], 
-                        start_date=task_data[3], end_date=task_data[4], status=task_data[5], 
-                        assignee_id=task_data[6])
-        finally:
-            db.close()
+        cursor = _named_cursor()
+        cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+        task_data = cursor.fetchone()
+        if not task_data:
+            return None
+        return Task.from_row(task_data)
     
+    # 작업의 변경 버전 (ETag용)
+    @staticmethod
+    def change_version(task_id):
+        """(project_id, version, updated_at)을 반환합니다. 작업이 없으면 None을 반환합니다."""
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute("SELECT project_id, version, updated_at FROM tasks WHERE id = ?", (task_id,))
+        return cursor.fetchone()
+
     # 사용자에게 할당된 작업 찾기
     @staticmethod
     def find_for_assignee(user_id):
-        """특정 사용자에게 할당된 모든 작업을 가져옵니다."""
+        """특정 사용자에게 할당된 모든 작업을 프로젝트 이름과 함께 가져옵니다."""
+        cursor = _named_cursor()
+        cursor.execute(TASKS_FOR_ASSIGNEE_SQL, (user_id,))
+        return [Task.from_row(t) for t in cursor.fetchall()]
+
+    # 사용자에게 할당된 작업을 페이지 단위로 찾기
+    @staticmethod
+    def page_for_assignee(user_id, limit, after=None, status=None, from_ts=None, to_ts=None):
+        """할당된 작업을 (start_ts, id) 순으로 limit개 가져옵니다.
+
+        after는 (start_ts, id) 커서(start_ts는 None일 수 있음)이고,
+        status와 기간 필터(epoch 초, [from_ts, to_ts))는 SQL에서 적용합니다.
+        (프로젝트 이름이 채워진 작업 목록, 다음 페이지가 있는지 여부)를 반환합니다.
+        """
+        after_null = after is not None and after[0] is None
+        params = [user_id]
+        if after_null:
+            params.append(after[1])
+        elif after is not None:
+            params.extend(after)
+        if status:
+            params.append(status)
+        has_range = from_ts is not None or to_ts is not None
+        if has_range:
+            params.extend([from_ts if from_ts is not None else _TS_MIN, to_ts if to_ts is not None else _TS_MAX])
+        params.append(limit + 1)
+
+        cursor = _named_cursor()
+        cursor.execute(tasks_page_for_assignee_sql(after is not None, bool(status), has_range, after_null), params)
+        tasks_data = cursor.fetchall()
+        return [Task.from_row(t) for t in tasks_data[:limit]], len(tasks_data) > limit
+
+    # 간트 차트의 시간 창에 걸친 작업을 페이지 단위로 찾기
+    @staticmethod
+    def in_window(project_id, from_ts, to_ts, limit, after=None):
+        """기간이 [from_ts, to_ts)와 겹치는 작업을 (start_ts, end_ts, id) 순으로 limit개 가져옵니다.
+
+        after는 (start_ts, end_ts, id) 커서입니다. 기간이 비어 있는(start_ts/end_ts가 NULL) 작업은 빠집니다.
+        (담당자 이름이 채워진 작업 목록, 다음 페이지가 있는지 여부)를 반환합니다.
+        """
+        after = after if after is not None else (_TS_MIN, _TS_MIN, 0)
+        cursor = _named_cursor()
+        cursor.execute(GANTT_TASKS_SQL, (project_id, to_ts, from_ts) + tuple(after) + (limit + 1,))
+        tasks_data = cursor.fetchall()
+        return [Task.from_row(t) for t in tasks_data[:limit]], len(tasks_data) > limit
+
+    # 간트 차트의 시간 창에 걸친 작업을 담당자별로 묶기
+    @staticmethod
+    def swimlanes(project_id, from_ts, to_ts):
+        """담당자별 (assignee_id, assignee_name, task_count, completed, lane_start, lane_end) 행 목록을 반환합니다.
+        담당자가 없는 작업은 assignee_id가 None인 한 줄로 묶입니다."""
+        cursor = _named_cursor()
+        cursor.execute(GANTT_LANES_SQL, (project_id, to_ts, from_ts))
+        return cursor.fetchall()
+
+    # 여러 작업의 소속 프로젝트를 한 번에 찾기
+    @staticmethod
+    def project_ids(task_ids):
+        """{task_id: project_id}를 반환합니다. 존재하지 않는 작업은 빠집니다."""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return {}
         db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("""
-                SELECT t.id, t.project_id, t.task_name, t.start_date, t.end_date, t.status, t.assignee_id, p.project_name
-                FROM tasks t
-                JOIN projects p ON t.project_id = p.id
-                WHERE t.assignee_id = ?
-                ORDER BY t.start_date ASC
-            """, (user_id,))
-            tasks_data = cursor.fetchall()
-            return tasks_data
-        finally:
-            db.close()
+        cursor = db.cursor()
+        placeholders = ', '.join('?' * len(task_ids))
+        cursor.execute(f"SELECT id, project_id FROM tasks WHERE id IN ({placeholders})", task_ids)
+        return dict(cursor.fetchall())
+
+    # ID 목록으로 작업 찾기 (담당자 이름 포함)
+    @staticmethod
+    def find_by_ids(project_id, task_ids):
+        """프로젝트에 속한 작업 중 task_ids에 해당하는 작업들을 가져옵니다."""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        cursor = _named_cursor()
+        placeholders = ', '.join('?' * len(task_ids))
+        cursor.execute(
+            "SELECT t.*, u.username AS assignee_name "
+            "FROM tasks t LEFT JOIN users u ON t.assignee_id = u.id "
+            f"WHERE t.id IN ({placeholders}) AND t.project_id = ?",
+            task_ids + [project_id]
+        )
+        return [Task.from_row(t) for t in cursor.fetchall()]
+
+    # 여러 작업 변경을 한 트랜잭션으로 적용
+    @staticmethod
+    def apply_bulk(creates=(), updates=(), assignments=(), status_changes=()):
+        """검증이 끝난 작업 변경들을 종류별 executemany로 한 트랜잭션에서 적용합니다.
+
+        creates: (project_id, task_name, status, start_ts, end_ts, assignee_id)
+        updates: (task_name 또는 None, start_ts, end_ts, task_id)
+        assignments: (assignee_id, task_id)
+        status_changes: (status, task_id)
+        새로 만든 작업 ID 목록을 creates와 같은 순서로 반환합니다.
+        """
+        # 텍스트 컬럼은 epoch 값에서 만듭니다.
+        creates = [(project_id, task_name, status, timeutil.period_text(start_ts), timeutil.period_text(end_ts),
+                    assignee_id, start_ts, end_ts)
+                   for project_id, task_name, status, start_ts, end_ts, assignee_id in creates]
+        updates = [(task_name, timeutil.period_text(start_ts), timeutil.period_text(end_ts), start_ts, end_ts, task_id)
+                   for task_name, start_ts, end_ts, task_id in updates]
+        assignments, status_changes = list(assignments), list(status_changes)
+
+        def _write(cursor):
+            new_ids = []
+            if creates:
+                cursor.executemany(
+                    "INSERT INTO tasks (project_id, task_name, status, start_date, end_date, assignee_id, start_ts, end_ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    creates
+                )
+                # 쓰기 잠금을 쥔 채 연달아 넣었으므로 ID는 마지막 ID까지 연속입니다.
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                new_ids = list(range(last_id - len(creates) + 1, last_id + 1))
+            if updates:
+                cursor.executemany(
+                    "UPDATE tasks SET task_name = COALESCE(?, task_name), start_date = ?, end_date = ?, "
+                    "start_ts = ?, end_ts = ? WHERE id = ?",
+                    updates
+                )
+            if assignments:
+                cursor.executemany("UPDATE tasks SET assignee_id = ? WHERE id = ?", assignments)
+            if status_changes:
+                cursor.executemany("UPDATE tasks SET status = ? WHERE id = ?", status_changes)
+
+            # 바뀐 작업과 프로젝트의 버전은 한 번씩만 올립니다.
+            task_projects = {new_id: row[0] for new_id, row in zip(new_ids, creates)}
+            changed_ids = list({row[-1] for row in updates + assignments + status_changes})
+            if changed_ids:
+                cursor.executemany(
+                    "UPDATE tasks SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    [(task_id,) for task_id in changed_ids]
+                )
+                placeholders = ', '.join('?' * len(changed_ids))
+                cursor.execute(f"SELECT id, project_id FROM tasks WHERE id IN ({placeholders})", changed_ids)
+                task_projects.update(cursor.fetchall())
+            project_ids = set(task_projects.values())
+            cursor.executemany(
+                "UPDATE projects SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                [(project_id,) for project_id in project_ids]
+            )
+
+            # 작업마다 최종 상태를 한 번씩, 진행률은 프로젝트마다 한 번씩 발행합니다.
+            for task_id in new_ids:
+                _publish_task(cursor, task_projects[task_id], task_id, 'task.created')
+            for task_id in changed_ids:
+                _publish_task(cursor, task_projects[task_id], task_id)
+            if creates or status_changes:
+                for project_id in project_ids:
+                    _publish_progress(cursor, project_id)
+            return new_ids
+        return run_write(_write)
+
+    # 가져오기(importer.py)로 여러 작업을 한 번에 추가
+    @staticmethod
+    def import_rows(project_id, rows):
+        """검증이 끝난 (task_name, status, start_ts, end_ts, assignee_id) 행들을 한 트랜잭션에서 넣고 개수를 반환합니다.
+
+        작업마다 task.created 이벤트를 보내는 대신 묶음마다 resync 한 번과 진행률 이벤트 하나를 보내고,
+        화면은 변경 기록(/changes)에서 새 작업을 받아 갑니다.
+        """
+        # 텍스트 컬럼은 epoch 값에서 만듭니다.
+        rows = [(project_id, task_name, status, timeutil.period_text(start_ts), timeutil.period_text(end_ts),
+                 assignee_id, start_ts, end_ts)
+                for task_name, status, start_ts, end_ts, assignee_id in rows]
+
+        def _write(cursor):
+            cursor.executemany(
+                "INSERT INTO tasks (project_id, task_name, status, start_date, end_date, assignee_id, start_ts, end_ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            _touch_project(cursor, project_id)
+            events.publish(cursor, project_id, 'resync')
+            _publish_progress(cursor, project_id)
+            return len(rows)
+        return run_write(_write)
 
     # 작업에 담당자를 할당
     def assign(self, user_id):
         """작업에 담당자를 할당합니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
+        def _write(cursor):
             cursor.execute(
                 "UPDATE tasks SET assignee_id = ? WHERE id = ?",
                 (user_id, self.id)
             )
-            db.commit()
-        finally:
-            db.close()
+            _touch_task(cursor, self.id)
+            _touch_project(cursor, self.project_id)
+            _publish_task(cursor, self.project_id, self.id)
+        run_write(_write)
 
 # --- Comment 클래스
 class Comment:
-    def __init__(self, id, task_id, user_id, content, created_at, username=None):
+    __slots__ = ('id', 'task_id', 'user_id', 'content', 'created_at', 'created_ts', 'username')
+
+    def __init__(self, id, task_id, user_id, content, created_at, created_ts=None, username=None):
         self.id = id
         self.task_id = task_id
         self.user_id = user_id
         self.content = content
-        self.created_at = created_at
+        self.created_at = created_at # UTC 텍스트 (호환용)
+        self.created_ts = created_ts # UTC epoch 초 (정렬, 커서, 표시는 이 값으로 합니다)
         self.username = username # 댓글 작성자의 이름을 함께 저장하기 위함
 
+    @classmethod
+    def from_row(cls, row):
+        """comments 컬럼을 포함한 행(sqlite3.Row)으로 객체를 만듭니다.
+        username 컬럼은 쿼리에 있을 때만 채웁니다."""
+        columns = row.keys()
+        return cls(id=row['id'], task_id=row['task_id'], user_id=row['user_id'], content=row['content'],
+                   created_at=row['created_at'], created_ts=row['created_ts'],
+                   username=row['username'] if 'username' in columns else None)
+
     @staticmethod
-    def create(task_id, user_id, content, created_at):
-        """새로운 댓글을 DB에 추가합니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
+    def create(task_id, user_id, content, created_ts):
+        """새로운 댓글을 DB에 추가합니다. created_ts는 UTC epoch 초이고, created_at 텍스트는 여기서 만듭니다."""
+        created_at = timeutil.ts_to_utc_text(created_ts)
+
+        def _write(cursor):
             cursor.execute(
-                "INSERT INTO comments (task_id, user_id, content, created_at) VALUES (?, ?, ?, ?)",
-                (task_id, user_id, content, created_at)
+                "INSERT INTO comments (task_id, user_id, content, created_at, created_ts) VALUES (?, ?, ?, ?, ?)",
+                (task_id, user_id, content, created_at, created_ts)
             )
-            db.commit()
-            return cursor.lastrowid # 새로 생성된 댓글의 ID 반환
-        finally:
-            db.close()
+            comment_id = cursor.lastrowid
+            _touch_task(cursor, task_id)
+            _publish_comment(cursor, comment_id)
+            return comment_id # 새로 생성된 댓글의 ID 반환
+        return run_write(_write)
 
     @staticmethod
-    def find_for_task(task_id):
-        """특정 작업에 달린 모든 댓글을 작성자 이름과 함께 가져옵니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            # comments 테이블과 users 테이블을 JOIN하여 사용자 이름을 함께 가져옵니다.
-            cursor.execute("""
-                SELECT c.id, c.task_id, c.user_id, c.content, c.created_at, u.username
-                FROM comments c
-                JOIN users u ON c.user_id = u.id
-                WHERE c.task_id = ?
-                ORDER BY c.created_at ASC
-            """, (task_id,))
-            comments_data = cursor.fetchall()
-            return [Comment(id=c[0], task_id=c[1], user_id=c[2], content=c[3], created_at=c[4], username=c[5]) for c in comments_data]
-        finally:
-            db.close()
+    def find_for_task(task_id, limit=50, before=None, after=None):
+        """특정 작업의 댓글을 작성자 이름과 함께 한 페이지 가져옵니다.
+
+        before/after는 (created_ts, id) 커서입니다. 둘 다 없으면 가장 최근 limit개,
+        before가 있으면 그보다 오래된 limit개, after가 있으면 그보다 새로운 limit개를 가져옵니다.
+        (오래된 순으로 정렬된 댓글 목록, 더 가져올 댓글이 있는지 여부)를 반환합니다.
+        """
+        cursor = _named_cursor()
+        # 다음 페이지가 있는지 알기 위해 하나 더 읽습니다.
+        if after is not None:
+            cursor.execute(COMMENTS_AFTER_SQL, (task_id, after[0], after[1], limit + 1))
+        elif before is not None:
+            cursor.execute(COMMENTS_BEFORE_SQL, (task_id, before[0], before[1], limit + 1))
+        else:
+            cursor.execute(COMMENTS_LATEST_SQL, (task_id, limit + 1))
+        comments_data = cursor.fetchall()
+        has_more = len(comments_data) > limit
+        comments_data = comments_data[:limit]
+        if after is None:
+            comments_data.reverse()
+        return [Comment.from_row(c) for c in comments_data], has_more
+
+    @staticmethod
+    def find_by_ids(comment_ids):
+        """ID 목록에 해당하는 댓글들을 작성자 이름과 함께 가져옵니다."""
+        comment_ids = list(comment_ids)
+        if not comment_ids:
+            return []
+        cursor = _named_cursor()
+        placeholders = ', '.join('?' * len(comment_ids))
+        cursor.execute(_COMMENT_COLUMNS + f" WHERE c.id IN ({placeholders}) ORDER BY c.created_ts, c.id", comment_ids)
+        return [Comment.from_row(c) for c in cursor.fetchall()]
 
     @staticmethod
     def get(comment_id):
         """댓글 ID를 기반으로 댓글 정보를 가져옵니다."""
-        db = get_db()
-        try:
-            cursor = db.cursor()
-            cursor.execute("SELECT * FROM comments WHERE id = ?", (comment_id,))
-            c_data = cursor.fetchone()
-            if not c_data:
-                return None
-            # Comment 객체를 반환하지 않고 간단한 딕셔너리로 반환해도 충분합니다.
-            return {'id': c_data[0], 'task_id': c_data[1], 'user_id': c_data[2]}
-        finally:
-            db.close()
+        cursor = _named_cursor()
+        cursor.execute("SELECT * FROM comments WHERE id = ?", (comment_id,))
+        c_data = cursor.fetchone()
+        if not c_data:
+            return None
+        return Comment.from_row(c_data)
 
     @staticmethod
     def delete(comment_id):
         """댓글 ID를 기반으로 댓글을 삭제합니다."""
+        def _write(cursor):
+            cursor.execute(
+                "UPDATE tasks SET version = version + 1, updated_at = CURRENT_TIMESTAMP "
+                "WHERE id = (SELECT task_id FROM comments WHERE id = ?)",
+                (comment_id,)
+            )
+            row = cursor.execute(
+                "SELECT t.project_id, t.id FROM comments c JOIN tasks t ON t.id = c.task_id WHERE c.id = ?",
+                (comment_id,)
+            ).fetchone()
+            cursor.execute("DELETE FROM comments WHERE id = ?", (comment_id,))
+            if row is not None:
+                events.publish(cursor, row[0], 'comment.removed', task_id=row[1], comment_id=comment_id)
+        run_write(_write)
+
+# --- ChangeLog 클래스 ---
+class ChangeLog:
+    """트리거가 남기는 프로젝트별 변경 기록(change_log)을 읽습니다."""
+
+    @staticmethod
+    def latest_version(project_id):
+        """프로젝트의 마지막 변경 version을 반환합니다. 기록이 없으면 0입니다."""
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(LATEST_CHANGE_SQL, (project_id,))
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def since(project_id, version, limit=500):
+        """version 이후의 변경 기록을 최대 limit개 읽어 (entity, entity_id)마다 마지막 op만 남깁니다.
+
+        ([(entity, entity_id, op), ...], 마지막으로 읽은 version, 더 읽을 기록이 있는지 여부)를 반환합니다.
+        """
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(CHANGES_SINCE_SQL, (project_id, version, limit + 1))
+        rows = cursor.fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        latest = {}
+        for _, entity, entity_id, op in rows:
+            latest.pop((entity, entity_id), None) # 나중 변경이 뒤에 오도록 다시 넣습니다
+            latest[(entity, entity_id)] = op
+        changes = [(entity, entity_id, op) for (entity, entity_id), op in latest.items()]
+        last_version = rows[-1][0] if rows else version
+        return changes, last_version, has_more
+
+# --- 전문 검색 (Search 클래스) ---
+# 강조 구간은 사용자 입력에 나올 일이 없는 사용 영역 밖 문자(U+E000, U+E001)로 표시해 두고,
+# 뷰에서 HTML 이스케이프를 먼저 한 다음 <mark>로 바꿉니다.
+HIGHLIGHT_START, HIGHLIGHT_END = '\ue000', '\ue001'
+
+# 순위(bm25, project_id 열은 가중치 0)는 hits에서 ID와 점수만으로 정하고, 강조 구간(snippet/highlight)과
+# JOIN은 잘린 한 페이지의 행에만 계산합니다. CROSS JOIN은 두 번째 FTS 조회가 rowid로 찾도록 순서를 고정합니다.
+SEARCH_TASKS_SQL = """
+    WITH hits AS (
+        SELECT rowid AS id, bm25(tasks_fts, 1.0, 0.0) AS score
+        FROM tasks_fts
+        WHERE tasks_fts MATCH :match
+        ORDER BY score, id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT t.id, t.project_id, p.project_name, t.task_name, t.status, t.start_date, t.end_date,
+           highlight(tasks_fts, 0, char(57344), char(57345)) AS snippet
+    FROM hits
+    CROSS JOIN tasks_fts ON tasks_fts.rowid = hits.id
+    JOIN tasks t ON t.id = hits.id
+    JOIN projects p ON p.id = t.project_id
+    WHERE tasks_fts MATCH :match
+    ORDER BY hits.score, hits.id
+"""
+
+SEARCH_COMMENTS_SQL = """
+    WITH hits AS (
+        SELECT rowid AS id, bm25(comments_fts, 1.0, 0.0) AS score
+        FROM comments_fts
+        WHERE comments_fts MATCH :match
+        ORDER BY score, id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT c.id, c.task_id, t.task_name, t.project_id, p.project_name, u.username,
+           c.created_ts,
+           snippet(comments_fts, 0, char(57344), char(57345), '…', 16) AS snippet
+    FROM hits
+    CROSS JOIN comments_fts ON comments_fts.rowid = hits.id
+    JOIN comments c ON c.id = hits.id
+    JOIN tasks t ON t.id = c.task_id
+    JOIN projects p ON p.id = t.project_id
+    JOIN users u ON u.id = c.user_id
+    WHERE comments_fts MATCH :match
+    ORDER BY hits.score, hits.id
+"""
+
+class Search:
+    """tasks_fts / comments_fts에서 사용자가 속한 프로젝트의 작업과 댓글을 찾습니다."""
+
+    MAX_TERMS = 8
+
+    @staticmethod
+    def match_expression(text, column, project_ids):
+        """검색어를 FTS5 MATCH 식으로 바꿉니다. 쓸 수 있는 검색어가 없으면 None을 반환합니다.
+
+        낱말마다 큰따옴표로 감싸 사용자가 입력한 AND/OR/NEAR, *, 따옴표 등이 FTS5 문법으로 해석되지 않게 하고,
+        조사가 붙은 한국어 낱말도 찾도록 접두어 검색(*)으로 만듭니다. 모든 낱말이 있어야 일치합니다.
+        한 글자 낱말은 접두어로 찾으면 색인의 너무 많은 토큰을 합쳐야 하므로 그대로 찾습니다.
+        프로젝트 조건도 색인된 project_id 열로 함께 좁힙니다.
+        """
+        terms = [term for term in text.split() if any(ch.isalnum() for ch in term)][:Search.MAX_TERMS]
+        if not terms or not project_ids:
+            return None
+        phrases = ' '.join('"' + term.replace('"', '""') + ('"*' if len(term) > 1 else '"') for term in terms)
+        projects = ' OR '.join(f'"{int(project_id)}"' for project_id in project_ids)
+        return f"{column} : ({phrases}) AND project_id : ({projects})"
+
+    @staticmethod
+    def _run(sql, expression, limit, offset):
+        if expression is None:
+            return [], False
+        cursor = _named_cursor()
+        cursor.execute(sql, {'match': expression, 'limit': limit + 1, 'offset': offset})
+        rows = cursor.fetchall()
+        return rows[:limit], len(rows) > limit
+
+    @staticmethod
+    def tasks(project_ids, text, limit=20, offset=0):
+        """관련도(bm25) 순으로 작업을 찾아 (행 목록, 더 있는지 여부)를 반환합니다."""
+        expression = Search.match_expression(text, 'task_name', project_ids)
+        return Search._run(SEARCH_TASKS_SQL, expression, limit, offset)
+
+    @staticmethod
+    def comments(project_ids, text, limit=20, offset=0):
+        """관련도(bm25) 순으로 댓글을 찾아 (행 목록, 더 있는지 여부)를 반환합니다."""
+        expression = Search.match_expression(text, 'content', project_ids)
+        return Search._run(SEARCH_COMMENTS_SQL, expression, limit, offset)
+
+# --- ProjectSnapshot 클래스 ---
+class ProjectSnapshot:
+    """프로젝트 상세 화면에 필요한 데이터를 한 커넥션에서 정해진 몇 개의 쿼리로 모아 둔 객체입니다.
+
+    프로젝트 정보와 조회자의 역할은 1개 쿼리, 멤버 목록과 작업 목록(담당자 이름 포함)은 각각
+    1개 쿼리로 가져오고, 작업 진행률은 가져온 작업 목록에서 계산합니다.
+    """
+
+    def __init__(self, project, user_role, members, tasks, total_tasks, completed_tasks, change_version=0):
+        self.project = project
+        self.user_role = user_role
+        self.members = members
+        self.tasks = tasks
+        self.total_tasks = total_tasks
+        self.completed_tasks = completed_tasks
+        self.change_version = change_version # 이 스냅샷 이후의 변경은 /changes?since=로 받을 수 있습니다
+
+    # 태스크 진행률
+    @property
+    def task_progress(self):
+        if not self.total_tasks:
+            return 0
+        return round((self.completed_tasks / self.total_tasks) * 100)
+
+    @staticmethod
+    def load(project_id, user_id, include_members=True, include_tasks=True):
+        """프로젝트 스냅샷을 불러옵니다. 프로젝트가 없거나 사용자가 멤버가 아니면 None을 반환합니다.
+
+        차트나 통계처럼 일부만 필요한 곳에서는 include_members / include_tasks로 쿼리를 줄일 수 있습니다.
+        작업 목록을 가져오지 않으면 진행률은 트리거가 관리하는 집계 테이블에서 읽습니다.
+        """
         db = get_db()
+        cursor = db.cursor()
+        named = _named_cursor()
+        named.execute(SNAPSHOT_PROJECT_SQL, (user_id, project_id))
+        row = named.fetchone()
+        if not row:
+            return None
+        project = Project.from_row(row)
+        user_role = row['role']
+
+        members = None
+        if include_members:
+            cursor.execute(MEMBERS_FOR_PROJECT_SQL, (project_id,))
+            members = cursor.fetchall()
+
+        tasks = None
+        change_version = 0
+        if include_tasks:
+            # 작업 목록보다 먼저 읽어, 그 사이의 변경이 다음 동기화에서 빠지지 않게 합니다.
+            cursor.execute(LATEST_CHANGE_SQL, (project_id,))
+            change_version = cursor.fetchone()[0]
+            named.execute(SNAPSHOT_TASKS_SQL, (project_id,))
+            tasks = [Task.from_row(t) for t in named.fetchall()]
+            total_tasks = len(tasks)
+            completed_tasks = sum(1 for task in tasks if task.status == '완료')
+        else:
+            cursor.execute(TASK_COUNTS_SQL, (project_id,))
+            total_tasks, completed_tasks = cursor.fetchone()
+
+        return ProjectSnapshot(project, user_role, members, tasks, total_tasks, completed_tasks, change_version)
+
+# --- ProjectExport 클래스 ---
+# 내보내기용 쿼리. 작업과 댓글을 같은 순서(작업 시작, 종료 시각, 작업 ID)로 읽어 두 커서를 나란히 넘기며
+# 작업 뒤에 그 작업의 댓글을 붙입니다. 두 쿼리 모두 인덱스 순서 그대로 읽으므로 정렬용 임시 B-트리가 없습니다.
+EXPORT_MEMBERS_SQL = """
+    SELECT pm.project_id, pm.user_id, u.username, pm.role
+    FROM project_members pm
+    JOIN users u ON u.id = pm.user_id
+    WHERE pm.project_id = ?
+    ORDER BY pm.user_id ASC
+"""
+
+EXPORT_TASKS_SQL = """
+    SELECT t.id, t.project_id, t.task_name, t.status, t.start_date, t.end_date, t.assignee_id,
+           u.username AS assignee_name
+    FROM tasks t
+    LEFT JOIN users u ON u.id = t.assignee_id
+    WHERE t.project_id = ?
+    ORDER BY t.start_ts ASC, t.end_ts ASC, t.id ASC
+"""
+
+EXPORT_COMMENTS_SQL = """
+    SELECT c.id, c.task_id, c.user_id, u.username, c.content, c.created_at
+    FROM tasks t
+    JOIN comments c ON c.task_id = t.id
+    JOIN users u ON u.id = c.user_id
+    WHERE t.project_id = ?
+    ORDER BY t.start_ts ASC, t.end_ts ASC, t.id ASC, c.created_ts ASC, c.id ASC
+"""
+
+class ProjectExport:
+    """프로젝트 전체(프로젝트, 멤버, 작업, 댓글)를 일정한 메모리로 한 레코드씩 읽습니다."""
+
+    @staticmethod
+    def _fetch(cursor, batch_size):
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    @staticmethod
+    def records(project_id, batch_size=500):
+        """('project' | 'member' | 'task' | 'comment', sqlite3.Row)를 차례로 내보내는 제너레이터입니다.
+
+        작업마다 바로 뒤에 그 작업의 댓글이 옵니다. 모두 한 읽기 트랜잭션에서 읽으므로
+        내보내는 도중에 작업이 추가/삭제되어도 한 시점의 일관된 내용이 나옵니다.
+        프로젝트가 없으면 아무것도 내보내지 않습니다.
+        """
+        db = get_db()
+        own_transaction = not db.in_transaction
+        if own_transaction:
+            db.execute("BEGIN")
         try:
-            cursor = db.cursor()
-            cursor.execute("DELETE FROM comments WHERE id = ?", (comment_id,))
-            db.commit()
+            named = _named_cursor()
+            named.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
+            project = named.fetchone()
+            if project is None:
+                return
+            yield 'project', project
+
+            named.execute(EXPORT_MEMBERS_SQL, (project_id,))
+            for row in named.fetchall():
+                yield 'member', row
+
+            tasks = _named_cursor()
+            tasks.execute(EXPORT_TASKS_SQL, (project_id,))
+            comments = _named_cursor()
+            comments.execute(EXPORT_COMMENTS_SQL, (project_id,))
+            comment_rows = ProjectExport._fetch(comments, batch_size)
+            comment = next(comment_rows, None)
+            for task in ProjectExport._fetch(tasks, batch_size):
+                yield 'task', task
+                while comment is not None and comment['task_id'] == task['id']:
+                    yield 'comment', comment
+                    comment = next(comment_rows, None)
         finally:
-            db.close()
\ No newline at end of file
+            if own_transaction:
+                db.rollback()   # 읽기만 했으므로 스냅샷을 놓기만 합니다.
+
+# --- 실행 계획 검사 대상 ---
+# {이름: (SQL, 예시 파라미터)}. 여기 등록된 쿼리의 실행 계획에 전체 테이블 스캔이 있으면
+# `flask check-query-plans`가 실패합니다.
+HOT_QUERIES = {
+    'Project.find_for_user': (PROJECTS_FOR_USER_SQL, (1,)),
+    'Project.memberships': (MEMBERSHIPS_FOR_USER_SQL, (1,)),
+    'Project.get_members': (MEMBERS_FOR_PROJECT_SQL, (1,)),
+    'Task.find_for_project': (TASKS_FOR_PROJECT_SQL, (1,)),
+    'Task.find_for_assignee': (TASKS_FOR_ASSIGNEE_SQL, (1,)),
+    'Project.page_for_user': (PROJECTS_PAGE_FOR_USER_SQL, (1, 0, 31)),
+    'Task.page_for_assignee': (tasks_page_for_assignee_sql(True, True, True),
+                               (1, 1735657200, 1, '대기', 1735657200, 1738335600, 31)),
+    'Task.page_for_assignee (after NULL)': (tasks_page_for_assignee_sql(True, after_null=True), (1, 1, 31)),
+    'Comment.find_for_task (latest)': (COMMENTS_LATEST_SQL, (1, 51)),
+    'Comment.find_for_task (before)': (COMMENTS_BEFORE_SQL, (1, 1735689600, 1, 51)),
+    'Comment.find_for_task (after)': (COMMENTS_AFTER_SQL, (1, 1735689600, 1, 51)),
+    'ProjectSnapshot.load (project)': (SNAPSHOT_PROJECT_SQL, (1, 1)),
+    'ProjectSnapshot.load (tasks)': (SNAPSHOT_TASKS_SQL, (1,)),
+    'ProjectSnapshot.load (counts)': (TASK_COUNTS_SQL, (1,)),
+    'Task.in_window': (GANTT_TASKS_SQL, (1, 1738335600, 1735657200, 1735657200, 1735700000, 5, 201)),
+    'Task.swimlanes': (GANTT_LANES_SQL, (1, 1738335600, 1735657200)),
+    'ChangeLog.since': (CHANGES_SINCE_SQL, (1, 0, 501)),
+    'ChangeLog.latest_version': (LATEST_CHANGE_SQL, (1,)),
+    'ProjectExport.records (members)': (EXPORT_MEMBERS_SQL, (1,)),
+    'ProjectExport.records (tasks)': (EXPORT_TASKS_SQL, (1,)),
+    'ProjectExport.records (comments)': (EXPORT_COMMENTS_SQL, (1,)),
+    'Search.tasks': (SEARCH_TASKS_SQL, {'match': 'task_name : ("회의"*) AND project_id : ("1" OR "2")',
+                                        'limit': 21, 'offset': 0}),
+    'Search.comments': (SEARCH_COMMENTS_SQL, {'match': 'content : ("회의"*) AND project_id : ("1" OR "2")',
+                                              'limit': 21, 'offset': 0}),
+}
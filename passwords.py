@@ -0,0 +1,146 @@
+# passwords.py
+"""비밀번호 해시 계산을 요청 스레드 밖의 프로세스 풀에서 실행합니다.
+
+scrypt/PBKDF2는 일부러 느리게 만든 계산이라 로그인이 몰리면 요청 스레드가 모두 해시 계산에
+묶입니다. 계산은 PASSWORD_HASH_WORKERS개의 프로세스에서 하고, 처리 중이거나 기다리는 작업이
+PASSWORD_HASH_MAX_PENDING개를 넘으면 기다리지 않고 바로 Overloaded를 발생시킵니다(뷰에서 503).
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class Overloaded(Exception):
+    """해시 작업이 너무 많이 밀려 있어 요청을 받지 않습니다."""
+
+
+class PasswordHasher:
+    """크기가 제한된 프로세스 풀에서 비밀번호를 해시하고 검증합니다.
+
+    method는 werkzeug의 generate_password_hash에 넘기는 문자열입니다.
+    (예: 'scrypt', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000')
+    workers가 0이면 풀 없이 호출한 스레드에서 바로 계산합니다.
+    """
+
+    def __init__(self, method='scrypt', workers=2, max_pending=16, timeout=5.0):
+        self.method = method
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._prefix = None   # method로 만든 해시의 앞부분 (예: 'scrypt:32768:8:1')
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._rejected = 0
+
+    def configure(self, method=None, workers=None, max_pending=None, timeout=None):
+        """설정을 바꿉니다. 실행 중인 프로세스 풀은 정리하고 다음 작업 때 새로 만듭니다."""
+        with self._lock:
+            if method is not None and method != self.method:
+                self.method = method
+                self._prefix = None
+            if workers is not None:
+                self.workers = workers
+            if max_pending is not None:
+                self.max_pending = max_pending
+                self._slots = threading.BoundedSemaphore(max_pending)
+            if timeout is not None:
+                self.timeout = timeout
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # 앱에는 쓰기 스레드, 이벤트 중계 스레드 등이 떠 있으므로 fork 대신 spawn으로 띄웁니다.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        """fn을 프로세스 풀에서 실행하고 결과를 기다립니다.
+
+        요청 스레드는 결과가 나올 때까지 최대 timeout초 동안 막힙니다. 시간이 지나면 Overloaded를
+        발생시키지만 이미 시작된 계산은 멈출 수 없으므로, 자리(slot)는 계산이 실제로 끝났을 때 돌려줍니다.
+        """
+        if self.workers <= 0:
+            return fn(*args)
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise Overloaded()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # 취소되었거나 끝난 작업만 자리를 비우므로 밀린 작업 수가 max_pending을 넘지 않습니다.
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self._rejected += 1
+            raise Overloaded()
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def hash(self, password):
+        """설정된 방식으로 비밀번호 해시를 만듭니다."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """비밀번호가 해시와 일치하는지 확인합니다."""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """저장된 해시가 지금 설정과 다른 방식/비용으로 만들어졌는지 확인합니다."""
+        if self._prefix is None:
+            # 'scrypt'처럼 인자를 생략한 설정도 기본값이 채워진 형태로 비교하도록 한 번 만들어 봅니다.
+            self._prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._prefix
+
+    def stats(self):
+        """풀 설정과 처리/거절 건수를 반환합니다."""
+        with self._lock:
+            return {
+                'method': self.method,
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'completed_total': self._completed,
+                'rejected_total': self._rejected,
+            }
+
+
+hasher = PasswordHasher()
+
+def init_app(app):
+    """앱 설정(PASSWORD_HASH_*)으로 해시 방식과 프로세스 풀 크기를 정합니다."""
+    hasher.configure(
+        method=app.config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+        workers=app.config.get('PASSWORD_HASH_WORKERS', 2),
+        max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING', 16),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 5.0),
+    )
+
+def hash_password(password):
+    return hasher.hash(password)
+
+def verify_password(password_hash, password):
+    return hasher.verify(password_hash, password)
+
+def needs_rehash(password_hash):
+    return hasher.needs_rehash(password_hash)
+
+def stats():
+    return hasher.stats()
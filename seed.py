@@ -0,0 +1,115 @@
+# seed.py
+"""성능 측정용 합성 데이터를 planner.db에 채웁니다. (`flask seed-db`)
+
+사용자 → 프로젝트 → 멤버 → 작업 → 댓글 순서로 테이블마다 executemany로 넣고,
+한 트랜잭션이 쓰기 잠금을 너무 오래 잡지 않도록 chunk_size 행씩 나눠 커밋합니다.
+트리거(작업 수 집계, 멤버십 버전, 변경 기록)는 평소처럼 함께 갱신됩니다.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import timeutil
+from database import get_db, run_write
+
+TASK_STATUSES = ('대기', '진행 중', '완료')
+TASK_WORDS = ('설계', '구현', '검토', '테스트', '배포', '문서화', '회의', '리팩터링', '조사', '디자인')
+COMMENT_WORDS = ('확인했습니다.', '일정 조정이 필요합니다.', '리뷰 부탁드립니다.', '완료했습니다.',
+                 '내일까지 처리하겠습니다.', '관련 자료를 첨부합니다.', '이슈가 있습니다.')
+
+def _insert_chunked(sql, rows, chunk_size):
+    """rows를 chunk_size개씩 나눠 트랜잭션마다 executemany로 넣고, 새 ID 목록을 순서대로 반환합니다."""
+    ids = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+
+        def _write(cursor):
+            cursor.executemany(sql, chunk)
+            # 쓰기 잠금을 쥔 채 연달아 넣었으므로 ID는 마지막 ID까지 연속입니다.
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            return list(range(last_id - len(chunk) + 1, last_id + 1))
+        ids.extend(run_write(_write))
+    return ids
+
+def _fmt(moment):
+    """기본 시간대의 시각을 (ISO 텍스트, UTC epoch 초)로 바꿉니다."""
+    return moment.strftime('%Y-%m-%dT%H:%M'), int(moment.timestamp())
+
+def seed_database(password_hash, users=100, projects=20, members=8, tasks=100, comments=3,
+                  prefix='bench', seed=None, chunk_size=5000, log=print):
+    """합성 데이터를 넣고 테이블별로 넣은 행 수를 반환합니다.
+
+    users명의 사용자(이름: {prefix}00001 ...)가 모두 password_hash를 비밀번호로 씁니다.
+    프로젝트 i는 i번째 사용자(순환)가 만들어 팀장이 되고, 그 밖에 members-1명이 팀원으로 참여합니다.
+    프로젝트마다 tasks개의 작업이 있고, 작업마다 평균 comments개의 댓글이 달립니다.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timeutil.default_zone()).replace(second=0, microsecond=0)
+    now_ts = timeutil.now_ts()
+
+    # 같은 prefix로 다시 실행해도 이름이 겹치지 않도록 이어서 번호를 매깁니다.
+    offset = get_db().execute(
+        "SELECT COUNT(*) FROM users WHERE username LIKE ? || '%'", (prefix,)
+    ).fetchone()[0]
+    user_rows = [(f"{prefix}{offset + i + 1:05d}", password_hash, '팀원') for i in range(users)]
+    user_ids = _insert_chunked(
+        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)", user_rows, chunk_size)
+    log(f"사용자 {len(user_ids)}명 ({user_rows[0][0]} ~ {user_rows[-1][0]})" if user_ids else "사용자 0명")
+    if not user_ids:
+        return {'users': 0, 'projects': 0, 'members': 0, 'tasks': 0, 'comments': 0}
+
+    project_rows, periods = [], []
+    for i in range(projects):
+        start = now - timedelta(days=rng.randint(0, 180))
+        end = start + timedelta(days=rng.randint(30, 240))
+        periods.append((start, end))
+        (start_date, start_ts), (end_date, end_ts) = _fmt(start), _fmt(end)
+        project_rows.append((f"{prefix} 프로젝트 {i + 1}", user_ids[i % len(user_ids)],
+                             start_date, end_date, start_ts, end_ts))
+    project_ids = _insert_chunked(
+        "INSERT INTO projects (project_name, created_by, start_date, end_date, start_ts, end_ts) VALUES (?, ?, ?, ?, ?, ?)",
+        project_rows, chunk_size)
+
+    member_rows, project_members = [], {}
+    for project_id, (_, owner_id, *_) in zip(project_ids, project_rows):
+        others = [user_id for user_id in rng.sample(user_ids, min(members, len(user_ids))) if user_id != owner_id]
+        team = [owner_id] + others[:max(members - 1, 0)]
+        project_members[project_id] = team
+        member_rows.append((project_id, owner_id, '팀장'))
+        member_rows.extend((project_id, user_id, '팀원') for user_id in team[1:])
+    _insert_chunked("INSERT INTO project_members (project_id, user_id, role) VALUES (?, ?, ?)",
+                    member_rows, chunk_size)
+    log(f"프로젝트 {len(project_ids)}개, 멤버 {len(member_rows)}명")
+
+    task_rows = []
+    for project_id, (start, end) in zip(project_ids, periods):
+        span_days = max((end - start).days, 1)
+        team = project_members[project_id]
+        for _ in range(tasks):
+            task_start = start + timedelta(days=rng.randint(0, span_days - 1), hours=rng.choice((9, 10, 13, 14)))
+            task_end = task_start + timedelta(days=rng.randint(1, 21))
+            assignee_id = rng.choice(team) if rng.random() < 0.8 else None
+            (start_date, start_ts), (end_date, end_ts) = _fmt(task_start), _fmt(task_end)
+            task_rows.append((project_id, f"{rng.choice(TASK_WORDS)} {rng.randint(1, 999)}",
+                              rng.choice(TASK_STATUSES), start_date, end_date, assignee_id, start_ts, end_ts))
+    task_ids = _insert_chunked(
+        "INSERT INTO tasks (project_id, task_name, status, start_date, end_date, assignee_id, start_ts, end_ts) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        task_rows, chunk_size)
+    log(f"작업 {len(task_ids)}개")
+
+    comment_rows = []
+    for task_id, task_row in zip(task_ids, task_rows):
+        team = project_members[task_row[0]]
+        for _ in range(rng.randint(0, comments * 2)):
+            # 댓글 시간은 UTC epoch 초와 UTC 텍스트로 함께 저장합니다. (add_comment와 같은 형식)
+            created_ts = now_ts - 60 * rng.randint(0, 60 * 24 * 90)
+            comment_rows.append((task_id, rng.choice(team), rng.choice(COMMENT_WORDS),
+                                 timeutil.ts_to_utc_text(created_ts), created_ts))
+    comment_ids = _insert_chunked(
+        "INSERT INTO comments (task_id, user_id, content, created_at, created_ts) VALUES (?, ?, ?, ?, ?)",
+        comment_rows, chunk_size)
+    log(f"댓글 {len(comment_ids)}개")
+
+    return {'users': len(user_ids), 'projects': len(project_ids), 'members': len(member_rows),
+            'tasks': len(task_ids), 'comments': len(comment_ids)}
@@ -0,0 +1,195 @@
+# slow_queries.py
+"""models.py에서 실행한 SQL 중 느린 것을 회전 로그 파일에 JSON 한 줄씩 남깁니다.
+
+metrics.InstrumentedCursor가 문장 하나의 execute + fetch 시간 합계가 SLOW_QUERY_THRESHOLD_MS를
+넘은 순간 record()를 부릅니다. 기록에는 정규화한 SQL, 인자 모양(값은 남기지 않습니다), 호출한 모델 메서드,
+라우트, EXPLAIN QUERY PLAN 결과가 들어갑니다. `flask slow-queries`로 가장 오래 걸린 쿼리를 모아 봅니다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from flask import has_request_context, request
+
+import metrics
+import migrations
+
+logger = logging.getLogger('planner.slow_queries')
+logger.propagate = False
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_MODELS_FILE = os.path.join(_HERE, 'models.py')
+# 커넥션 설정(PRAGMA)과 WAL 체크포인트처럼 database.py가 직접 실행한 문장은 모델 쿼리가 아닙니다.
+_DATABASE_FILE = os.path.join(_HERE, 'database.py')
+# 측정 경로(InstrumentedCursor -> record)의 프레임은 실행한 쪽을 찾을 때 건너뜁니다.
+_INSTRUMENT_FILES = (os.path.join(_HERE, 'metrics.py'), os.path.abspath(__file__))
+_PLAN_TTL = 60.0   # 같은 문장의 실행 계획은 이 시간(초) 동안 다시 구하지 않습니다.
+
+_plans = {}   # statement -> (만료 시각, 실행 계획)
+_plans_lock = threading.Lock()
+_threshold_ms = None
+
+
+def _model_caller():
+    """호출 스택에서 이 문장을 실행하게 한 모델 메서드 이름을 찾습니다. (예: 'Task.find_for_assignee')
+
+    _named_cursor, _touch_task 같은 밑줄로 시작하는 도우미는 건너뛰고 바깥의 Class.method까지 올라갑니다.
+    database.py가 직접 실행한 문장이거나 models.py를 거치지 않은 문장이면 None입니다.
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in _INSTRUMENT_FILES:
+        frame = frame.f_back
+    if frame is None or frame.f_code.co_filename == _DATABASE_FILE:
+        return None
+
+    nearest = None
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == _MODELS_FILE:
+            # run_write에 넘긴 내부 함수(Task.create.<locals>._write)는 바깥 메서드 이름으로 남깁니다.
+            name = code.co_qualname.split('.<locals>', 1)[0]
+            if '.' in name and not name.rsplit('.', 1)[1].startswith('_'):
+                return name
+            nearest = nearest or name
+        frame = frame.f_back
+    # 도우미만 있으면(예: 모델 밖에서 직접 부른 경우) 가장 가까운 이름을 남깁니다.
+    return nearest
+
+def _shape(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+def parameter_shapes(parameters, many=False):
+    """바인딩 인자의 타입과 길이만 남깁니다. executemany는 행 수와 첫 행의 모양을 남깁니다."""
+    if many:
+        rows = parameters if isinstance(parameters, (list, tuple)) else []
+        return {'rows': len(rows), 'first': parameter_shapes(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: _shape(value) for name, value in parameters.items()}
+    return [_shape(value) for value in parameters]
+
+def explain(conn, sql, parameters, statement):
+    """EXPLAIN QUERY PLAN의 detail 목록을 반환합니다. 잠시 캐시해 같은 문장을 반복해서 분석하지 않습니다."""
+    now = time.monotonic()
+    with _plans_lock:
+        cached = _plans.get(statement)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    try:
+        # 측정하지 않는 기본 커서로 실행해 이 쿼리 자체가 측정값과 느린 쿼리 기록에 섞이지 않게 합니다.
+        cursor = conn.cursor(sqlite3.Cursor)
+        plan = [row[3] for row in cursor.execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()]
+    except sqlite3.Error as e:
+        plan = [f"(실행 계획을 구하지 못했습니다: {e})"]
+    with _plans_lock:
+        if len(_plans) >= 1024:
+            _plans.clear()
+        _plans[statement] = (now + _PLAN_TTL, plan)
+    return plan
+
+def is_full_scan(plan):
+    """migrations.find_full_scans와 같은 기준으로 전체 테이블 스캔이 있는지 봅니다."""
+    return bool(migrations.full_scan_steps(plan))
+
+def record(conn, sql, parameters, elapsed, many):
+    """metrics가 부르는 느린 쿼리 처리기입니다. models.py에서 실행한 문장만 기록합니다."""
+    caller = _model_caller()
+    if caller is None:
+        return
+    statement = metrics.registry.statement(sql)
+    if many:
+        rows = parameters if isinstance(parameters, (list, tuple)) else []
+        plan = explain(conn, sql, rows[0], statement) if rows else []
+    else:
+        plan = explain(conn, sql, parameters, statement)
+    entry = {
+        'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'duration_ms': round(elapsed * 1000, 3),
+        'threshold_ms': _threshold_ms,
+        'statement': statement,
+        'caller': caller,
+        'route': metrics._current_route(),
+        'method': request.method if has_request_context() else None,
+        'many': many,
+        'params': parameter_shapes(parameters, many),
+        'plan': plan,
+        'full_scan': is_full_scan(plan),
+    }
+    logger.warning(json.dumps(entry, ensure_ascii=False))
+
+def init_app(app):
+    """SLOW_QUERY_* 설정으로 로그 파일을 열고 metrics에 처리기를 등록합니다."""
+    global _threshold_ms
+    _threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS', 100)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    if _threshold_ms is None:
+        metrics.set_slow_query_handler(None, None)
+        return
+    handler = RotatingFileHandler(
+        app.config.get('SLOW_QUERY_LOG', 'slow_queries.log'),
+        maxBytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024),
+        backupCount=app.config.get('SLOW_QUERY_LOG_BACKUPS', 3),
+        encoding='utf-8',
+        delay=True,
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING)
+    metrics.set_slow_query_handler(_threshold_ms / 1000, record)
+
+
+# --- 보고서 (flask slow-queries) ---
+def read_log(path, backups):
+    """회전된 파일(path.N ... path.1)부터 현재 파일까지 오래된 순서로 기록을 읽습니다."""
+    paths = [f"{path}.{n}" for n in range(backups, 0, -1)] + [path]
+    for name in paths:
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue   # 회전 도중 잘린 줄
+
+def summarize(entries, top=10):
+    """(호출 메서드, 문장)별로 횟수, 합계, p95, 최대 시간을 모아 합계가 큰 순서로 top개를 반환합니다."""
+    groups = {}
+    for entry in entries:
+        key = (entry.get('caller'), entry.get('statement'))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {'caller': key[0], 'statement': key[1], 'durations': [], 'routes': set()}
+        group['durations'].append(entry.get('duration_ms', 0.0))
+        group['routes'].add(entry.get('route'))
+        # 실행 계획은 가장 최근 기록의 것을 보여 줍니다.
+        group['plan'] = entry.get('plan', [])
+        group['full_scan'] = entry.get('full_scan', False)
+        group['last_seen'] = entry.get('ts')
+
+    report = []
+    for group in groups.values():
+        durations = sorted(group.pop('durations'))
+        rank = max(int(len(durations) * 0.95 + 0.999999) - 1, 0)   # nearest-rank
+        group.update({
+            'count': len(durations),
+            'total_ms': round(sum(durations), 3),
+            'p95_ms': durations[rank],
+            'max_ms': durations[-1],
+            'routes': sorted(route for route in group['routes'] if route),
+        })
+        report.append(group)
+    report.sort(key=lambda group: group['total_ms'], reverse=True)
+    return report[:top]
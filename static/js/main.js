@@ -4,6 +4,8 @@ import { initializeCountdown } from './modules/countdown.js';
 import { drawChart } from './modules/gantt.js';
 import { setupProjectEventHandlers } from './modules/projectHandler.js';
 import { setupTaskListEventHandlers } from './modules/taskHandler.js';
+import { setupDashboard } from './modules/dashboard.js';
+import { connectProjectEvents } from './modules/events.js';
 
 // --- 페이지가 로드되면 모든 기능을 초기화합니다 ---
 document.addEventListener('DOMContentLoaded', () => {
@@ -16,9 +18,11 @@ document.addEventListener('DOMContentLoaded', () => {
         drawChart();
         setupProjectEventHandlers();
         setupTaskListEventHandlers();
+        connectProjectEvents();
     } 
     // 대시보드 페이지에서만 실행될 기능들
-    else if (document.getElementById('create-project-form')) {
-        // (projectHandler.js에서 관련 이벤트 리스너를 가져와 설정할 수 있습니다)
+    else if (document.getElementById('dashboard-project-list')) {
+        setupProjectEventHandlers(); // '새 프로젝트 생성' 버튼
+        setupDashboard();
     }
 });
\ No newline at end of file
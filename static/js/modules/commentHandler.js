@@ -1,46 +1,128 @@
 // static/js/modules/commentHandler.js (수정 후 전체 코드)
+import { fetchJSONWithValidators, formatTimestamp } from './utils.js';
+import { isLive } from './events.js';
 
 // -----------------------------------------------------------------------------
 // 1. 다른 모듈에서 사용할 수 있도록 모든 함수를 내보냅니다(export).
 // -----------------------------------------------------------------------------
 
+// 한 번에 불러올 댓글 수
+const COMMENT_PAGE_SIZE = 50;
+
 /**
- * 특정 작업에 대한 댓글 목록을 서버에서 불러와 화면에 표시합니다.
+ * 댓글 하나를 목록 항목(li)으로 만듭니다.
  */
-export function loadComments(taskId, commentListElement) {
+function renderComment(comment) {
     const currentUser = document.querySelector('[data-current-user]').dataset.currentUser;
     const currentUserRole = document.querySelector('[data-user-role]').dataset.userRole;
 
-    fetch(`/api/task/${taskId}/comments`)
-        .then(response => response.json())
-        .then(comments => {
+    const li = document.createElement('li');
+    li.dataset.commentId = comment.id;
+    let editControls = '';
+    // 현재 사용자가 댓글 작성자이거나 팀장일 경우 컨트롤 버튼 추가
+    if (currentUser === comment.username || currentUserRole === '팀장') {
+        editControls = `
+            <button class="edit-comment-btn">수정</button>
+            <button class="delete-comment-btn" data-comment-id="${comment.id}">삭제</button>
+        `;
+    }
+    li.innerHTML = `
+        <div class="comment-view-mode">
+            <span><strong>${comment.username}</strong>: <span class="comment-content">${comment.content}</span> <small>(${comment.created_ts != null ? formatTimestamp(comment.created_ts) : comment.created_at})</small></span>
+            <span>${editControls}</span>
+        </div>
+        <form class="edit-comment-form" data-comment-id="${comment.id}" style="display: none;">
+            <input type="text" name="content" value="${comment.content}" required>
+            <button type="submit">저장</button>
+            <button type="button" class="cancel-edit-comment-btn">취소</button>
+        </form>
+    `;
+    return li;
+}
+
+/**
+ * 댓글을 목록 아래쪽에 붙입니다. 이미 표시된 댓글(실시간 이벤트로 먼저 받은 경우 등)은 건너뜁니다.
+ */
+function appendComment(commentListElement, comment) {
+    if (commentListElement.querySelector(`li[data-comment-id="${comment.id}"]`)) return;
+    const noCommentLi = commentListElement.querySelector('.no-comments');
+    if (noCommentLi) {
+        noCommentLi.remove();
+    }
+    commentListElement.appendChild(renderComment(comment));
+}
+
+/**
+ * '이전 댓글 더보기' 버튼을 목록 맨 위에 표시하거나 제거합니다.
+ */
+function updateLoadOlderButton(taskId, commentListElement, olderCursor) {
+    const existing = commentListElement.querySelector('.load-older-comments');
+    if (existing) existing.remove();
+    if (!olderCursor) return;
+
+    const li = document.createElement('li');
+    li.className = 'load-older-comments';
+    const button = document.createElement('button');
+    button.type = 'button';
+    button.className = 'secondary outline';
+    button.textContent = '이전 댓글 더보기';
+    button.addEventListener('click', () => loadOlderComments(taskId, commentListElement, olderCursor));
+    li.appendChild(button);
+    commentListElement.prepend(li);
+}
+
+/**
+ * 특정 작업의 최근 댓글 한 페이지를 서버에서 불러와 화면에 표시합니다.
+ */
+export function loadComments(taskId, commentListElement) {
+    // 댓글이 바뀌지 않았으면 서버는 304로 응답하고, 보관해 둔 목록을 사용합니다.
+    fetchJSONWithValidators(`/api/task/${taskId}/comments?limit=${COMMENT_PAGE_SIZE}`)
+        .then(page => {
             commentListElement.innerHTML = ''; // 기존 목록 비우기
-            if (comments.length === 0) {
-                commentListElement.innerHTML = '<li>작성된 댓글이 없습니다.</li>';
-            } else {
-                comments.forEach(comment => {
-                    const li = document.createElement('li');
-                    let editControls = '';
-                    // 현재 사용자가 댓글 작성자이거나 팀장일 경우 컨트롤 버튼 추가
-                    if (currentUser === comment.username || currentUserRole === '팀장') {
-                        editControls = `
-                            <button class="edit-comment-btn">수정</button>
-                            <button class="delete-comment-btn" data-comment-id="${comment.id}">삭제</button>
-                        `;
-                    }
-                    li.innerHTML = `
-                        <div class="comment-view-mode">
-                            <span><strong>${comment.username}</strong>: <span class="comment-content">${comment.content}</span> <small>(${comment.created_at})</small></span>
-                            <span>${editControls}</span>
-                        </div>
-                        <form class="edit-comment-form" data-comment-id="${comment.id}" style="display: none;">
-                            <input type="text" name="content" value="${comment.content}" required>
-                            <button type="submit">저장</button>
-                            <button type="button" class="cancel-edit-comment-btn">취소</button>
-                        </form>
-                    `;
-                    commentListElement.appendChild(li);
-                });
+            commentListElement.dataset.newerCursor = page.newer_cursor || '';
+            if (page.comments.length === 0) {
+                commentListElement.innerHTML = '<li class="no-comments">작성된 댓글이 없습니다.</li>';
+                return;
+            }
+            page.comments.forEach(comment => commentListElement.appendChild(renderComment(comment)));
+            updateLoadOlderButton(taskId, commentListElement, page.older_cursor);
+        });
+}
+
+/**
+ * 커서보다 오래된 댓글 한 페이지를 불러와 목록 위쪽에 붙입니다.
+ */
+function loadOlderComments(taskId, commentListElement, olderCursor) {
+    fetch(`/api/task/${taskId}/comments?limit=${COMMENT_PAGE_SIZE}&before=${encodeURIComponent(olderCursor)}`)
+        .then(response => response.json())
+        .then(page => {
+            const firstComment = commentListElement.querySelector('.load-older-comments + li');
+            page.comments.forEach(comment => {
+                commentListElement.insertBefore(renderComment(comment), firstComment);
+            });
+            updateLoadOlderButton(taskId, commentListElement, page.older_cursor);
+        });
+}
+
+/**
+ * 마지막으로 받은 댓글 이후에 새로 달린 댓글만 불러와 목록 아래쪽에 붙입니다.
+ */
+export function loadNewerComments(taskId, commentListElement) {
+    const newerCursor = commentListElement.dataset.newerCursor;
+    if (!newerCursor) {
+        // 아직 댓글이 하나도 없었다면 처음부터 다시 불러옵니다.
+        loadComments(taskId, commentListElement);
+        return;
+    }
+
+    fetch(`/api/task/${taskId}/comments?limit=${COMMENT_PAGE_SIZE}&after=${encodeURIComponent(newerCursor)}`)
+        .then(response => response.json())
+        .then(page => {
+            page.comments.forEach(comment => appendComment(commentListElement, comment));
+            commentListElement.dataset.newerCursor = page.newer_cursor || newerCursor;
+            // 한 번에 다 받지 못했으면 이어서 가져옵니다.
+            if (page.has_newer) {
+                loadNewerComments(taskId, commentListElement);
             }
         });
 }
@@ -58,13 +140,12 @@ export function addComment(form) {
         .then(data => {
             if (data.success) {
                 const commentListElement = form.closest('.comment-section').querySelector('.comment-list');
-                const noCommentLi = commentListElement.querySelector('li');
-                if (noCommentLi && noCommentLi.innerText.includes('없습니다')) {
-                    noCommentLi.remove();
+
+                // 실시간 이벤트를 받고 있으면 이벤트가 댓글을 붙이고,
+                // 아니면 마지막으로 받은 댓글 이후의 댓글만 가져옵니다.
+                if (!isLive()) {
+                    loadNewerComments(taskId, commentListElement);
                 }
-                
-                // loadComments를 다시 호출하여 목록을 새로고침하는 것이 가장 간단하고 확실합니다.
-                loadComments(taskId, commentListElement);
                 contentInput.value = '';
             } else {
                 alert('댓글 작성 실패: ' + data.message);
@@ -117,4 +198,26 @@ export function toggleCommentEditMode(commentLi, isEdit) {
         viewMode.style.display = isEdit ? 'none' : '';
         editForm.style.display = isEdit ? 'flex' : 'none';
     }
-}
\ No newline at end of file
+}
+
+// --- 실시간 이벤트 반영 (events.js에서 호출) ---
+
+/**
+ * comment.added: 댓글 목록을 이미 불러온 작업이면 새 댓글을 붙입니다.
+ * (아직 펼친 적 없는 작업은 펼칠 때 불러오므로 건너뜁니다)
+ */
+export function applyCommentAdded(taskId, comment) {
+    const commentListElement = document.querySelector(`.task-details[data-task-id="${taskId}"] .comment-list`);
+    if (!commentListElement || !('newerCursor' in commentListElement.dataset)) return;
+    appendComment(commentListElement, comment);
+}
+
+/**
+ * comment.removed: 화면에 있는 댓글을 지웁니다.
+ */
+export function applyCommentRemoved(commentId) {
+    const commentLi = document.querySelector(`.comment-list li[data-comment-id="${commentId}"]`);
+    if (commentLi) {
+        commentLi.remove();
+    }
+}
@@ -11,11 +11,11 @@ export function initializeCountdown() {
 
     function updateCountdown() {
         // 3. data- 속성에서 날짜 값을 '매번 새로' 읽어옵니다.
-        const startDateString = countdownElement.dataset.startDate;
-        const endDateString = countdownElement.dataset.endDate;
-        
-        const startDate = new Date(startDateString);
-        const endDate = new Date(endDateString);
+        // 서버가 준 epoch 초(start_ts/end_ts)가 있으면 시간대와 관계없이 정확한 시각을 씁니다.
+        const { startDate: startDateString, endDate: endDateString, startTs, endTs } = countdownElement.dataset;
+
+        const startDate = startTs ? new Date(Number(startTs) * 1000) : new Date(startDateString);
+        const endDate = endTs ? new Date(Number(endTs) * 1000) : new Date(endDateString);
         const now = new Date();
 
         let targetDate;
@@ -0,0 +1,107 @@
+// static/js/modules/dashboard.js
+
+// 한 번에 불러올 항목 수 (서버의 DASHBOARD_PAGE_SIZE와 같습니다)
+const PAGE_SIZE = 30;
+
+/**
+ * 대시보드의 프로젝트/작업 목록에 무한 스크롤과 작업 필터를 설정합니다.
+ * 첫 페이지는 서버에서 렌더링되어 있고, 목록 끝이 화면에 보이면 다음 페이지를 불러옵니다.
+ */
+export function setupDashboard() {
+    setupInfiniteList('dashboard-project-list', '/api/dashboard/projects', renderProjectItem);
+
+    const filterForm = document.getElementById('task-filter-form');
+    const taskList = setupInfiniteList('dashboard-task-list', '/api/dashboard/tasks', renderTaskItem,
+        () => filterForm ? Object.fromEntries(new FormData(filterForm)) : {});
+
+    if (filterForm && taskList) {
+        // 필터가 바뀌면 첫 페이지부터 다시 불러옵니다. (필터는 서버의 SQL에서 적용됩니다)
+        filterForm.addEventListener('change', () => taskList.reset());
+        filterForm.addEventListener('submit', event => event.preventDefault());
+    }
+}
+
+function renderProjectItem(project) {
+    const li = document.createElement('li');
+    const link = document.createElement('a');
+    link.href = project.url;
+    link.textContent = project.project_name;
+    li.appendChild(link);
+    return li;
+}
+
+function renderTaskItem(task) {
+    const li = document.createElement('li');
+    const link = document.createElement('a');
+    link.href = task.url;
+    const name = document.createElement('strong');
+    name.textContent = task.name;
+    link.append(name, ` (${task.project_name})`);
+    const status = document.createElement('small');
+    status.textContent = `상태: ${task.status}`;
+    li.append(link, ' ', status);
+    return li;
+}
+
+/**
+ * 목록 끝에 감시용 항목을 두고, 화면에 보이면 data-next-cursor로 다음 페이지를 불러옵니다.
+ * reset()을 호출하면 목록을 비우고 첫 페이지부터 다시 불러옵니다.
+ */
+function setupInfiniteList(listId, url, renderItem, extraParams = () => ({})) {
+    const list = document.getElementById(listId);
+    if (!list) return null;
+
+    const sentinel = document.createElement('li');
+    sentinel.className = 'load-more-sentinel';
+    list.appendChild(sentinel);
+
+    let loading = false;
+    let requestSeq = 0;
+
+    function fetchPage(cursor, replace) {
+        const params = new URLSearchParams({ limit: PAGE_SIZE, ...extraParams() });
+        if (cursor) params.set('cursor', cursor);
+        const seq = ++requestSeq;
+        loading = true;
+
+        return fetch(`${url}?${params}`)
+            .then(response => response.json())
+            .then(page => {
+                // 필터를 빠르게 바꿨을 때 늦게 도착한 이전 응답은 버립니다.
+                if (seq !== requestSeq) return;
+                if (page.error) {
+                    console.error(page.error);
+                    return;
+                }
+                if (replace) {
+                    list.querySelectorAll('li:not(.load-more-sentinel)').forEach(li => li.remove());
+                }
+                if (replace && page.items.length === 0) {
+                    const empty = document.createElement('li');
+                    empty.className = 'empty-list';
+                    empty.textContent = '조건에 맞는 항목이 없습니다.';
+                    list.insertBefore(empty, sentinel);
+                }
+                page.items.forEach(item => list.insertBefore(renderItem(item), sentinel));
+                list.dataset.nextCursor = page.next_cursor || '';
+            })
+            .catch(error => console.error('목록 로딩 실패:', error))
+            .finally(() => {
+                if (seq === requestSeq) loading = false;
+            });
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting) && !loading && list.dataset.nextCursor) {
+            fetchPage(list.dataset.nextCursor, false);
+        }
+    }, { rootMargin: '200px' });
+    observer.observe(sentinel);
+
+    return {
+        reset() {
+            list.dataset.nextCursor = '';
+            fetchPage(null, true);
+        }
+    };
+}
@@ -0,0 +1,95 @@
+// static/js/modules/events.js
+import { applyTaskDelta, applyTaskStatus, removeTaskFromList } from './taskHandler.js';
+import { applyCommentAdded, applyCommentRemoved } from './commentHandler.js';
+import { applyTaskToChart, removeTaskFromChart } from './gantt.js';
+import { applyProjectStats, updateProjectStats } from './projectHandler.js';
+
+// 현재 열려 있는 이벤트 스트림
+let eventSource = null;
+
+/**
+ * 실시간 이벤트를 받고 있는지 반환합니다.
+ * 받고 있으면 다른 모듈은 변경 후에 데이터를 다시 불러오지 않고 이벤트가 반영하기를 기다립니다.
+ */
+export function isLive() {
+    return eventSource !== null && eventSource.readyState === EventSource.OPEN;
+}
+
+/**
+ * 프로젝트 이벤트 스트림(/api/project/<id>/events)에 연결하고,
+ * 받은 변경분(delta)을 작업 목록, 댓글, 차트, 진행률에 바로 반영합니다.
+ */
+export function connectProjectEvents() {
+    const chartCanvas = document.getElementById('gantt_chart_div');
+    if (!chartCanvas || !window.EventSource) return;
+    const projectId = chartCanvas.dataset.projectId;
+
+    eventSource = new EventSource(`/api/project/${projectId}/events`);
+
+    const on = (type, handler) => {
+        eventSource.addEventListener(type, event => handler(JSON.parse(event.data)));
+    };
+
+    on('task.created', ({ task }) => {
+        applyTaskDelta(task);
+        applyTaskToChart(task);
+    });
+    on('task.updated', ({ task }) => {
+        applyTaskDelta(task);
+        applyTaskToChart(task);
+    });
+    on('task.status', ({ task_id, status }) => applyTaskStatus(task_id, status));
+    on('task.deleted', ({ task_id }) => {
+        removeTaskFromList(task_id);
+        removeTaskFromChart(task_id);
+    });
+    on('comment.added', ({ task_id, comment }) => applyCommentAdded(task_id, comment));
+    on('comment.removed', ({ comment_id }) => applyCommentRemoved(comment_id));
+    on('progress', stats => applyProjectStats(stats));
+
+    // 놓친 이벤트를 서버가 다시 보내 줄 수 없을 때: 그동안 바뀐 것만 받아 맞춥니다.
+    on('resync', () => syncChanges());
+}
+
+/**
+ * 페이지를 그린 뒤(또는 마지막 동기화 뒤) 바뀐 작업/댓글만 /api/project/<id>/changes로 받아 반영합니다.
+ * 기준 version은 작업 목록의 data-change-version에 보관합니다.
+ */
+export function syncChanges() {
+    const container = document.querySelector('[data-change-version]');
+    const projectId = document.getElementById('gantt_chart_div').dataset.projectId;
+    const since = container.dataset.changeVersion || 0;
+
+    return fetch(`/api/project/${projectId}/changes?since=${since}`)
+        .then(response => response.json())
+        .then(changes => {
+            if (changes.error) {
+                console.error(changes.error);
+                return;
+            }
+            if (changes.reset) {
+                // 서버의 변경 기록이 초기화되었으면 처음부터 다시 불러옵니다.
+                location.reload();
+                return;
+            }
+
+            changes.tasks.forEach(task => {
+                applyTaskDelta(task);
+                applyTaskToChart(task);
+            });
+            changes.deleted.tasks.forEach(taskId => {
+                removeTaskFromList(taskId);
+                removeTaskFromChart(taskId);
+            });
+            changes.comments.forEach(comment => applyCommentAdded(comment.task_id, comment));
+            changes.deleted.comments.forEach(commentId => applyCommentRemoved(commentId));
+
+            container.dataset.changeVersion = changes.version;
+            if (changes.has_more) {
+                return syncChanges();
+            }
+            // 진행률은 변경 기록에 없으므로 (ETag로 검증해) 다시 읽습니다.
+            updateProjectStats();
+        })
+        .catch(error => console.error('변경 내용 동기화 실패:', error));
+}
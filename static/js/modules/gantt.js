@@ -1,81 +1,324 @@
+import { fetchJSONWithValidators } from './utils.js';
+
 // 1. 차트 인스턴스를 저장할 전역 변수를 만듭니다. (초기값은 null)
 let ganttChartInstance = null;
+// 차트의 각 막대에 해당하는 작업 ID (프로젝트 막대와 담당자 막대는 null)
+let chartTaskIds = [];
+
+// 작업 막대 색상
+const TASK_BACKGROUND_COLOR = 'rgba(75, 192, 192, 0.6)';
+const TASK_BORDER_COLOR = 'rgba(75, 192, 192, 1)';
+
+// --- 시간 창 ---
+// 서버는 보이는 기간(view)과 겹치는 작업만 보내므로, 기간을 옮기거나 확대/축소할 때마다 다시 요청합니다.
+const DAY = 24 * 60 * 60 * 1000;
+const MIN_SPAN = DAY;
+const MAX_SPAN = 10 * 365 * DAY;
+// 이보다 넓은 기간은 작업마다 막대를 그리지 않고 서버에서 담당자별로 묶은 막대를 받습니다.
+const SWIMLANE_SPAN = 120 * DAY;
+const PAGE_SIZE = 200;
+// 한 창에서 이어서 받는 최대 막대 수. 넘으면 확대해서 보도록 안내합니다.
+const MAX_BARS = 1000;
+
+let view = null;        // { from, to } (epoch 밀리초). 첫 응답의 window로 정합니다.
+let group = 'task';     // 'task' | 'assignee'
+let requestSeq = 0;     // 늦게 도착한 이전 창의 응답을 버리기 위한 번호
+let reloadTimer = null;
+let controlsReady = false;
+
+function chartUrl(projectId, cursor) {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (view) {
+        params.set('from', Math.floor(view.from / 1000));
+        params.set('to', Math.ceil(view.to / 1000));
+        params.set('group', group);
+    }
+    if (cursor) params.set('cursor', cursor);
+    return `/api/project/${projectId}/chartjs-data?${params}`;
+}
 
-// 3. drawChart 함수를 수정하여 기존 차트를 파괴하도록 합니다.
+function setStatus(text) {
+    const status = document.getElementById('gantt-status');
+    if (status) status.textContent = text;
+}
+
+// 3. drawChart는 현재 보이는 기간의 데이터를 다시 불러와 그립니다.
 export function drawChart() {
     const chartCanvas = document.getElementById('gantt_chart_div');
     if (!chartCanvas) return;
+    setupGanttControls(chartCanvas);
 
     const projectId = chartCanvas.dataset.projectId;
+    const seq = ++requestSeq;
 
-    fetch(`/api/project/${projectId}/chartjs-data`)
-        .then(response => response.json())
+    // 데이터가 바뀌지 않았으면 서버는 304로 응답하고, 보관해 둔 데이터로 다시 그립니다.
+    fetchJSONWithValidators(chartUrl(projectId))
         .then(chartData => {
-            if (chartData.error || chartData.labels.length === 0) {
+            if (seq !== requestSeq) return;
+            if (chartData.error) {
                 chartCanvas.parentElement.innerHTML = '<p>차트를 표시할 데이터가 없습니다.</p>';
-                console.error(chartData.error || "No data");
+                console.error(chartData.error);
                 return;
             }
-
-            const numberOfItems = chartData.labels.length;
-            const newHeight = Math.max(150, numberOfItems * 40); 
-            chartCanvas.style.height = `${newHeight}px`;
-            
-            // --- 바로 이 부분이 핵심입니다! ---
-            // 만약 기존에 그려진 차트(ganttChartInstance)가 있다면,
-            if (ganttChartInstance) {
-                // 먼저 파괴합니다.
-                ganttChartInstance.destroy();
+            if (!view) {
+                view = { from: chartData.window.from * 1000, to: chartData.window.to * 1000 };
+                group = view.to - view.from > SWIMLANE_SPAN ? 'assignee' : 'task';
+                // 첫 요청은 기간 없이 보냈으므로 정해진 창과 묶음 방식으로 다시 받습니다.
+                if (group !== chartData.group) return drawChart();
             }
-            // --- 여기까지 ---
-
-            const ctx = chartCanvas.getContext('2d');
-            
-            // 새로 그린 차트를 전역 변수에 저장합니다.
-            ganttChartInstance = new Chart(ctx, {
-                type: 'bar',
-                data: {
-                    labels: chartData.labels,
-                    datasets: chartData.datasets
-                },
-                options: {
-                    maintainAspectRatio: false,
-                    indexAxis: 'y',
-                    scales: {
-                        x: {
-                            type: 'time',
-                            time: {
-                                unit: 'day',
-                                tooltipFormat: 'yyyy년 MM월 dd일 HH:mm',
-                                displayFormats: { day: 'MM월 dd일' }
-                            },
-                            min: chartData.datasets[0].data[0].x[0],
-                            max: chartData.datasets[0].data[0].x[1],
-                            grid: { color: 'rgba(0, 0, 0, 0.05)' },
-                            title: { display: true, text: '기간' },
-                            ticks: { maxRotation: 0, minRotation: 0 }
-                        },
-                        y: {
-                            grid: { display: false },
-                            barPercentage: 0.9,
-                            categoryPercentage: 0.8,
-                            ticks: { font: { weight: 'bold' } }
-                        }
+            renderChart(chartCanvas, chartData);
+            loadMore(projectId, chartData.next_cursor, seq);
+        })
+        .catch(error => console.error('차트 데이터 로딩 실패:', error));
+}
+
+/**
+ * 같은 창의 다음 페이지를 이어서 받아 막대를 덧붙입니다. (MAX_BARS까지)
+ */
+function loadMore(projectId, cursor, seq) {
+    if (!cursor) {
+        setStatus(describeView());
+        return;
+    }
+    if (chartTaskIds.length >= MAX_BARS) {
+        setStatus(`${describeView()} · 작업이 많아 ${chartTaskIds.length}개만 표시했습니다. 확대해서 보세요.`);
+        return;
+    }
+    fetchJSONWithValidators(chartUrl(projectId, cursor))
+        .then(page => {
+            if (seq !== requestSeq || page.error || !ganttChartInstance) return;
+            const { labels, datasets: [dataset] } = ganttChartInstance.data;
+            const [pageDataset] = page.datasets;
+            labels.push(...page.labels);
+            chartTaskIds.push(...page.task_ids);
+            dataset.data.push(...pageDataset.data);
+            dataset.backgroundColor.push(...pageDataset.backgroundColor);
+            dataset.borderColor.push(...pageDataset.borderColor);
+            resizeChart(ganttChartInstance.canvas, labels.length);
+            ganttChartInstance.update('none');
+            loadMore(projectId, page.next_cursor, seq);
+        })
+        .catch(error => console.error('차트 데이터 로딩 실패:', error));
+}
+
+function describeView() {
+    const format = time => new Date(time).toLocaleDateString();
+    const mode = group === 'assignee' ? '담당자별' : '작업별';
+    return `${format(view.from)} ~ ${format(view.to)} (${mode})`;
+}
+
+function renderChart(chartCanvas, chartData) {
+    chartTaskIds = [...chartData.task_ids];
+    resizeChart(chartCanvas, chartData.labels.length);
+
+    // 차트가 이미 있으면 새로 만들지 않고 데이터와 축 범위만 바꿉니다. (옮길 때 깜박이지 않습니다)
+    if (ganttChartInstance) {
+        ganttChartInstance.data.labels = [...chartData.labels];
+        ganttChartInstance.data.datasets = chartData.datasets.map(dataset => ({
+            ...dataset,
+            data: [...dataset.data],
+            backgroundColor: [...dataset.backgroundColor],
+            borderColor: [...dataset.borderColor]
+        }));
+        setAxis(view);
+        ganttChartInstance.update('none');
+        return;
+    }
+
+    const ctx = chartCanvas.getContext('2d');
+
+    // 새로 그린 차트를 전역 변수에 저장합니다.
+    ganttChartInstance = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: [...chartData.labels],
+            datasets: chartData.datasets.map(dataset => ({ ...dataset, data: [...dataset.data] }))
+        },
+        options: {
+            maintainAspectRatio: false,
+            animation: false,
+            indexAxis: 'y',
+            scales: {
+                x: {
+                    type: 'time',
+                    time: {
+                        tooltipFormat: 'yyyy년 MM월 dd일 HH:mm',
+                        displayFormats: { hour: 'MM월 dd일 HH시', day: 'MM월 dd일', week: 'MM월 dd일', month: 'yyyy년 MM월' }
                     },
-                    plugins: {
-                        legend: { display: false },
-                        tooltip: {
-                            callbacks: {
-                                label: function(context) {
-                                    const startDate = new Date(context.raw.x[0]);
-                                    const endDate = new Date(context.raw.x[1]);
-                                    return `${context.dataset.label}: ${startDate.toLocaleString()} ~ ${endDate.toLocaleString()}`;
-                                }
-                            }
+                    min: view.from,
+                    max: view.to,
+                    grid: { color: 'rgba(0, 0, 0, 0.05)' },
+                    title: { display: true, text: '기간' },
+                    ticks: { maxRotation: 0, minRotation: 0 }
+                },
+                y: {
+                    grid: { display: false },
+                    barPercentage: 0.9,
+                    categoryPercentage: 0.8,
+                    ticks: { font: { weight: 'bold' } }
+                }
+            },
+            plugins: {
+                legend: { display: false },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const startDate = new Date(context.raw.x[0]);
+                            const endDate = new Date(context.raw.x[1]);
+                            return `${context.raw.y}: ${startDate.toLocaleString()} ~ ${endDate.toLocaleString()}`;
                         }
                     }
                 }
-            });
-        })
-        .catch(error => console.error('차트 데이터 로딩 실패:', error));
-}
\ No newline at end of file
+            }
+        }
+    });
+}
+
+function setAxis(range) {
+    const x = ganttChartInstance.options.scales.x;
+    x.min = range.from;
+    x.max = range.to;
+}
+
+// 막대 수에 맞게 차트 높이를 조절
+function resizeChart(chartCanvas, numberOfItems) {
+    const newHeight = Math.max(150, numberOfItems * 40);
+    chartCanvas.style.height = `${newHeight}px`;
+}
+
+// --- 이동 / 확대 ---
+/**
+ * 보이는 기간을 바꾸고 그 창의 데이터를 다시 받습니다. 넓어지면 담당자별 막대로 바꿉니다.
+ */
+function changeView(from, to) {
+    const span = Math.min(Math.max(to - from, MIN_SPAN), MAX_SPAN);
+    const center = (from + to) / 2;
+    view = { from: Math.round(center - span / 2), to: Math.round(center + span / 2) };
+    group = span > SWIMLANE_SPAN ? 'assignee' : 'task';
+    if (ganttChartInstance) {
+        setAxis(view);
+        ganttChartInstance.update('none');
+    }
+    scheduleReload();
+}
+
+function scheduleReload(delay = 150) {
+    clearTimeout(reloadTimer);
+    reloadTimer = setTimeout(drawChart, delay);
+}
+
+function setupGanttControls(chartCanvas) {
+    if (controlsReady) return;
+    controlsReady = true;
+
+    const toolbar = document.getElementById('gantt-toolbar');
+    if (toolbar) {
+        toolbar.addEventListener('click', event => {
+            const button = event.target.closest('[data-gantt]');
+            if (!button || !view) return;
+            const span = view.to - view.from;
+            const center = (view.from + view.to) / 2;
+            switch (button.dataset.gantt) {
+                case 'prev': changeView(view.from - span / 2, view.to - span / 2); break;
+                case 'next': changeView(view.from + span / 2, view.to + span / 2); break;
+                case 'zoom-in': changeView(center - span / 4, center + span / 4); break;
+                case 'zoom-out': changeView(center - span, center + span); break;
+                case 'reset':
+                    // 기간 없이 요청하면 서버가 프로젝트 기간을 창으로 돌려줍니다.
+                    view = null;
+                    drawChart();
+                    break;
+            }
+        });
+    }
+
+    // 차트를 좌우로 끌어 기간을 옮깁니다. 끄는 동안은 축만 움직이고, 놓으면 새 창의 데이터를 받습니다.
+    let drag = null;
+    chartCanvas.addEventListener('pointerdown', event => {
+        if (!ganttChartInstance || !view) return;
+        drag = { x: event.clientX, view: { ...view } };
+        chartCanvas.setPointerCapture(event.pointerId);
+    });
+    chartCanvas.addEventListener('pointermove', event => {
+        if (!drag) return;
+        const { left, right } = ganttChartInstance.chartArea;
+        const shift = (drag.x - event.clientX) * (drag.view.to - drag.view.from) / Math.max(right - left, 1);
+        setAxis({ from: drag.view.from + shift, to: drag.view.to + shift });
+        ganttChartInstance.update('none');
+    });
+    const endDrag = event => {
+        if (!drag) return;
+        const moved = event.clientX - drag.x;
+        const { min, max } = ganttChartInstance.options.scales.x;
+        drag = null;
+        if (Math.abs(moved) > 3) changeView(min, max);
+    };
+    chartCanvas.addEventListener('pointerup', endDrag);
+    chartCanvas.addEventListener('pointercancel', endDrag);
+}
+
+// --- 실시간 반영 ---
+function taskBar(task) {
+    // epoch 초가 있으면 시간대와 관계없이 정확한 위치에 그립니다.
+    if (task.start_ts != null && task.end_ts != null) {
+        return { x: [task.start_ts * 1000, task.end_ts * 1000], y: task.name };
+    }
+    if (!task.start_date || !task.end_date) return null;
+    return { x: [new Date(task.start_date).getTime(), new Date(task.end_date).getTime()], y: task.name };
+}
+
+/**
+ * 실시간 이벤트로 받은 작업 하나를 차트에 반영합니다. (데이터를 다시 불러오지 않습니다)
+ * 보이는 기간과 겹치면 막대를 추가하거나 고치고, 기간 밖으로 옮겨졌으면 뺍니다.
+ * 담당자별로 묶어 보고 있을 때는 묶음 수가 바뀌므로 현재 창을 다시 받습니다.
+ */
+export function applyTaskToChart(task) {
+    if (!ganttChartInstance) return;
+    if (group === 'assignee') {
+        scheduleReload(500);
+        return;
+    }
+    const { labels, datasets: [dataset] } = ganttChartInstance.data;
+    const index = chartTaskIds.indexOf(task.id);
+    const bar = taskBar(task);
+    const visible = bar && view && bar.x[0] < view.to && bar.x[1] >= view.from;
+
+    if (!visible) {
+        if (index !== -1) removeTaskFromChart(task.id);
+        return;
+    }
+    if (index === -1) {
+        chartTaskIds.push(task.id);
+        labels.push(task.name);
+        dataset.data.push(bar);
+        dataset.backgroundColor.push(TASK_BACKGROUND_COLOR);
+        dataset.borderColor.push(TASK_BORDER_COLOR);
+        resizeChart(ganttChartInstance.canvas, labels.length);
+    } else {
+        labels[index] = task.name;
+        dataset.data[index] = bar;
+    }
+    ganttChartInstance.update();
+}
+
+/**
+ * 실시간 이벤트로 삭제된 작업의 막대를 차트에서 뺍니다.
+ */
+export function removeTaskFromChart(taskId) {
+    if (!ganttChartInstance) return;
+    if (group === 'assignee') {
+        scheduleReload(500);
+        return;
+    }
+    const index = chartTaskIds.indexOf(taskId);
+    if (index === -1) return;
+
+    const { labels, datasets: [dataset] } = ganttChartInstance.data;
+    chartTaskIds.splice(index, 1);
+    labels.splice(index, 1);
+    dataset.data.splice(index, 1);
+    dataset.backgroundColor.splice(index, 1);
+    dataset.borderColor.splice(index, 1);
+    resizeChart(ganttChartInstance.canvas, labels.length);
+    ganttChartInstance.update();
+}
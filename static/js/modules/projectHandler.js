@@ -1,5 +1,6 @@
 import { initializeCountdown } from './countdown.js';
 import { drawChart } from './gantt.js';
+import { fetchJSONWithValidators } from './utils.js';
 
 // --- 프로젝트 관련 모든 이벤트 리스너를 설정하는 초기화 함수 ---
 export function setupProjectEventHandlers() {
@@ -66,6 +67,8 @@ function handleProjectEdit(event) {
                 const countdownElement = document.getElementById('countdown-timer');
                 countdownElement.dataset.startDate = data.project.start_date;
                 countdownElement.dataset.endDate = data.project.end_date;
+                countdownElement.dataset.startTs = data.project.start_ts ?? '';
+                countdownElement.dataset.endTs = data.project.end_ts ?? '';
                 
                 // 다른 모듈의 함수를 호출하여 화면 갱신
                 initializeCountdown();
@@ -104,21 +107,26 @@ export function updateProjectStats() {
     if (!chartCanvas) return;
     const projectId = chartCanvas.dataset.projectId;
 
-    fetch(`/api/project/${projectId}/stats`)
-        .then(response => response.json())
+    fetchJSONWithValidators(`/api/project/${projectId}/stats`)
         .then(stats => {
             if (stats.error) {
                 console.error(stats.error);
                 return;
             }
-
-            const progressBar = document.getElementById('task-progress-bar');
-            const progressText = document.getElementById('task-progress-text');
-            
-            if(progressBar) progressBar.value = stats.task_progress;
-            if(progressText) progressText.textContent = `태스크 진행률: ${stats.task_progress}%`;
+            applyProjectStats(stats);
         })
         .catch(error => console.error('Error updating stats:', error));
 
     drawChart();
+}
+
+/**
+ * 진행률 숫자를 화면에 반영합니다. (stats API 응답이나 progress 이벤트)
+ */
+export function applyProjectStats(stats) {
+    const progressBar = document.getElementById('task-progress-bar');
+    const progressText = document.getElementById('task-progress-text');
+
+    if(progressBar) progressBar.value = stats.task_progress;
+    if(progressText) progressText.textContent = `태스크 진행률: ${stats.task_progress}%`;
 }
\ No newline at end of file
@@ -1,5 +1,8 @@
 import { loadComments, addComment, handleCommentEdit, toggleCommentEditMode, deleteComment } from './commentHandler.js';
 import { updateProjectStats } from './projectHandler.js';
+import { drawChart } from './gantt.js';
+import { isLive } from './events.js';
+import { formatPeriodTimestamp } from './utils.js';
 
 // 작업 목록의 모든 이벤트를 처리하는 초기화 함수
 export function setupTaskListEventHandlers() {
@@ -9,12 +12,33 @@ export function setupTaskListEventHandlers() {
         taskList.addEventListener('submit', handleTaskListSubmit);
         taskList.addEventListener('change', handleTaskListChange);
     }
+
+    // 팀장에게만 보이는 일괄 처리 도구 모음
+    const bulkForm = document.getElementById('bulk-task-form');
+    if (bulkForm) {
+        bulkForm.addEventListener('submit', event => {
+            event.preventDefault();
+            applyBulkChanges(bulkForm);
+        });
+        document.getElementById('bulk-select-all').addEventListener('change', event => {
+            document.querySelectorAll('.task-list .task-select').forEach(box => {
+                box.checked = event.target.checked;
+            });
+            updateSelectedCount();
+        });
+    }
 }
 
 // 작업 수정/삭제, 아코디언, 댓글 수정/삭제 버튼 클릭 처리
 function handleTaskListClick(event) {
     const target = event.target;
 
+    // 선택 체크박스는 아코디언을 열지 않습니다.
+    if (target.classList.contains('task-select')) {
+        updateSelectedCount();
+        return;
+    }
+
     if (target.closest('.task-summary')) {
         toggleTaskAccordion(target.closest('.task-summary'));
     }
@@ -98,8 +122,8 @@ function toggleEditMode(detailsDiv, isEdit) {
 
 // 작업 상태 변경
 function updateTaskView(detailsDiv, task) {
-    const startDate = task.start_date.replace('T', ' ');
-    const endDate = task.end_date.replace('T', ' ');
+    const startDate = formatPeriodTimestamp(task.start_ts);
+    const endDate = formatPeriodTimestamp(task.end_ts);
     
     // 요약 정보의 작업 이름 업데이트
     detailsDiv.closest('li').querySelector('.task-summary .task-name').textContent = task.name;
@@ -120,8 +144,8 @@ function handleTaskEdit(form) {
                 // 성공 시 UI 업데이트 후 보기 모드로 전환
                 updateTaskView(detailsDiv, data.task);
                 toggleEditMode(detailsDiv, false);
-                // 간트 차트 갱신
-                if (typeof drawChart === 'function') {
+                // 간트 차트 갱신 (실시간 이벤트를 받고 있으면 이벤트로 반영됩니다)
+                if (!isLive()) {
                     drawChart();
                 }
             } else {
@@ -151,7 +175,9 @@ function deleteTask(form) {
         .then(data => {
             if (data.success) {
                 listItem.remove();
-                updateProjectStats();
+                if (!isLive()) {
+                    updateProjectStats();
+                }
             } else {
                 alert('작업 삭제 실패: ' + data.message);
             }
@@ -159,7 +185,7 @@ function deleteTask(form) {
 }
 
 // 작업 추가
-function addTaskToList(task) {
+export function addTaskToList(task) {
     const taskList = document.querySelector('.task-list');
     const noTaskLi = taskList.querySelector('.no-tasks');
     if (noTaskLi) {
@@ -167,18 +193,64 @@ function addTaskToList(task) {
     }
     const template = document.getElementById('task-template');
     const clone = template.content.cloneNode(true);
-    const startDate = task.start_date.replace('T', ' ');
-    const endDate = task.end_date.replace('T', ' ');
+    const startDate = formatPeriodTimestamp(task.start_ts);
+    const endDate = formatPeriodTimestamp(task.end_ts);
     clone.querySelector('.task-name').textContent = task.name;
     clone.querySelector('.task-status').textContent = `상태: ${task.status}`;
     clone.querySelector('.task-details').dataset.taskId = task.id;
     clone.querySelector('.task-dates').textContent = `${startDate} ~ ${endDate}`;
-    clone.querySelector('.update-status-form').action = `/tasks/${task.id}/update-status`;
-    clone.querySelector('.delete-task-form').action = `/tasks/${task.id}/delete`;
-    clone.querySelector(`select[name="status"] option[value="${task.status}"]`).selected = true;
+    clone.querySelector('.assignee-name').textContent = task.assignee_name || '미지정';
+    // 상태 변경/삭제 폼은 팀장에게만 있습니다.
+    const statusForm = clone.querySelector('.update-status-form');
+    if (statusForm) {
+        statusForm.action = `/tasks/${task.id}/update-status`;
+        statusForm.querySelector(`option[value="${task.status}"]`).selected = true;
+    }
+    const deleteForm = clone.querySelector('.delete-task-form');
+    if (deleteForm) {
+        deleteForm.action = `/tasks/${task.id}/delete`;
+    }
     taskList.appendChild(clone);
 }
 
+
+// --- 실시간 이벤트 반영 (events.js에서 호출) ---
+
+function findTaskDetails(taskId) {
+    return document.querySelector(`.task-details[data-task-id="${taskId}"]`);
+}
+
+// task.created / task.updated: 목록에 없으면 추가하고, 있으면 이름/기간/상태/담당자를 고칩니다.
+export function applyTaskDelta(task) {
+    const detailsDiv = findTaskDetails(task.id);
+    if (!detailsDiv) {
+        addTaskToList(task);
+        return;
+    }
+    updateTaskView(detailsDiv, task);
+    applyTaskStatus(task.id, task.status);
+    detailsDiv.querySelector('.assignee-name').textContent = task.assignee_name || '미지정';
+}
+
+// task.status: 요약 정보의 상태 텍스트와 상태 선택 상자를 고칩니다.
+export function applyTaskStatus(taskId, status) {
+    const detailsDiv = findTaskDetails(taskId);
+    if (!detailsDiv) return;
+    detailsDiv.previousElementSibling.querySelector('small').textContent = `상태: ${status}`;
+    const selectElement = detailsDiv.querySelector('.task-status-select');
+    if (selectElement) {
+        selectElement.value = status;
+    }
+}
+
+// task.deleted: 목록에서 작업을 뺍니다.
+export function removeTaskFromList(taskId) {
+    const detailsDiv = findTaskDetails(taskId);
+    if (detailsDiv) {
+        detailsDiv.closest('li').remove();
+    }
+}
+
 // 작업 상태 변경
 function updateTaskStatus(taskId, newStatus, detailsDiv) {
     const formData = new FormData();
@@ -204,8 +276,8 @@ function updateTaskStatus(taskId, newStatus, detailsDiv) {
                 selectElement.value = data.new_status;
             }
 
-            // 3. 간트 차트도 업데이트
-            if (typeof drawChart === 'function') {
+            // 3. 간트 차트도 업데이트 (실시간 이벤트를 받고 있으면 이벤트로 반영됩니다)
+            if (!isLive()) {
                 drawChart();
             }
         } else {
@@ -237,4 +309,102 @@ function assignTask(taskId, assigneeId, detailsDiv) {
             alert('담당자 지정 실패: ' + data.message);
         }
     });
-}
\ No newline at end of file
+}
+
+
+// --- 작업 일괄 처리 ---
+
+// 선택한 작업 수 표시
+function updateSelectedCount() {
+    const countElement = document.getElementById('bulk-selected-count');
+    if (countElement) {
+        countElement.textContent = document.querySelectorAll('.task-list .task-select:checked').length;
+    }
+}
+
+// 'YYYY-MM-DD HH:MM' 형식의 날짜를 days일 옮겨 datetime-local 형식('YYYY-MM-DDTHH:MM')으로 반환
+function shiftDate(text, days) {
+    const date = new Date(text.trim().replace(' ', 'T'));
+    date.setDate(date.getDate() + days);
+    const pad = n => String(n).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}T${pad(date.getHours())}:${pad(date.getMinutes())}`;
+}
+
+// 선택한 작업들에 상태/담당자/기간 변경을 한 번의 요청으로 적용
+function applyBulkChanges(form) {
+    const selected = [...document.querySelectorAll('.task-list .task-select:checked')]
+        .map(box => box.closest('li').querySelector('.task-details'));
+    if (selected.length === 0) {
+        alert('변경할 작업을 선택해주세요.');
+        return;
+    }
+
+    const status = form.elements.status.value;
+    const assigneeId = form.elements.assignee_id.value;
+    const shiftDays = parseInt(form.elements.shift_days.value, 10) || 0;
+
+    // 요청 순서대로 결과가 오므로, 각 항목에 해당하는 화면 갱신 함수를 같은 순서로 모아 둡니다.
+    const operations = [];
+    const applyToView = [];
+    selected.forEach(detailsDiv => {
+        const taskId = Number(detailsDiv.dataset.taskId);
+        if (status) {
+            operations.push({ op: 'status', task_id: taskId, status });
+            applyToView.push(() => {
+                detailsDiv.previousElementSibling.querySelector('small').textContent = `상태: ${status}`;
+                const select = detailsDiv.querySelector('.task-status-select');
+                if (select) select.value = status;
+            });
+        }
+        if (assigneeId) {
+            const assigneeName = form.elements.assignee_id.selectedOptions[0].textContent;
+            operations.push({ op: 'assign', task_id: taskId, assignee_id: Number(assigneeId) });
+            applyToView.push(() => {
+                detailsDiv.querySelector('.assignee-name').textContent = assigneeName;
+            });
+        }
+        if (shiftDays) {
+            const datesElement = detailsDiv.querySelector('.task-dates');
+            const [startDate, endDate] = datesElement.textContent.split(' ~ ');
+            const newStart = shiftDate(startDate, shiftDays);
+            const newEnd = shiftDate(endDate, shiftDays);
+            operations.push({ op: 'update', task_id: taskId, start_date: newStart, end_date: newEnd });
+            applyToView.push(() => {
+                datesElement.textContent = `${newStart.replace('T', ' ')} ~ ${newEnd.replace('T', ' ')}`;
+            });
+        }
+    });
+
+    if (operations.length === 0) {
+        alert('적용할 변경 내용을 선택해주세요.');
+        return;
+    }
+
+    fetch('/api/tasks/bulk', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ operations })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (!data.results) {
+            alert('일괄 처리 실패: ' + data.message);
+            return;
+        }
+        data.results.forEach(result => {
+            if (result.success) applyToView[result.index]();
+        });
+        if (data.failed) {
+            const messages = data.results.filter(result => !result.success).map(result => result.message);
+            alert(`${data.message}\n` + [...new Set(messages)].join('\n'));
+        }
+
+        form.reset();
+        document.querySelectorAll('.task-list .task-select').forEach(box => { box.checked = false; });
+        updateSelectedCount();
+        if (!isLive()) {
+            updateProjectStats();
+        }
+    })
+    .catch(error => console.error('Error:', error));
+}
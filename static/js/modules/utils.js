@@ -13,4 +13,66 @@ export function handlePageLoadMessages() {
         const newUrl = window.location.pathname;
         window.history.replaceState({}, document.title, newUrl);
     }
-}
\ No newline at end of file
+}
+
+// URL별로 마지막 응답의 검증값(ETag / Last-Modified)과 데이터를 보관합니다.
+const validatorCache = new Map();
+
+/**
+ * JSON API를 조건부 GET으로 요청합니다.
+ * 이전 응답의 ETag/Last-Modified를 함께 보내고, 서버가 304 Not Modified로 응답하면
+ * 보관해 둔 데이터를 그대로 돌려줍니다.
+ */
+export function fetchJSONWithValidators(url) {
+    const cached = validatorCache.get(url);
+    const headers = {};
+    if (cached) {
+        if (cached.etag) headers['If-None-Match'] = cached.etag;
+        if (cached.lastModified) headers['If-Modified-Since'] = cached.lastModified;
+    }
+
+    // 브라우저 HTTP 캐시 대신 직접 보관한 검증값을 사용합니다.
+    return fetch(url, { headers, cache: 'no-store' })
+        .then(response => {
+            if (response.status === 304 && cached) {
+                return cached.data;
+            }
+            return response.json().then(data => {
+                if (response.ok) {
+                    validatorCache.set(url, {
+                        etag: response.headers.get('ETag'),
+                        lastModified: response.headers.get('Last-Modified'),
+                        data: data
+                    });
+                }
+                return data;
+            });
+        });
+}
+
+// 사용자 시간대(body의 data-timezone)로 시각을 'YYYY-MM-DD HH:MM:SS' 형식으로 만드는 포매터
+let timestampFormatter = null;
+
+/**
+ * UTC epoch 초를 사용자 시간대의 시각 문자열로 바꿉니다.
+ * 실시간 이벤트처럼 여러 사용자에게 같은 내용이 가는 경우에도 각자의 시간대로 표시됩니다.
+ */
+export function formatTimestamp(ts) {
+    if (!timestampFormatter) {
+        // sv-SE 로캘은 ISO와 같은 'YYYY-MM-DD HH:MM:SS' 형식으로 출력합니다.
+        timestampFormatter = new Intl.DateTimeFormat('sv-SE', {
+            timeZone: document.body.dataset.timezone || undefined,
+            year: 'numeric', month: '2-digit', day: '2-digit',
+            hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: false
+        });
+    }
+    return timestampFormatter.format(new Date(ts * 1000));
+}
+
+/**
+ * 작업/프로젝트 기간(epoch 초)을 사용자 시간대의 'YYYY-MM-DD HH:MM'으로 바꿉니다.
+ * 화면의 기간 표시와 수정 입력란이 모두 이 값을 쓰므로, 다시 저장해도 시각이 바뀌지 않습니다.
+ */
+export function formatPeriodTimestamp(ts) {
+    return ts == null ? '' : formatTimestamp(ts).slice(0, 16);
+}
@@ -0,0 +1,139 @@
+# timeutil.py
+"""시간 변환을 한 곳에서 처리합니다.
+
+DB의 비교/정렬/범위 조회는 정수 UTC epoch 초 컬럼(start_ts, end_ts, created_ts)으로 하고,
+사람이 읽는 시간은 여기서만 만듭니다. 시간대는 사용자마다(users.timezone) 다를 수 있고,
+정하지 않은 사용자와 요청 밖(CLI, 마이그레이션)에서는 DEFAULT_TIMEZONE을 씁니다.
+
+- 화면의 datetime-local 값('YYYY-MM-DDTHH:MM')은 입력한 사용자의 시간대 기준 벽시계 시각입니다.
+  기간은 start_ts/end_ts가 기준이고, 화면과 수정 입력란은 이 값을 보는 사람의 시간대로 바꿔 보여 줍니다.
+- 기간 텍스트 컬럼(start_date/end_date)은 epoch 값에서 DEFAULT_TIMEZONE 기준으로 만들어 저장합니다.
+  (내보내기 등 호환용이며, 다시 읽어서 epoch을 계산하지 않습니다)
+- comments.created_at 텍스트는 UTC 'YYYY-MM-DD HH:MM:SS'입니다.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from flask import has_request_context
+from flask_login import current_user
+
+DISPLAY_FORMAT = '%Y-%m-%d %H:%M:%S'
+PERIOD_FORMAT = '%Y-%m-%d %H:%M'
+INPUT_FORMAT = '%Y-%m-%dT%H:%M'
+UTC_TEXT_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_default_name = 'Asia/Seoul'
+
+
+def init_app(app):
+    """DEFAULT_TIMEZONE을 읽고, 템플릿에서 user_timezone()을 쓸 수 있게 합니다."""
+    global _default_name
+    name = app.config.get('DEFAULT_TIMEZONE', 'Asia/Seoul')
+    if not is_valid_zone(name):
+        raise ValueError(f"알 수 없는 시간대입니다: {name}")
+    _default_name = name
+    app.context_processor(lambda: {'user_timezone': current_zone_name, 'period_time': period_time,
+                                   'input_time': input_time})
+
+@lru_cache(maxsize=64)
+def _zone(name):
+    return ZoneInfo(name)
+
+def is_valid_zone(name):
+    """IANA 시간대 이름(예: 'Asia/Seoul')인지 확인합니다."""
+    if not name or not isinstance(name, str):
+        return False
+    try:
+        _zone(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+def default_zone():
+    return _zone(_default_name)
+
+def current_zone_name():
+    """로그인한 사용자의 시간대 이름. 정하지 않았거나 요청 밖이면 기본 시간대입니다."""
+    if has_request_context() and current_user and current_user.is_authenticated:
+        name = getattr(current_user, 'timezone', None)
+        if name and is_valid_zone(name):
+            return name
+    return _default_name
+
+def current_zone():
+    return _zone(current_zone_name())
+
+# --- 변환 ---
+def now_ts():
+    """현재 시각의 UTC epoch 초."""
+    return int(time.time())
+
+def local_to_ts(text, zone=None):
+    """시간대 정보가 없는 ISO 문자열(예: datetime-local 값)을 zone(기본: 현재 사용자) 기준으로 epoch 초로 바꿉니다.
+
+    비어 있거나 형식이 잘못되면 None을 반환합니다.
+    """
+    if not text:
+        return None
+    try:
+        moment = datetime.fromisoformat(text)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=zone or current_zone())
+    return int(moment.timestamp())
+
+def parse_period(start_text, end_text, zone=None):
+    """입력한 기간을 zone(기본: 현재 사용자) 기준 (start_ts, end_ts)로 바꿉니다.
+
+    비어 있거나 형식이 잘못됐거나 종료가 시작보다 빠르면 ValueError가 발생합니다.
+    """
+    if not start_text or not end_text:
+        raise ValueError('시작일과 종료일을 입력해주세요.')
+    zone = zone or current_zone()
+    start_ts, end_ts = local_to_ts(start_text, zone), local_to_ts(end_text, zone)
+    if start_ts is None or end_ts is None:
+        raise ValueError('날짜 형식이 올바르지 않습니다.')
+    if start_ts > end_ts:
+        raise ValueError('종료일이 시작일보다 빠릅니다.')
+    return start_ts, end_ts
+
+def period_text(ts):
+    """기간 텍스트 컬럼(start_date/end_date)에 저장할 값. DEFAULT_TIMEZONE 기준 'YYYY-MM-DDTHH:MM'입니다."""
+    return format_ts(ts, default_zone(), INPUT_FORMAT)
+
+def day_start_ts(date_text, zone=None, days=0):
+    """'YYYY-MM-DD' 날짜의 0시(zone 기준)에 days일을 더한 시각의 epoch 초. 형식이 잘못되면 ValueError."""
+    day = datetime.strptime(date_text, '%Y-%m-%d') + timedelta(days=days)
+    return int(day.replace(tzinfo=zone or current_zone()).timestamp())
+
+def utc_text_to_ts(text):
+    """UTC 'YYYY-MM-DD HH:MM:SS' 문자열을 epoch 초로 바꿉니다."""
+    if not text:
+        return None
+    return int(datetime.strptime(text, UTC_TEXT_FORMAT).replace(tzinfo=timezone.utc).timestamp())
+
+def ts_to_utc_text(ts):
+    """epoch 초를 UTC 'YYYY-MM-DD HH:MM:SS' 문자열(기존 텍스트 컬럼 형식)로 바꿉니다."""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime(UTC_TEXT_FORMAT)
+
+def format_ts(ts, zone=None, fmt=DISPLAY_FORMAT):
+    """epoch 초를 zone(기본: 현재 사용자)의 벽시계 시각 문자열로 바꿉니다. None이면 None."""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, zone or current_zone()).strftime(fmt)
+
+def period_time(ts, zone=None):
+    """기간 표시용 'YYYY-MM-DD HH:MM' (zone 기본: 현재 사용자). 기간이 없으면 빈 문자열."""
+    return format_ts(ts, zone, PERIOD_FORMAT) or ''
+
+def input_time(ts, zone=None):
+    """datetime-local 입력란에 미리 채울 값 (zone 기본: 현재 사용자). 기간이 없으면 빈 문자열."""
+    return format_ts(ts, zone, INPUT_FORMAT) or ''
+
+def input_now(zone=None):
+    """datetime-local 입력란의 기본값으로 쓸 현재 시각 문자열."""
+    return format_ts(now_ts(), zone, INPUT_FORMAT)
@@ -1,8 +1,10 @@
 # views/auth_routes.py
 
-from flask import Blueprint, render_template, redirect, url_for, request, flash
-from flask_login import login_user, logout_user, login_required
+from flask import Blueprint, render_template, redirect, url_for, request, flash, make_response, jsonify
+from flask_login import login_user, logout_user, login_required, current_user
 from models import User
+import passwords
+import timeutil
 from database import get_db
 
 # 'auth' 라는 이름의 블루프린트 객체를 생성합니다.
@@ -22,11 +24,13 @@ def register():
         cursor = db.cursor()
         cursor.execute("SELECT COUNT(*) FROM users")
         user_count = cursor.fetchone()[0]
-        db.close()
 
         role = '팀원'
 
-        new_user = User(id=None, username=username, password_hash=None, role=role)
+        # 가입 화면이 브라우저의 시간대를 함께 보냅니다. 모르는 값이면 기본 시간대를 씁니다.
+        zone_name = request.form.get('timezone')
+        new_user = User(id=None, username=username, password_hash=None, role=role,
+                        timezone=zone_name if timeutil.is_valid_zone(zone_name) else None)
         new_user.set_password(password)
         new_user.create()
 
@@ -43,6 +47,7 @@ def login():
         user = User.find_by_username(username)
 
         if user and user.check_password(password):
+            user.rehash_password_if_needed(password)
             login_user(user)
             return redirect(url_for('project.dashboard')) # 'project' 블루프린트로 이동
         
@@ -50,10 +55,29 @@ def login():
 
     return render_template('login.html')
 
+# 비밀번호 해시 작업이 밀려 있으면 기다리지 않고 바로 503으로 응답
+@bp.errorhandler(passwords.Overloaded)
+def hashing_overloaded(e):
+    flash('요청이 많아 지금은 처리할 수 없습니다. 잠시 후 다시 시도해주세요.')
+    template = 'register.html' if request.endpoint == 'auth.register' else 'login.html'
+    response = make_response(render_template(template), 503)
+    response.headers['Retry-After'] = '1'
+    return response
+
 # 로그아웃
 @bp.route('/logout')
 @login_required
 def logout():
     
     logout_user()
-    return redirect(url_for('auth.login', message='성공적으로 로그아웃되었습니다.'))
\ No newline at end of file
+    return redirect(url_for('auth.login', message='성공적으로 로그아웃되었습니다.'))
+
+# 표시 시간대 변경
+@bp.route('/api/me/timezone', methods=['POST'])
+@login_required
+def update_timezone():
+    zone_name = request.form.get('timezone')
+    if not timeutil.is_valid_zone(zone_name):
+        return jsonify({'success': False, 'message': '알 수 없는 시간대입니다.'}), 400
+    current_user.set_timezone(zone_name)
+    return jsonify({'success': True, 'timezone': zone_name})
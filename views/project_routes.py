@@ -1,43 +1,175 @@
 # views/project_routes.py
 
-from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify
+from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, make_response, Response, stream_with_context, current_app
 from flask_login import login_required, current_user
-from models import User, Project, Task, Comment
-from datetime import datetime, timedelta
+from models import User, Project, Task, Comment, ProjectSnapshot, ChangeLog, Search, HIGHLIGHT_START, HIGHLIGHT_END
+from markupsafe import escape
+import events
+import export
+import importer
+import timeutil
+from datetime import datetime, timezone
+import base64
+import zlib
 
 # 'project' 라는 이름의 블루프린트 객체를 생성합니다.
 bp = Blueprint('project', __name__, url_prefix='/')
 
+# --- 조건부 GET (ETag / Last-Modified) ---
+def _validators(kind, object_id, version, updated_at, variant=None):
+    """변경 버전으로 ETag와 Last-Modified 값을 만듭니다.
+
+    같은 자원이라도 쿼리 파라미터(페이지 커서 등)에 따라 응답이 다르면 variant로 구분합니다.
+    Last-Modified는 응답마다 구분할 수 없으므로 variant가 있으면 보내지 않습니다.
+    """
+    etag = f"{kind}-{object_id}-v{version}"
+    if variant:
+        etag += f"-{zlib.crc32(variant):08x}"
+    last_modified = None
+    if updated_at and not variant:
+        last_modified = datetime.strptime(updated_at, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+    return etag, last_modified
+
+def _is_not_modified(etag):
+    """클라이언트가 보낸 ETag가 현재 버전과 같은지 확인합니다.
+
+    If-Modified-Since는 초 단위라 같은 초 안의 변경을 놓치므로 304 판단에 쓰지 않습니다.
+    """
+    return bool(request.if_none_match) and request.if_none_match.contains_weak(etag)
+
+def _with_validators(response, etag, last_modified):
+    """응답에 ETag/Last-Modified를 붙이고, 브라우저가 매번 재검증하도록 합니다."""
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def _not_modified_response(etag, last_modified):
+    """본문 없이 304 Not Modified 응답을 만듭니다."""
+    return _with_validators(make_response('', 304), etag, last_modified)
+
+# --- 키셋 페이지네이션 커서 ---
+def _encode_cursor(*values):
+    """정렬 키 값들을 URL에 넣을 수 있는 불투명한 커서 문자열로 만듭니다."""
+    raw = '|'.join(str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor, *types):
+    """커서 문자열을 정렬 키 값 튜플로 되돌립니다. 형식이 잘못되면 ValueError가 발생합니다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        parts = raw.split('|')
+        if len(parts) != len(types):
+            raise ValueError
+        return tuple(t(part) for t, part in zip(types, parts))
+    except Exception:
+        raise ValueError('잘못된 커서입니다.')
+
+def _int_or_none(part):
+    """커서 조각을 정수로 읽습니다. 빈 조각은 None(NULL 정렬 키)입니다."""
+    return int(part) if part else None
+
+def _page_limit(default=50, maximum=200):
+    """limit 쿼리 파라미터를 1 ~ maximum 범위로 읽습니다."""
+    limit = request.args.get('limit', default, type=int)
+    return max(1, min(limit or default, maximum))
+
 @bp.route('/')
 def index():
     if current_user.is_authenticated:
         return redirect(url_for('project.dashboard'))
     return redirect(url_for('auth.login')) # 'auth' 블루프린트로 이동
 
+# --- 대시보드 페이지 단위 조회 ---
+DASHBOARD_PAGE_SIZE = 30
+
+def _dashboard_projects_page(user_id, limit, after_id=0):
+    """프로젝트 한 페이지와 다음 페이지 커서(없으면 None)를 반환합니다."""
+    projects, has_more = Project.page_for_user(user_id, limit, after_id)
+    next_cursor = _encode_cursor(projects[-1].id) if has_more else None
+    return projects, next_cursor
+
+def _dashboard_tasks_page(user_id, limit, after=None, status=None, from_ts=None, to_ts=None):
+    """할당된 작업 한 페이지(딕셔너리 목록)와 다음 페이지 커서(없으면 None)를 반환합니다."""
+    rows, has_more = Task.page_for_assignee(user_id, limit, after=after, status=status,
+                                            from_ts=from_ts, to_ts=to_ts)
+    tasks = [
+        {
+            'id': task.id,
+            'project_id': task.project_id,
+            'name': task.task_name,
+            'start_date': task.start_date,
+            'end_date': task.end_date,
+            'start_ts': task.start_ts,
+            'end_ts': task.end_ts,
+            'status': task.status,
+            'project_name': task.project_name
+        } for task in rows
+    ]
+    # 기간이 없는 예전 작업(start_ts가 NULL)은 빈 조각으로 표시합니다.
+    last = rows[-1] if rows else None
+    next_cursor = _encode_cursor('' if last.start_ts is None else last.start_ts, last.id) if has_more else None
+    return tasks, next_cursor
+
 # 대시보드
 @bp.route('/dashboard')
 @login_required
 def dashboard():
-    user_projects = Project.find_for_user(current_user.id)
-    assigned_tasks_data = Task.find_for_assignee(current_user.id)
-    # 데이터베이스에서 받은 튜플 리스트를 딕셔너리 리스트로 변환합니다.
-    assigned_tasks = [
-        {
-            'id': row[0],
-            'project_id': row[1],
-            'name': row[2],
-            'status': row[5],
-            'project_name': row[7]
-        } for row in assigned_tasks_data
-    ]
+    # 첫 페이지만 서버에서 렌더링하고, 나머지는 스크롤할 때 아래 JSON API로 불러옵니다.
+    user_projects, projects_cursor = _dashboard_projects_page(current_user.id, DASHBOARD_PAGE_SIZE)
+    assigned_tasks, tasks_cursor = _dashboard_tasks_page(current_user.id, DASHBOARD_PAGE_SIZE)
 
-    current_time_for_input = datetime.now().strftime('%Y-%m-%dT%H:%M')
+    current_time_for_input = timeutil.input_now()
     
     return render_template('dashboard.html',
                             projects=user_projects,
+                            projects_cursor=projects_cursor,
                             tasks=assigned_tasks, # 딕셔너리 리스트 전달
+                            tasks_cursor=tasks_cursor,
                             current_time=current_time_for_input)
 
+# 대시보드 프로젝트 목록 (JSON)
+@bp.route('/api/dashboard/projects')
+@login_required
+def dashboard_projects():
+    try:
+        after_id = _decode_cursor(request.args['cursor'], int)[0] if request.args.get('cursor') else 0
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    projects, next_cursor = _dashboard_projects_page(current_user.id, _page_limit(DASHBOARD_PAGE_SIZE), after_id)
+    return jsonify({
+        'items': [{
+            'id': p.id,
+            'project_name': p.project_name,
+            'url': url_for('project.project_detail', project_id=p.id)
+        } for p in projects],
+        'next_cursor': next_cursor
+    })
+
+# 대시보드 담당 작업 목록 (JSON)
+@bp.route('/api/dashboard/tasks')
+@login_required
+def dashboard_tasks():
+    try:
+        after = _decode_cursor(request.args['cursor'], _int_or_none, int) if request.args.get('cursor') else None
+        # 기간 필터는 YYYY-MM-DD 형식(사용자 시간대의 날짜)이며, 종료일은 그 날 하루를 포함하도록 다음 날 0시로 바꿉니다.
+        date_from = request.args.get('from') or None
+        date_to = request.args.get('to') or None
+        from_ts = timeutil.day_start_ts(date_from) if date_from else None
+        to_ts = timeutil.day_start_ts(date_to, days=1) if date_to else None
+    except ValueError:
+        return jsonify({'error': '잘못된 커서 또는 날짜 형식입니다.'}), 400
+
+    tasks, next_cursor = _dashboard_tasks_page(current_user.id, _page_limit(DASHBOARD_PAGE_SIZE), after=after,
+                                               status=request.args.get('status') or None,
+                                               from_ts=from_ts, to_ts=to_ts)
+    for task in tasks:
+        task['url'] = url_for('project.project_detail', project_id=task['project_id'])
+    return jsonify({'items': tasks, 'next_cursor': next_cursor})
+
 # 프로젝트 생성을 처리할 라우트를 새로 추가합니다.
 @bp.route('/projects/create', methods=['POST'])
 @login_required
@@ -48,7 +180,14 @@ def create_project():
     end_date = request.form.get('end_date')
 
     if project_name:
-        new_project = Project(id=None, project_name=project_name, created_by=current_user.id, start_date=start_date, end_date=end_date)
+        # 기간은 입력한 사용자의 시간대 기준으로 읽습니다.
+        try:
+            start_ts, end_ts = timeutil.parse_period(start_date, end_date)
+        except ValueError as e:
+            flash(f'프로젝트를 만들지 못했습니다: {e}')
+            return dashboard(), 400
+        new_project = Project(id=None, project_name=project_name, created_by=current_user.id,
+                              start_ts=start_ts, end_ts=end_ts)
         new_project.create()
         flash('새로운 프로젝트가 생성되었습니다.')
     
@@ -58,29 +197,27 @@ def create_project():
 @bp.route('/project/<int:project_id>', methods=['GET', 'POST'])
 @login_required
 def project_detail(project_id):
-    # --- 권한 확인 로직
-    if not Project.is_member(project_id, current_user.id):
+    # 프로젝트, 역할, 멤버, 작업, 진행률을 한 번에 불러옵니다.
+    # 멤버가 아니면 None이 반환되므로 권한 확인도 함께 이루어집니다.
+    snapshot = ProjectSnapshot.load(project_id, current_user.id)
+    if snapshot is None:
         flash('접근 권한이 없는 프로젝트입니다.')
         return redirect(url_for('project.dashboard'))
-    
-    project = Project.get(project_id)
-    tasks = Task.find_for_project(project_id)
-    
-    task_progress = project.calculate_task_progress()
+
+    project = snapshot.project
     time_progress = project.calculate_time_progress()
 
-    current_time_for_input = datetime.now().strftime('%Y-%m-%dT%H:%M')
-    user_role = Project.get_user_role(project_id, current_user.id)
-    members = Project.get_members(project_id)
+    current_time_for_input = timeutil.input_now()
 
     return render_template('project_detail.html', 
                             project=project, 
-                            tasks=tasks, 
-                            task_progress=task_progress, 
+                            tasks=snapshot.tasks, 
+                            task_progress=snapshot.task_progress, 
                             time_progress=time_progress,
                             current_time=current_time_for_input,
-                            user_role=user_role,
-                            members=members)
+                            user_role=snapshot.user_role,
+                            members=snapshot.members,
+                            change_version=snapshot.change_version)
 
 # 프로젝트 삭제
 @bp.route('/projects/<int:project_id>/delete', methods=['POST'])
@@ -116,8 +253,12 @@ def create_task(project_id):
 
     if not task_name or not start_date or not end_date:
         return jsonify({"success": False, "message": "모든 필드를 입력해주세요."}), 400
+    try:
+        start_ts, end_ts = timeutil.parse_period(start_date, end_date)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
-    new_task = Task(id=None, project_id=project_id, task_name=task_name, start_date=start_date, end_date=end_date)
+    new_task = Task(id=None, project_id=project_id, task_name=task_name, start_ts=start_ts, end_ts=end_ts)
     # 이제 모델의 create 함수를 호출하고, 반환된 ID를 사용합니다.
     new_task_id = new_task.create()
 
@@ -130,6 +271,8 @@ def create_task(project_id):
             "name": new_task.task_name,
             "start_date": new_task.start_date,
             "end_date": new_task.end_date,
+            "start_ts": new_task.start_ts,
+            "end_ts": new_task.end_ts,
             "status": new_task.status
         }
     })
@@ -171,69 +314,171 @@ def delete_task(task_id):
     task.delete()
     return jsonify({'success': True, 'message': '작업이 삭제되었습니다.'})
 
-# Chart.js 데이터
+# --- 간트 차트 (시간 창 조회) ---
+GANTT_PAGE_SIZE = 200                  # 한 번에 보내는 작업 막대 수
+GANTT_MAX_PAGE_SIZE = 1000
+GANTT_DEFAULT_SPAN = 30 * 24 * 3600    # 프로젝트 기간이 없을 때 보여 줄 기간(초)
+GANTT_MAX_SPAN = 10 * 366 * 24 * 3600  # 한 번에 볼 수 있는 최대 기간(초)
+GANTT_GROUPS = ('task', 'assignee')
+
+PROJECT_BAR_COLORS = ('rgba(54, 162, 235, 0.6)', 'rgba(54, 162, 235, 1)')
+TASK_BAR_COLORS = ('rgba(75, 192, 192, 0.6)', 'rgba(75, 192, 192, 1)')
+LANE_BAR_COLORS = ('rgba(153, 102, 255, 0.5)', 'rgba(153, 102, 255, 1)')
+
+def _gantt_window(project):
+    """from/to 파라미터(UTC epoch 초)로 [from, to) 시간 창을 정합니다. 없으면 프로젝트 기간을 씁니다.
+
+    형식이 잘못됐거나 범위가 맞지 않으면 ValueError가 발생합니다.
+    """
+    try:
+        from_ts = int(request.args['from']) if request.args.get('from') else None
+        to_ts = int(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        raise ValueError('from/to는 epoch 초(정수)여야 합니다.')
+    if from_ts is None:
+        from_ts = project.start_ts if project.start_ts is not None else timeutil.now_ts() - GANTT_DEFAULT_SPAN // 2
+    if to_ts is None:
+        to_ts = project.end_ts if project.end_ts is not None and project.end_ts > from_ts else from_ts + GANTT_DEFAULT_SPAN
+    if to_ts <= from_ts or to_ts - from_ts > GANTT_MAX_SPAN:
+        raise ValueError('조회 기간이 올바르지 않습니다.')
+    return from_ts, to_ts
+
+def _bar(x_start, x_end, label, colors):
+    return {'x': [x_start * 1000, x_end * 1000], 'y': label}, colors
+
 @bp.route('/api/project/<int:project_id>/chartjs-data')
 @login_required
 def project_chartjs_data(project_id):
+    """간트 차트에 그릴 막대를 Chart.js 데이터셋 형식으로 돌려줍니다.
+
+    from / to: 보이는 시간 창 (UTC epoch 초, 생략하면 프로젝트 기간). 창과 기간이 겹치는 작업만 보냅니다.
+    group: task(기본, 작업마다 막대) | assignee(담당자별로 묶은 막대 한 줄씩, 넓은 기간을 볼 때)
+    limit / cursor: 작업 막대 페이지. 응답의 next_cursor로 같은 창의 다음 페이지를 받습니다.
+    막대의 x 값은 epoch 밀리초이고, 프로젝트 막대는 첫 페이지에만 있습니다.
+    """
     if not Project.is_member(project_id, current_user.id):
         return jsonify({"error": "접근 권한이 없습니다."}), 403
 
-    project = Project.get(project_id)
-    tasks = Task.find_for_project(project_id)
-
-    labels = []
-    data = []
-    background_colors = []
-    border_colors = []
+    # 프로젝트 버전이 그대로면 쿼리와 JSON 생성 없이 304로 응답합니다. (창과 페이지마다 응답이 다릅니다)
+    change = Project.change_version(project_id)
+    if change is None:
+        return jsonify({"error": "프로젝트를 찾을 수 없습니다."}), 404
+    etag, last_modified = _validators('chart', project_id, *change, variant=request.query_string)
+    if _is_not_modified(etag):
+        return _not_modified_response(etag, last_modified)
 
-    # 프로젝트 데이터 추가
-    project_label = f'[프로젝트] {project.project_name}'
-    labels.append(project_label)
-    data.append({'x': [project.start_date, project.end_date], 'y': project_label})
-    background_colors.append('rgba(54, 162, 235, 0.6)')
-    border_colors.append('rgba(54, 162, 235, 1)')
+    snapshot = ProjectSnapshot.load(project_id, current_user.id, include_members=False, include_tasks=False)
+    if snapshot is None:
+        return jsonify({"error": "접근 권한이 없습니다."}), 403
+    project = snapshot.project
+
+    group = request.args.get('group', 'task')
+    if group not in GANTT_GROUPS:
+        return jsonify({"error": "group은 task 또는 assignee여야 합니다."}), 400
+    try:
+        from_ts, to_ts = _gantt_window(project)
+        after = _decode_cursor(request.args['cursor'], int, int, int) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    bars = []      # (막대, (배경색, 테두리색))
+    task_ids = []  # 실시간 이벤트로 막대를 고칠 때 작업을 찾기 위한 ID (프로젝트/담당자 막대는 null)
+    lanes = None
+    next_cursor = None
+
+    # 프로젝트 막대
+    if after is None and project.start_ts is not None and project.end_ts is not None:
+        bars.append(_bar(project.start_ts, project.end_ts, f'[프로젝트] {project.project_name}', PROJECT_BAR_COLORS))
+        task_ids.append(None)
+
+    if group == 'assignee':
+        lanes = []
+        for lane in Task.swimlanes(project_id, from_ts, to_ts):
+            name = lane['assignee_name'] or '담당자 없음'
+            bars.append(_bar(lane['lane_start'], lane['lane_end'], f"{name} ({lane['task_count']})", LANE_BAR_COLORS))
+            task_ids.append(None)
+            lanes.append({'assignee_id': lane['assignee_id'], 'assignee_name': lane['assignee_name'],
+                          'task_count': lane['task_count'], 'completed': lane['completed']})
+    else:
+        limit = _page_limit(GANTT_PAGE_SIZE, GANTT_MAX_PAGE_SIZE)
+        tasks, has_more = Task.in_window(project_id, from_ts, to_ts, limit, after)
+        for task in tasks:
+            bars.append(_bar(task.start_ts, task.end_ts, task.task_name, TASK_BAR_COLORS))
+            task_ids.append(task.id)
+        if has_more:
+            next_cursor = _encode_cursor(tasks[-1].start_ts, tasks[-1].end_ts, tasks[-1].id)
 
-    # 작업 데이터 추가
-    for task in tasks:
-        if task.start_date and task.end_date:
-            labels.append(task.task_name)
-            data.append({'x': [task.start_date, task.end_date], 'y': task.task_name})
-            background_colors.append('rgba(75, 192, 192, 0.6)')
-            border_colors.append('rgba(75, 192, 192, 1)')
-    
-    # 하나의 데이터셋으로 최종 데이터 구성
     final_data = {
-        'labels': labels,
+        'group': group,
+        'window': {'from': from_ts, 'to': to_ts},
+        'labels': [bar['y'] for bar, _ in bars],
+        'task_ids': task_ids,
         'datasets': [{
-            'data': data,
-            'backgroundColor': background_colors,
-            'borderColor': border_colors,
+            'data': [bar for bar, _ in bars],
+            'backgroundColor': [colors[0] for _, colors in bars],
+            'borderColor': [colors[1] for _, colors in bars],
             'borderWidth': 1,
             'borderRadius': 2,
             'borderSkipped': False
-        }]
+        }],
+        'next_cursor': next_cursor
     }
-    return jsonify(final_data)
+    if lanes is not None:
+        final_data['lanes'] = lanes
+    return _with_validators(jsonify(final_data), etag, last_modified)
 
 # 댓글
 @bp.route('/api/task/<int:task_id>/comments')
 @login_required
 def get_comments(task_id):
-    comments = Comment.find_for_task(task_id)
-    comments_list = []
-    for c in comments:
-        # DB에서 가져온 UTC 시간 문자열을 datetime 객체로 변환
-        utc_time = datetime.strptime(c.created_at, '%Y-%m-%d %H:%M:%S')
-        # KST로 변환 (+9 시간)
-        kst_time = utc_time + timedelta(hours=9)
-        
-        comments_list.append({
-            'id': c.id,
-            'username': c.username,
-            'content': c.content,
-            'created_at': kst_time.strftime('%Y-%m-%d %H:%M:%S') # 변환된 KST 시간을 전달
-        })
-    return jsonify(comments_list)
+    change = Task.change_version(task_id)
+    if change is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    project_id, version, updated_at = change
+    if not Project.is_member(project_id, current_user.id):
+        return jsonify({'error': '접근 권한이 없습니다.'}), 403
+
+    limit = _page_limit()
+    try:
+        before = _decode_cursor(request.args['before'], int, int) if request.args.get('before') else None
+        after = _decode_cursor(request.args['after'], int, int) if request.args.get('after') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # 작업 버전(댓글 추가/삭제 시 증가)이 그대로면 304로 응답합니다.
+    # 표시 시간이 사용자 시간대에 따라 다르므로 시간대도 ETag에 넣습니다.
+    zone = timeutil.current_zone()
+    etag, last_modified = _validators('comments', task_id, version, updated_at,
+                                      variant=request.query_string + b'|' + str(zone).encode())
+    if _is_not_modified(etag):
+        return _not_modified_response(etag, last_modified)
+
+    # before/after 커서로 한 페이지만 가져옵니다. 표시 시간은 사용자의 시간대로 바꿉니다.
+    comments, has_more = Comment.find_for_task(task_id, limit=limit, before=before, after=after)
+    comments_list = [{
+        'id': c.id,
+        'username': c.username,
+        'content': c.content,
+        'created_at': timeutil.format_ts(c.created_ts, zone),
+        'created_ts': c.created_ts
+    } for c in comments]
+
+    # older_cursor: 이보다 오래된 댓글을 가져올 커서 (없으면 null)
+    # newer_cursor: 이후에 새로 달린 댓글만 가져올 커서
+    older_cursor = None
+    if comments and after is None and has_more:
+        older_cursor = _encode_cursor(comments[0].created_ts, comments[0].id)
+    if comments:
+        newer_cursor = _encode_cursor(comments[-1].created_ts, comments[-1].id)
+    else:
+        newer_cursor = request.args.get('after')
+
+    return _with_validators(jsonify({
+        'comments': comments_list,
+        'older_cursor': older_cursor,
+        'newer_cursor': newer_cursor,
+        'has_newer': bool(after is not None and has_more)
+    }), etag, last_modified)
 
 # 댓글 추가
 @bp.route('/api/task/<int:task_id>/comments/add', methods=['POST'])
@@ -243,9 +488,9 @@ def add_comment(task_id):
     if not content:
         return jsonify({'success': False, 'message': '댓글 내용이 없습니다.'}), 400
     
-    # KST 대신 UTC 시간을 직접 생성하여 문자열로 변환
-    now_utc_str = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-    new_comment_id = Comment.create(task_id, current_user.id, content, now_utc_str)
+    # 현재 시각은 한 번만 구해 저장과 응답에 함께 씁니다.
+    created_ts = timeutil.now_ts()
+    new_comment_id = Comment.create(task_id, current_user.id, content, created_ts)
 
     return jsonify({
         'success': True,
@@ -253,8 +498,8 @@ def add_comment(task_id):
             'id': new_comment_id,
             'username': current_user.username,
             'content': content,
-            # 화면에 바로 보여줄 시간은 KST로 변환 (+9 시간)
-            'created_at': (datetime.utcnow() + timedelta(hours=9)).strftime('%Y-%m-%d %H:%M:%S')
+            'created_at': timeutil.format_ts(created_ts),
+            'created_ts': created_ts
         }
     })
 
@@ -267,7 +512,7 @@ def delete_comment(comment_id):
         return jsonify({'success': False, 'message': '댓글이 존재하지 않습니다.'}), 404
 
     # 1. 댓글이 속한 작업(Task) 정보를 가져옵니다.
-    task = Task.get(comment['task_id'])
+    task = Task.get(comment.task_id)
     if not task:
         return jsonify({'success': False, 'message': '관련 작업을 찾을 수 없습니다.'}), 404
     
@@ -278,7 +523,7 @@ def delete_comment(comment_id):
     user_role = Project.get_user_role(project_id, current_user.id)
 
     # 4. 새로운 권한 확인: (내가 쓴 댓글인가?) OR (내가 팀장인가?)
-    if comment['user_id'] == current_user.id or user_role == '팀장':
+    if comment.user_id == current_user.id or user_role == '팀장':
         Comment.delete(comment_id)
         return jsonify({'success': True, 'message': '댓글이 삭제되었습니다.'})
     else:
@@ -292,15 +537,227 @@ def get_project_stats(project_id):
     # 권한 확인
     if not Project.is_member(project_id, current_user.id):
         return jsonify({"error": "접근 권한이 없습니다."}), 403
-    
-    project = Project.get(project_id)
-    if not project:
+
+    change = Project.change_version(project_id)
+    if change is None:
         return jsonify({"error": "프로젝트를 찾을 수 없습니다."}), 404
+    etag, last_modified = _validators('stats', project_id, *change)
+    if _is_not_modified(etag):
+        return _not_modified_response(etag, last_modified)
 
-    # 최신 태스크 진행률 계산
-    task_progress = project.calculate_task_progress()
-    
-    return jsonify({'task_progress': task_progress})
+    # 진행률은 집계 테이블에서 읽습니다 (작업 목록은 불러오지 않습니다).
+    snapshot = ProjectSnapshot.load(project_id, current_user.id, include_members=False, include_tasks=False)
+    if snapshot is None:
+        return jsonify({"error": "접근 권한이 없습니다."}), 403
+
+    return _with_validators(jsonify({'task_progress': snapshot.task_progress}), etag, last_modified)
+
+# 프로젝트 실시간 이벤트 (Server-Sent Events)
+@bp.route('/api/project/<int:project_id>/events')
+@login_required
+def project_events(project_id):
+    """작업/댓글/진행률 변경을 text/event-stream으로 보냅니다.
+
+    스트림이 열려 있는 동안에는 DB 커넥션을 쓰지 않습니다. (권한 확인은 멤버십 캐시를 사용합니다)
+    """
+    if not Project.is_member(project_id, current_user.id):
+        return jsonify({"error": "접근 권한이 없습니다."}), 403
+
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(events.stream(project_id, last_event_id), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no', # 프록시(nginx)가 이벤트를 모아 두지 않도록 합니다
+    })
+
+# 델타 동기화: since 이후에 바뀐 작업/댓글/멤버만
+@bp.route('/api/project/<int:project_id>/changes')
+@login_required
+def project_changes(project_id):
+    """since(마지막으로 받은 version) 이후에 바뀐 행과 삭제된 ID만 돌려줍니다.
+
+    응답의 version을 다음 요청의 since로 쓰고, has_more가 true면 이어서 요청합니다.
+    since가 서버의 마지막 version보다 크면(기록이 초기화된 경우) reset: true를 돌려주므로
+    클라이언트는 전체를 다시 불러와야 합니다.
+    """
+    if not Project.is_member(project_id, current_user.id):
+        return jsonify({'error': '접근 권한이 없습니다.'}), 403
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({'error': 'since 값이 올바르지 않습니다.'}), 400
+    limit = _page_limit(default=500, maximum=1000)
+
+    changes, version, has_more = ChangeLog.since(project_id, since, limit)
+    if not changes and since > 0:
+        latest = ChangeLog.latest_version(project_id)
+        if since > latest:
+            return jsonify({'reset': True, 'version': latest})
+
+    upserts = {'task': [], 'comment': [], 'member': []}
+    deleted = {'task': [], 'comment': [], 'member': []}
+    for entity, entity_id, op in changes:
+        (deleted if op == 'delete' else upserts)[entity].append(entity_id)
+
+    tasks = Task.find_by_ids(project_id, upserts['task'])
+    comments = Comment.find_by_ids(upserts['comment'])
+    members = Project.members_by_ids(project_id, upserts['member'])
+    zone = timeutil.current_zone()
+
+    return jsonify({
+        'version': version,
+        'has_more': has_more,
+        'tasks': [{
+            'id': t.id,
+            'name': t.task_name,
+            'start_date': t.start_date,
+            'end_date': t.end_date,
+            'start_ts': t.start_ts,
+            'end_ts': t.end_ts,
+            'status': t.status,
+            'assignee_id': t.assignee_id,
+            'assignee_name': t.assignee_name
+        } for t in tasks],
+        'comments': [{
+            'id': c.id,
+            'task_id': c.task_id,
+            'username': c.username,
+            'content': c.content,
+            'created_at': timeutil.format_ts(c.created_ts, zone),
+            'created_ts': c.created_ts
+        } for c in comments],
+        'members': [{'id': m[0], 'username': m[1], 'role': m[2]} for m in members],
+        'deleted': {
+            'tasks': deleted['task'],
+            'comments': deleted['comment'],
+            'members': deleted['member']
+        }
+    })
+
+# 프로젝트 전체 내보내기 (스트리밍)
+@bp.route('/api/project/<int:project_id>/export')
+@login_required
+def export_project(project_id):
+    """프로젝트, 멤버, 작업(담당자 포함), 댓글을 format=ndjson|csv로 내려받습니다.
+
+    행을 읽는 대로 조각씩 보내므로 큰 프로젝트도 메모리에 한꺼번에 올리지 않습니다.
+    gzip=1이고 클라이언트가 gzip을 받을 수 있으면 Content-Encoding: gzip으로 압축해 보냅니다.
+    """
+    if not Project.is_member(project_id, current_user.id):
+        return jsonify({'error': '접근 권한이 없습니다.'}), 403
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in export.FORMATS:
+        return jsonify({'error': f"format은 {', '.join(export.FORMATS)} 중 하나여야 합니다."}), 400
+    compress = request.args.get('gzip') in ('1', 'true') and 'gzip' in request.accept_encodings
+
+    chunks = export.stream_project(project_id, fmt, gzip=compress)
+    response = Response(stream_with_context(chunks), mimetype=export.FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="project-{project_id}.{fmt}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.cache_control.no_store = True
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    return response
+
+# 작업 가져오기 (CSV / NDJSON / JSON)
+@bp.route('/api/project/<int:project_id>/import', methods=['POST'])
+@login_required
+def import_project_tasks(project_id):
+    """업로드한 파일(file 필드) 또는 요청 본문의 작업들을 한꺼번에 추가합니다.
+
+    형식은 format 파라미터, 파일 확장자, Content-Type 순서로 정합니다.
+    잘못된 행은 건너뛰고, 응답의 errors에 행 번호와 이유를 돌려줍니다.
+    """
+    if Project.get_user_role(project_id, current_user.id) != '팀장':
+        return jsonify({'success': False, 'message': '작업을 가져올 권한이 없습니다.'}), 403
+
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, filename, content_type = upload.stream, upload.filename, upload.mimetype
+    else:
+        stream, filename, content_type = request.stream, None, request.mimetype
+    fmt = request.args.get('format') or importer.detect_format(filename, content_type)
+    if fmt not in importer.FORMATS:
+        return jsonify({'success': False, 'message': f"format은 {', '.join(importer.FORMATS)} 중 하나여야 합니다."}), 400
+
+    report = importer.import_tasks(project_id, stream, fmt,
+                                   chunk_size=current_app.config.get('IMPORT_CHUNK_SIZE', 2000),
+                                   max_errors=current_app.config.get('IMPORT_MAX_ERRORS', 1000))
+    if report['aborted'] and not report['imported']:
+        return jsonify({'success': False, 'message': report['aborted'], **report}), 400
+    message = f"작업 {report['imported']}개를 가져왔습니다."
+    if report['failed']:
+        message += f" ({report['failed']}개 행은 오류로 건너뛰었습니다.)"
+    if report['aborted']:
+        message += f" 파일을 끝까지 읽지 못했습니다: {report['aborted']}"
+    return jsonify({'success': True, 'message': message, **report})
+
+# --- 전문 검색 ---
+SEARCH_MAX_OFFSET = 1000 # 관련도 순 결과는 이보다 깊이 넘기지 않습니다
+
+def _highlight_html(text):
+    """본문을 먼저 HTML 이스케이프한 뒤 강조 표시 문자를 <mark>로 바꿉니다."""
+    return str(escape(text or '')).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+@bp.route('/api/search')
+@login_required
+def search():
+    """내가 속한 프로젝트의 작업 이름과 댓글 내용을 검색합니다.
+
+    q: 검색어 (낱말마다 접두어로 찾고 모든 낱말이 있어야 합니다)
+    type: task | comment (생략하면 둘 다), project_id: 한 프로젝트로 좁히기
+    limit / offset: 종류별 페이지. 응답의 next_offset을 다음 요청의 offset으로 씁니다.
+    snippet_html은 이스케이프된 HTML이고 일치한 부분만 <mark>로 감싸져 있습니다.
+    """
+    text = (request.args.get('q') or '').strip()
+    if not text:
+        return jsonify({'error': '검색어를 입력해주세요.'}), 400
+    kind = request.args.get('type')
+    if kind not in (None, 'task', 'comment'):
+        return jsonify({'error': 'type은 task 또는 comment여야 합니다.'}), 400
+    limit = _page_limit(default=20, maximum=100)
+    offset = request.args.get('offset', 0, type=int)
+    if offset < 0 or offset > SEARCH_MAX_OFFSET:
+        return jsonify({'error': 'offset 값이 올바르지 않습니다.'}), 400
+
+    project_ids = sorted(Project.memberships(current_user.id))
+    project_id = request.args.get('project_id', type=int)
+    if project_id is not None:
+        if project_id not in project_ids:
+            return jsonify({'error': '접근 권한이 없습니다.'}), 403
+        project_ids = [project_id]
+
+    def _page(rows, has_more):
+        return {'has_more': has_more, 'next_offset': offset + len(rows) if has_more else None}
+
+    result = {'query': text}
+    if kind in (None, 'task'):
+        rows, has_more = Search.tasks(project_ids, text, limit, offset)
+        result['tasks'] = dict(_page(rows, has_more), items=[{
+            'id': t['id'],
+            'project_id': t['project_id'],
+            'project_name': t['project_name'],
+            'name': t['task_name'],
+            'status': t['status'],
+            'start_date': t['start_date'],
+            'end_date': t['end_date'],
+            'snippet_html': _highlight_html(t['snippet'])
+        } for t in rows])
+    if kind in (None, 'comment'):
+        zone = timeutil.current_zone()
+        rows, has_more = Search.comments(project_ids, text, limit, offset)
+        result['comments'] = dict(_page(rows, has_more), items=[{
+            'id': c['id'],
+            'task_id': c['task_id'],
+            'task_name': c['task_name'],
+            'project_id': c['project_id'],
+            'project_name': c['project_name'],
+            'username': c['username'],
+            'created_at': timeutil.format_ts(c['created_ts'], zone),
+            'created_ts': c['created_ts'],
+            'snippet_html': _highlight_html(c['snippet'])
+        } for c in rows])
+    return jsonify(result)
 
 # 프로젝트 상태 변경
 @bp.route('/api/project/<int:project_id>/edit', methods=['POST'])
@@ -316,14 +773,20 @@ def edit_project(project_id):
 
     if not all([name, start_date, end_date]):
         return jsonify({'success': False, 'message': '모든 필드를 입력해주세요.'}), 400
+    try:
+        start_ts, end_ts = timeutil.parse_period(start_date, end_date)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
 
-    project.update(name, start_date, end_date)
+    project.update(name, start_ts, end_ts)
     return jsonify({
         'success': True,
         'project': {
             'name': name,
-            'start_date': start_date,
-            'end_date': end_date
+            'start_date': project.start_date,
+            'end_date': project.end_date,
+            'start_ts': project.start_ts,
+            'end_ts': project.end_ts
         }
     })
 
@@ -345,15 +808,21 @@ def edit_task(task_id):
 
     if not all([name, start_date, end_date]):
         return jsonify({'success': False, 'message': '모든 필드를 입력해주세요.'}), 400
+    try:
+        start_ts, end_ts = timeutil.parse_period(start_date, end_date)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
 
-    task.update(name, start_date, end_date)
+    task.update(name, start_ts, end_ts)
     
     return jsonify({
         'success': True,
         'task': {
             'name': name,
-            'start_date': start_date,
-            'end_date': end_date
+            'start_date': task.start_date,
+            'end_date': task.end_date,
+            'start_ts': task.start_ts,
+            'end_ts': task.end_ts
         }
     })
 
@@ -409,6 +878,136 @@ def assign_task(task_id):
         'assignee_name': assignee_user.username if assignee_user else '알 수 없음'
     })
 
+# --- 작업 일괄 처리 ---
+BULK_TASK_LIMIT = 500 # 한 요청에서 처리할 수 있는 최대 작업 수
+TASK_STATUSES = ('대기', '진행 중', '완료')
+
+def _bulk_int(value, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} 값이 올바르지 않습니다.")
+
+def _bulk_period(op):
+    """op의 start_date/end_date를 확인하고 요청한 사용자의 시간대 기준 (start_ts, end_ts)로 반환합니다."""
+    return timeutil.parse_period(op.get('start_date'), op.get('end_date'))
+
+def _bulk_row(op, project_id, roles, members):
+    """작업 하나를 검증하고 (종류, Task.apply_bulk에 넘길 행)을 반환합니다. 실패하면 ValueError."""
+    kind = op.get('op')
+    if project_id is None:
+        raise ValueError('작업을 찾을 수 없습니다.')
+    if roles.get(project_id) != '팀장':
+        raise ValueError('작업을 수정할 권한이 없습니다.')
+
+    if kind == 'create':
+        task_name = op.get('task_name')
+        if not task_name:
+            raise ValueError('작업 이름을 입력해주세요.')
+        start_ts, end_ts = _bulk_period(op)
+        status = op.get('status') or '대기'
+        if status not in TASK_STATUSES:
+            raise ValueError('알 수 없는 상태입니다.')
+        assignee_id = op.get('assignee_id')
+        if assignee_id is not None:
+            assignee_id = _bulk_int(assignee_id, 'assignee_id')
+            if assignee_id not in members[project_id]:
+                raise ValueError('프로젝트 멤버가 아닌 사용자입니다.')
+        return kind, (project_id, task_name, status, start_ts, end_ts, assignee_id)
+
+    task_id = _bulk_int(op.get('task_id'), 'task_id')
+    if kind == 'update':
+        start_ts, end_ts = _bulk_period(op)
+        return kind, (op.get('task_name') or None, start_ts, end_ts, task_id)
+    if kind == 'assign':
+        assignee_id = op.get('assignee_id')
+        if assignee_id is not None:
+            assignee_id = _bulk_int(assignee_id, 'assignee_id')
+            if assignee_id not in members[project_id]:
+                raise ValueError('프로젝트 멤버가 아닌 사용자입니다.')
+        return kind, (assignee_id, task_id)
+    if kind == 'status':
+        if op.get('status') not in TASK_STATUSES:
+            raise ValueError('알 수 없는 상태입니다.')
+        return kind, (op['status'], task_id)
+    raise ValueError('알 수 없는 작업 종류입니다.')
+
+@bp.route('/api/tasks/bulk', methods=['POST'])
+@login_required
+def bulk_tasks():
+    """작업 생성/기간 변경/담당자 지정/상태 변경을 한 번에 처리합니다.
+
+    요청: {"operations": [{"op": "create" | "update" | "assign" | "status", ...}, ...],
+          "all_or_nothing": false}
+    역할은 프로젝트마다 한 번만 확인하고, 통과한 작업들은 한 트랜잭션에서 적용한 뒤
+    항목별 결과를 요청 순서대로 돌려줍니다.
+    """
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'message': '처리할 작업 목록이 없습니다.'}), 400
+    if len(operations) > BULK_TASK_LIMIT:
+        return jsonify({'success': False, 'message': f'한 번에 최대 {BULK_TASK_LIMIT}개까지 처리할 수 있습니다.'}), 400
+    if not all(isinstance(op, dict) for op in operations):
+        return jsonify({'success': False, 'message': '잘못된 요청 형식입니다.'}), 400
+
+    # 1. 필요한 작업/프로젝트 정보를 쿼리 한두 번으로 모읍니다.
+    task_ids = set()
+    for op in operations:
+        if op.get('op') != 'create':
+            try:
+                task_ids.add(int(op.get('task_id')))
+            except (TypeError, ValueError):
+                pass
+    task_projects = Task.project_ids(task_ids)
+    roles = Project.memberships(current_user.id)
+
+    def _project_of(op):
+        try:
+            if op.get('op') == 'create':
+                return int(op.get('project_id'))
+            return task_projects.get(int(op.get('task_id')))
+        except (TypeError, ValueError):
+            return None
+
+    op_projects = [_project_of(op) for op in operations]
+    members = Project.member_ids({pid for pid in op_projects if roles.get(pid) == '팀장'})
+
+    # 2. 항목별로 검증하고 종류별로 모읍니다.
+    results = []
+    rows = {'create': [], 'update': [], 'assign': [], 'status': []}
+    created = [] # rows['create']의 각 행에 해당하는 results 항목
+    for index, (op, project_id) in enumerate(zip(operations, op_projects)):
+        try:
+            kind, row = _bulk_row(op, project_id, roles, members)
+        except ValueError as e:
+            results.append({'index': index, 'success': False, 'message': str(e)})
+            continue
+        rows[kind].append(row)
+        result = {'index': index, 'success': True, 'op': kind, 'task_id': row[-1] if kind != 'create' else None}
+        if kind == 'create':
+            created.append(result)
+        results.append(result)
+
+    failed = sum(1 for result in results if not result['success'])
+    if failed and data.get('all_or_nothing'):
+        for result in results:
+            if result['success']:
+                result.update(success=False, message='다른 항목의 오류로 적용되지 않았습니다.')
+        return jsonify({'success': False, 'message': f'{failed}개 항목에 오류가 있어 아무것도 적용하지 않았습니다.',
+                        'applied': 0, 'failed': len(results), 'results': results}), 400
+
+    # 3. 통과한 항목을 한 트랜잭션에서 적용합니다.
+    applied = len(results) - failed
+    if applied:
+        new_ids = Task.apply_bulk(rows['create'], rows['update'], rows['assign'], rows['status'])
+        for result, new_id in zip(created, new_ids):
+            result['task_id'] = new_id
 
-
-
+    return jsonify({
+        'success': failed == 0,
+        'message': f'{applied}개 작업을 처리했습니다.' + (f' ({failed}개 실패)' if failed else ''),
+        'applied': applied,
+        'failed': failed,
+        'results': results
+    })